@@ -1,14 +1,58 @@
+import importlib
 import json
 import os
-from flask import Flask, jsonify, Response
-from scraper.team_scraper import TeamScraper
-from scraper.match_scraper import MatchScraper
-from scraper.event_scraper import EventScraper
-from scraper.result_scraper import ResultScraper
+import queue
+import threading
+import time
+from collections import OrderedDict
+from flask import Flask, g, jsonify, request, Response
+from scraper.batch import iter_batch, parse_batch_items, run_batch
+from scraper.circuit_breaker import get_circuit_breaker
+from scraper.entity_store import get_entity_store
+from scraper.errors import PageNotFound, ScraperError
+from scraper.metrics import get_metrics
+from scraper.models import json_default, select_fields
+from scraper.page_cache import get_page_cache, watch_stale_pages
+from scraper.rate_limiter import get_scheduler
+from scraper.single_flight import get_single_flight
+from utils.response_cache import conditional_response, get_response_cache, serialize
+from utils.shared_cache import get_shared_cache
+from utils.streaming import ndjson_response, wants_ndjson
 
-app = Flask(__name__)
+def start_timer():
+    """
+    Notes when the current request started, for the request duration metric.
+    """
+    g.request_start = time.perf_counter()
+
+def record_request(response):
+    """
+    Records the duration and status code of the current request.
+
+    Args:
+        response (Response): The response about to be sent.
+
+    Returns:
+        Response: The same response.
+    """
+    if 'request_start' in g:
+        get_metrics().observe_request(
+            request.endpoint or 'unknown', response.status_code, time.perf_counter() - g.request_start
+        )
+    return response
+
+def scraper_error(error):
+    """
+    Turns a failure to fetch a page from HLTV into a JSON error.
+
+    Args:
+        error (ScraperError): The error raised by the scraper.
+
+    Returns:
+        Response: A JSON object describing the error, with a 404, 502, 503 or 504 status.
+    """
+    return jsonify({'error': str(error)}), error.status
 
-@app.route('/')
 def home():
     """
     Initial endpoint that returns a welcome message.
@@ -18,8 +62,120 @@ def home():
     """
     return "HLTV Web Scraping API"
 
-@app.route('/team/<int:team_id>/<string:team_name>', methods=['GET'])
-def team_info(team_id, team_name):
+def _compact():
+    """
+    Tells whether the client asked for compact JSON with `?compact=1`.
+
+    Returns:
+        bool: True if the response should not be indented.
+    """
+    return request.args.get('compact', '').lower() in ('1', 'true', 'yes')
+
+def _data_key():
+    """
+    Identifies the data of the current request, whatever its presentation.
+
+    Returns:
+        str: The request path and its query parameters except `compact`, in a stable order.
+    """
+    args = sorted((name, value) for name, value in request.args.items(multi=True) if name != 'compact')
+    return request.path + ('?' + '&'.join(f'{name}={value}' for name, value in args) if args else '')
+
+def _requested_fields(available):
+    """
+    Reads the response fields the client asked for with `?fields=name,players`.
+
+    Args:
+        available (OrderedDict): The fields the endpoint can return, in response order.
+
+    Returns:
+        tuple: The requested fields in response order, or None when the parameter is absent
+               or names every field, and the list of unknown field names.
+    """
+    value = request.args.get('fields')
+    if value is None:
+        return None, []
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in available]
+    fields = tuple(field for field in available if field in names)
+    if not fields or len(fields) == len(available):
+        return None, unknown
+    return fields, unknown
+
+def _unknown_fields(unknown, available):
+    """
+    Describes the unknown fields of a `?fields=` parameter.
+
+    Args:
+        unknown (list): The unknown field names.
+        available (OrderedDict): The fields the endpoint can return.
+
+    Returns:
+        tuple: A JSON error listing the valid fields, with a 400 status.
+    """
+    return jsonify({
+        'error': f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(available)}"
+    }), 400
+
+async def _json_response(page_url, produce, not_found, stored=None, fields=None):
+    """
+    Serves the data of a GET endpoint through the response cache.
+
+    A fresh cached response is returned without scraping or serializing again. Responses carry
+    a content-hash `ETag` and a `Cache-Control` max-age matching the time left before the page
+    they were scraped from expires, and a matching `If-None-Match` is answered with
+    `304 Not Modified`.
+    Otherwise the data is taken from the cache shared by the workers of the host, where only
+    one worker at a time produces a given response. It is read from the entity store when it
+    was stored recently enough, and scraped data is upserted into the store. Partial data,
+    scraped for a subset of `fields`, is served and cached under its own key but never stored.
+    Data scraped from expired pages, served while HLTV is refreshed or unreachable, is answered
+    with a zero max-age and kept out of every cache and of the store.
+
+    Args:
+        page_url (str): The HLTV page the data is scraped from, used to pick the time-to-live.
+        produce (callable): The coroutine function scraping the data.
+        not_found (str): The error returned with a 404 when there is no data.
+        stored (tuple, optional): The `(kind, id, slug)` of the entity in the entity store.
+        fields (tuple, optional): The response fields `produce` returns, None for the whole entity.
+
+    Returns:
+        Response: The JSON response.
+    """
+    cache = get_response_cache()
+    entry = cache.get(request.full_path)
+    if entry is None:
+        store = get_entity_store()
+        stale = watch_stale_pages()
+
+        async def load():
+            data = store.load(*stored[:2]) if stored else None
+            if data is not None:
+                return select_fields(data, fields) if fields else data
+            try:
+                data = await produce()
+            except PageNotFound:
+                data = None
+            if data and stored and not fields and not stale:
+                store.save(*stored, data)
+            return data
+
+        def fresh_for():
+            if stale:
+                return 0
+            page_cache = get_page_cache()
+            age = page_cache.age(page_url)
+            return page_cache.ttl_for(page_url) - (age or 0)
+
+        data, ttl = await get_shared_cache().load(_data_key(), fresh_for, load)
+        if not data:
+            return jsonify({'error': not_found}), 404
+        start = time.perf_counter()
+        entry = cache.put(request.full_path, data, ttl, _compact())
+        get_metrics().observe_stage('serialize', request.endpoint, time.perf_counter() - start)
+    return conditional_response(entry, request, cache)
+
+async def team_info(team_id, team_name):
     """
     Endpoint that retrieves information about a specific CS2 team.
 
@@ -27,20 +183,26 @@ def team_info(team_id, team_name):
         team_id (int): The team's ID on the HLTV website.
         team_name (str): The team's name, exactly as it appears on the HLTV website.
 
+    Query parameters:
+        fields (str, optional): Comma-separated fields to return, among `name`, `image`, `players`,
+                                `ranking`, `coach` and `trophies`. Only the parts of the page they
+                                come from are parsed.
+
     Returns:
         Response: A JSON object containing the team's data.
                   If the team is not found, returns a 404 error with an appropriate message.
+                  Unknown fields are answered with a 400 error.
     """
-    scraper = TeamScraper(team_id, team_name)
-    team_data = scraper.get_team_info()
+    from scraper.async_scraper import AsyncTeamScraper
+    fields, unknown = _requested_fields(AsyncTeamScraper.FIELDS)
+    if unknown:
+        return _unknown_fields(unknown, AsyncTeamScraper.FIELDS)
+    scraper = AsyncTeamScraper(team_id, team_name)
+    return await _json_response(
+        scraper.url, lambda: scraper.get_team_info(fields), 'Team not found', ('team', team_id, team_name), fields
+    )
 
-    if not team_data:
-        return jsonify({'error': 'Team not found'}), 404
-    team_json = json.dumps(team_data, ensure_ascii=False, indent=4)
-    return Response(team_json, mimetype='application/json')
-
-@app.route('/matches/<int:team_id>/<string:team_name>', methods=['GET'])
-def upcoming_matches(team_id, team_name):
+async def upcoming_matches(team_id, team_name):
     """
     Endpoint that retrieves the upcoming matches for a specific CS2 team.
 
@@ -48,20 +210,27 @@ def upcoming_matches(team_id, team_name):
         team_id (int): The team's unique ID.
         team_name (str): The team's name.
 
+    Query parameters:
+        limit (int, optional): The maximum number of matches to return.
+
     Returns:
         Response: A JSON object containing the list of upcoming matches for the specified team.
                   If no matches are found, returns a 404 error with an appropriate message.
+                  With `Accept: application/x-ndjson`, each match is streamed as soon as its details are ready.
     """
-    scraper = MatchScraper(team_id, team_name)
-    matches = scraper.get_upcoming_matches()
+    from scraper.async_scraper import AsyncMatchScraper
+    scraper = AsyncMatchScraper(team_id, team_name)
+    limit = request.args.get('limit', type=int)
+    if wants_ndjson(request):
+        return ndjson_response(lambda: scraper.iter_upcoming_matches(limit))
+    # The schedule embeds match details, which go stale much sooner than the team page.
+    # Only full schedules are stored, so a limited one never stands in for them.
+    return await _json_response(
+        "https://www.hltv.org/matches/", lambda: scraper.get_upcoming_matches(limit), 'No upcoming matches found',
+        ('schedule', team_id, team_name) if limit is None else None
+    )
 
-    if not matches:
-        return jsonify({'error': 'No upcoming matches found'}), 404
-    matches_json = json.dumps(matches, ensure_ascii=False, indent=4)
-    return Response(matches_json, mimetype='application/json')
-
-@app.route('/events/<int:event_id>/<string:event_name>', methods=['GET'])
-def event_info(event_id, event_name):
+async def event_info(event_id, event_name):
     """
     Endpoint that retrieves information about a specific CS2 event.
 
@@ -69,27 +238,248 @@ def event_info(event_id, event_name):
         event_id (int): The event's unique ID.
         event_name (str): The event's name.
 
+    Query parameters:
+        fields (str, optional): Comma-separated fields to return, among `title`, `date`, `prize_pool`,
+                                `teams`, `location` and `prize_distribution`. Only the parts of the
+                                page they come from are parsed.
+
     Returns:
         Response: A JSON object containing details about the specified event.
                   If the event is not found, returns a 404 error with an appropriate message.
+                  Unknown fields are answered with a 400 error.
+    """
+    from scraper.async_scraper import AsyncEventScraper
+    fields, unknown = _requested_fields(AsyncEventScraper.FIELDS)
+    if unknown:
+        return _unknown_fields(unknown, AsyncEventScraper.FIELDS)
+    scraper = AsyncEventScraper(event_id, event_name)
+    return await _json_response(
+        scraper.url, lambda: scraper.get_event_details(fields), 'Event not found',
+        ('event', event_id, event_name), fields
+    )
+
+async def event_matches(event_id, event_name):
+    """
+    Endpoint that retrieves the results of every finished match of a specific CS2 event.
+
+    Args:
+        event_id (int): The event's unique ID.
+        event_name (str): The event's name.
+
+    Returns:
+        Response: A JSON list with the result or the error of each match, in listing order.
+                  If the event has no finished matches, returns a 404 error with an appropriate message.
+                  With `Accept: application/x-ndjson`, each match is streamed as soon as it is scraped.
+    """
+    from scraper.async_scraper import AsyncEventMatchScraper
+    scraper = AsyncEventMatchScraper(event_id, event_name)
+    if wants_ndjson(request):
+        return ndjson_response(scraper.iter_event_matches)
+    return await _json_response(scraper.url, scraper.get_event_matches, 'No finished matches found')
+
+async def result_info(match_id, match_name):
+    from scraper.async_scraper import AsyncResultScraper
+    fields, unknown = _requested_fields(AsyncResultScraper.FIELDS)
+    if unknown:
+        return _unknown_fields(unknown, AsyncResultScraper.FIELDS)
+    scraper = AsyncResultScraper(match_id, match_name)
+    if wants_ndjson(request):
+        return ndjson_response(scraper.iter_results)
+    return await _json_response(
+        scraper.url, lambda: scraper.get_results(fields), 'Live match not found',
+        ('result', match_id, match_name), fields
+    )
+
+def result_stream(match_id, match_name):
+    """
+    Endpoint that pushes the map scores of a live match as Server-Sent Events.
+
+    All clients following the same match share a single poller. Clients first receive a
+    `snapshot` event with every map, then `update` events holding only the maps whose score
+    changed, each tagged with its `index`.
+
+    Args:
+        match_id (int): The match's unique ID.
+        match_name (str): The match's name.
+
+    Returns:
+        Response: A `text/event-stream` response that stays open while the client listens.
+    """
+    from scraper.live_poller import get_live_pollers
+    pollers = get_live_pollers()
+    poller, subscriber = pollers.subscribe(match_id, match_name)
+
+    def generate():
+        try:
+            while True:
+                try:
+                    event, data = subscriber.get(timeout=15)
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=json_default)}\n\n"
+        finally:
+            pollers.unsubscribe(poller, subscriber)
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+async def _batch_response(scraper_class, method_name, not_found, kind):
+    """
+    Scrapes every `(id, name)` pair of a batch request body concurrently.
+
+    Args:
+        scraper_class (type): The async scraper class used for each item.
+        method_name (str): The coroutine method returning the scraped data.
+        not_found (str): The error reported for items without data.
+        kind (str): The kind of the items in the entity store.
+
+    Returns:
+        Response: A JSON list with one result or error per item, or a 400 error if the body is invalid.
+                  With `Accept: application/x-ndjson`, each item is streamed as soon as it is scraped.
+    """
+    items = parse_batch_items(request.get_json(silent=True))
+    if items is None:
+        return jsonify({'error': 'Expected a non-empty list of [id, name] pairs, names being URL slugs'}), 400
+    if wants_ndjson(request):
+        return ndjson_response(lambda: iter_batch(scraper_class, method_name, items, not_found, kind=kind))
+    results = await run_batch(scraper_class, method_name, items, not_found, kind=kind)
+    start = time.perf_counter()
+    body = serialize(results, _compact())
+    get_metrics().observe_stage('serialize', request.endpoint, time.perf_counter() - start)
+    return Response(body, mimetype='application/json')
+
+async def teams_batch():
+    """
+    Endpoint that retrieves information about several CS2 teams in one call.
+
+    Returns:
+        Response: A JSON list with the data or the error of each requested team.
+    """
+    from scraper.async_scraper import AsyncTeamScraper
+    return await _batch_response(AsyncTeamScraper, 'get_team_info', 'Team not found', 'team')
+
+async def events_batch():
+    """
+    Endpoint that retrieves information about several CS2 events in one call.
+
+    Returns:
+        Response: A JSON list with the data or the error of each requested event.
+    """
+    from scraper.async_scraper import AsyncEventScraper
+    return await _batch_response(AsyncEventScraper, 'get_event_details', 'Event not found', 'event')
+
+async def results_batch():
+    """
+    Endpoint that retrieves the results of several matches in one call.
+
+    Returns:
+        Response: A JSON list with the data or the error of each requested match.
+    """
+    from scraper.async_scraper import AsyncResultScraper
+    return await _batch_response(AsyncResultScraper, 'get_results', 'Live match not found', 'result')
+
+def stats():
+    """
+    Endpoint that exposes the internal counters of the scraping stack.
+
+    Returns:
+        Response: A JSON object with the session pool, page cache, fetch coalescing, outbound scheduler, circuit breaker, prewarmer, live poller, response cache, shared cache, entity store and page archive statistics.
+    """
+    stats_json = json.dumps(_component_stats(), ensure_ascii=False, indent=4)
+    return Response(stats_json, mimetype='application/json')
+
+def metrics():
+    """
+    Endpoint that exposes the metrics of the API in the Prometheus text format.
+
+    Returns:
+        Response: The stage, schema extraction and request latency histograms, the upstream status code
+                  and byte counters, and the `/stats` counters as gauges.
+    """
+    return Response(get_metrics().render(_component_stats()), mimetype='text/plain; version=0.0.4')
+
+def _component_stats():
+    """
+    Collects the counters of every component of the scraping stack.
+
+    Returns:
+        OrderedDict: The `stats()` snapshot of each component, keyed by component name.
+    """
+    from scraper.live_poller import get_live_pollers
+    from scraper.page_archive import get_page_archive
+    from scraper.prewarmer import get_prewarmer
+    from scraper.session_pool import get_session_pool
+    return OrderedDict([
+        ('session_pool', get_session_pool().stats()),
+        ('page_cache', get_page_cache().stats()),
+        ('single_flight', get_single_flight().stats()),
+        ('scheduler', get_scheduler().stats()),
+        ('circuit_breaker', get_circuit_breaker().stats()),
+        ('prewarmer', get_prewarmer().stats()),
+        ('live_pollers', get_live_pollers().stats()),
+        ('response_cache', get_response_cache().stats()),
+        ('shared_cache', get_shared_cache().stats()),
+        ('entity_store', get_entity_store().stats()),
+        ('page_archive', get_page_archive().stats())
+    ])
+
+def warm_up():
+    """
+    Imports the scraping stack and creates the pooled sessions ahead of the first requests.
+
+    Meant to run in the background once the server accepts connections, so cold starts do not
+    wait for it and the first requests do not pay for it either.
+    """
+    try:
+        for module in ('scraper.async_scraper', 'scraper.live_poller'):
+            importlib.import_module(module)
+        from scraper.session_pool import get_session_pool
+        get_session_pool().prefill()
+    except Exception as error:
+        print(f"[ERRO] Falha ao aquecer a pilha de scraping: {type(error).__name__}: {error}")
+
+def create_app(warm=None):
+    """
+    Creates the Flask application.
+
+    Only Flask and the lightweight caching modules are imported up front. The scrapers, and
+    with them cloudscraper and BeautifulSoup, are imported by the first request needing them,
+    or earlier by `warm_up` running in a background thread.
+
+    Args:
+        warm (bool, optional): Whether to start `warm_up` in the background. Defaults to the
+                               `HLTV_WARM_UP` environment variable.
+
+    Returns:
+        Flask: The application.
     """
-    scraper = EventScraper(event_id, event_name)
-    event_data = scraper.get_event_details()
+    app = Flask(__name__)
+    app.before_request(start_timer)
+    app.after_request(record_request)
+    app.register_error_handler(ScraperError, scraper_error)
 
-    if not event_data:
-        return jsonify({'error': 'Event not found'}), 404
-    event_json = json.dumps(event_data, ensure_ascii=False, indent=4)
-    return Response(event_json, mimetype='application/json')
+    app.add_url_rule('/', view_func=home)
+    app.add_url_rule('/team/<int:team_id>/<string:team_name>', view_func=team_info, methods=['GET'])
+    app.add_url_rule('/matches/<int:team_id>/<string:team_name>', view_func=upcoming_matches, methods=['GET'])
+    app.add_url_rule('/events/<int:event_id>/<string:event_name>', view_func=event_info, methods=['GET'])
+    app.add_url_rule('/events/<int:event_id>/<string:event_name>/matches', view_func=event_matches, methods=['GET'])
+    app.add_url_rule('/result/<int:match_id>/<string:match_name>', view_func=result_info, methods=['GET'])
+    app.add_url_rule('/result/<int:match_id>/<string:match_name>/stream', view_func=result_stream, methods=['GET'])
+    app.add_url_rule('/teams/batch', view_func=teams_batch, methods=['POST'])
+    app.add_url_rule('/events/batch', view_func=events_batch, methods=['POST'])
+    app.add_url_rule('/results/batch', view_func=results_batch, methods=['POST'])
+    app.add_url_rule('/stats', view_func=stats, methods=['GET'])
+    app.add_url_rule('/metrics', view_func=metrics, methods=['GET'])
 
-@app.route('/result/<int:match_id>/<string:match_name>', methods=['GET'])
-def result_info(match_id, match_name):
-    scraper = ResultScraper(match_id, match_name)
-    result_data = scraper.get_results()
+    if warm is None:
+        warm = os.environ.get('HLTV_WARM_UP', '1').lower() not in ('0', 'false', 'no')
+    if warm:
+        threading.Thread(target=warm_up, name='hltv-warm-up', daemon=True).start()
+    return app
 
-    if not result_data:
-        return jsonify({'error': 'Live match not found'}), 404
-    result_json = json.dumps(result_data, ensure_ascii=False, indent=4)
-    return Response(result_json, mimetype='application/json')
+# Kept for `flask run` and `gunicorn app:app`. Warming up is left to the factory, e.g.
+# `gunicorn 'app:create_app()'`, whose workers build the app once the port is bound.
+app = create_app(warm=False)
 
 if __name__ == '__main__':
     """
@@ -100,4 +490,4 @@ if __name__ == '__main__':
     """
     port = int(os.environ.get("PORT", 5000))
     
-    app.run(host="0.0.0.0", port=port)
+    create_app().run(host="0.0.0.0", port=port)
@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+from benchmarks.upstream import FIXTURE_PAGES, FIXTURES_DIR
+from scraper.page_archive import PageArchive
+from scraper.session_pool import get_session_pool
+
+def record():
+    """
+    Replaces the benchmark fixtures with the current live HLTV pages.
+
+    Returns:
+        int: The exit status, 1 if a page could not be recorded.
+    """
+    status = 0
+    for file_name, url in FIXTURE_PAGES.values():
+        try:
+            with get_session_pool().session() as session:
+                response = session.get(url, timeout=30)
+        except Exception as error:
+            print(f"[ERRO] {type(error).__name__} ao gravar {url}")
+            status = 1
+            continue
+        if response.status_code != 200:
+            print(f"[ERRO] Status {response.status_code} ao gravar {url}")
+            status = 1
+            continue
+        with open(os.path.join(FIXTURES_DIR, file_name), 'w', encoding='utf-8') as f:
+            f.write(response.text)
+        print(f"{url} -> {file_name} ({len(response.content)} bytes)")
+    return status
+
+def replay(directory, at=None):
+    """
+    Replaces the benchmark fixtures with pages of a page archive, without contacting HLTV.
+
+    Args:
+        directory (str): The directory of the archive, see `HLTV_ARCHIVE_DIR`.
+        at (float, optional): A Unix time; the pages as they were fetched at that time are used.
+                              Defaults to the last fetched pages.
+
+    Returns:
+        int: The exit status, 1 if a page is missing from the archive.
+    """
+    archive = PageArchive(directory)
+    status = 0
+    for file_name, url in FIXTURE_PAGES.values():
+        body = archive.read(url, at)
+        if body is None:
+            print(f"[ERRO] {url} não está no arquivo {directory}")
+            status = 1
+            continue
+        with open(os.path.join(FIXTURES_DIR, file_name), 'wb') as f:
+            f.write(body)
+        print(f"{url} -> {file_name} ({len(body)} bytes)")
+    return status
+
+def main(argv=None):
+    """
+    Records the benchmark fixtures from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(description='Replaces the benchmark fixtures with live or archived HLTV pages.')
+    parser.add_argument('--from-archive', metavar='DIR', help='Takes the pages from this page archive instead of HLTV.')
+    parser.add_argument('--at', type=float, help='With --from-archive, the Unix time of the pages to take.')
+    args = parser.parse_args(argv)
+    if args.from_archive:
+        return replay(args.from_archive, args.at)
+    return record()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+
+os.environ.setdefault('HLTV_PREWARM_TOP', '0')
+
+from benchmarks.upstream import StandInSessionPool, StandInUpstream
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.document import DocumentContext
+from scraper.errors import ScraperError
+from scraper.event_scraper import EventScraper
+from scraper.match_scraper import MatchScraper
+from scraper.page_cache import PageCache
+from scraper.parsers import PARSER_BACKENDS
+from scraper.rate_limiter import OutboundScheduler
+from scraper.result_scraper import ResultScraper
+from scraper.scraper import Scraper
+from scraper.single_flight import SingleFlight
+from scraper.team_scraper import TeamScraper
+from utils.response_cache import serialize
+
+ENDPOINTS = OrderedDict([
+    ('team', (TeamScraper, (5995, 'g2'), 'get_team_info')),
+    ('matches', (MatchScraper, (5995, 'g2'), 'get_upcoming_matches')),
+    ('events', (EventScraper, (7524, 'perfect-world-shanghai-major-2024'), 'get_event_details')),
+    ('result', (ResultScraper, (2377734, 'g2-vs-faze-perfect-world-shanghai-major-2024'), 'get_results'))
+])
+STAGES = ('fetch', 'parse', 'extract', 'serialize', 'total')
+COMPARED_STAGES = ('parse', 'extract', 'serialize')
+
+class BenchScraper(Scraper):
+    """
+    A scraper recording how long it spends fetching and parsing pages.
+
+    Fetch time covers the upstream requests and the backoff between retries; the rest of the
+    time spent in `html_parser` is parsing (and negligible cache bookkeeping).
+
+    Attributes:
+        timings (OrderedDict): The seconds spent in `fetch` and in `html_parser`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the scraper with zeroed timings.
+
+        Args:
+            *args: The `Scraper` arguments.
+            **kwargs: The `Scraper` keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.timings = OrderedDict([('fetch', 0.0), ('html_parser', 0.0)])
+        self._lock = threading.Lock()
+
+    def html_parser(self, url, regions=None):
+        start = time.perf_counter()
+        try:
+            return super().html_parser(url, regions)
+        finally:
+            self._record('html_parser', time.perf_counter() - start)
+
+    def _request(self, url, deadline, headers=None):
+        start = time.perf_counter()
+        try:
+            return super()._request(url, deadline, headers)
+        finally:
+            self._record('fetch', time.perf_counter() - start)
+
+    def _backoff(self, attempt, response):
+        delay = super()._backoff(attempt, response)
+        self._record('fetch', delay)
+        return delay
+
+    def _record(self, timing, seconds):
+        with self._lock:
+            self.timings[timing] += seconds
+
+def run_once(endpoint, pool):
+    """
+    Answers one request to an endpoint from a cold cache, timing each stage.
+
+    Match pages are fetched one at a time so the stage timings add up to the total.
+
+    Args:
+        endpoint (str): The endpoint to benchmark, a key of `ENDPOINTS`.
+        pool (SessionPool): The session pool talking to the stand-in server.
+
+    Returns:
+        OrderedDict: The seconds spent in each stage of `STAGES`.
+    """
+    scraper_class, args, method = ENDPOINTS[endpoint]
+    bench = BenchScraper(
+        pool=pool,
+        cache=PageCache(),
+        flights=SingleFlight(),
+        scheduler=OutboundScheduler(rate=0),
+        breaker=CircuitBreaker(threshold=sys.maxsize)
+    )
+    target = scraper_class(*args)
+    target.scraper_instance = bench
+    target.document = DocumentContext(bench)
+    if isinstance(target, MatchScraper):
+        target.concurrency = 1
+
+    start = time.perf_counter()
+    data = getattr(target, method)()
+    scraped = time.perf_counter()
+    serialize(data)
+    serialized = time.perf_counter()
+
+    return OrderedDict([
+        ('fetch', bench.timings['fetch']),
+        ('parse', bench.timings['html_parser'] - bench.timings['fetch']),
+        ('extract', scraped - start - bench.timings['html_parser']),
+        ('serialize', serialized - scraped),
+        ('total', serialized - start)
+    ])
+
+def benchmark(endpoint, pool, iterations, warmup=1):
+    """
+    Benchmarks an endpoint over several cold requests.
+
+    Peak memory is measured on one extra request, since tracing allocations slows everything down.
+
+    Args:
+        endpoint (str): The endpoint to benchmark, a key of `ENDPOINTS`.
+        pool (SessionPool): The session pool talking to the stand-in server.
+        iterations (int): The number of timed requests.
+        warmup (int): The number of requests made before timing.
+
+    Returns:
+        OrderedDict: The median and p95 milliseconds of each stage, the peak memory in KiB and
+                     the number of requests that failed.
+    """
+    for _ in range(warmup):
+        _attempt(endpoint, pool)
+
+    runs = []
+    failures = 0
+    for _ in range(iterations):
+        timings = _attempt(endpoint, pool)
+        if timings is None:
+            failures += 1
+        else:
+            runs.append(timings)
+
+    tracemalloc.start()
+    try:
+        _attempt(endpoint, pool)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return OrderedDict([
+        ('median_ms', OrderedDict((stage, _milliseconds(runs, stage, 0.5)) for stage in STAGES)),
+        ('p95_ms', OrderedDict((stage, _milliseconds(runs, stage, 0.95)) for stage in STAGES)),
+        ('peak_kib', round(peak / 1024, 1)),
+        ('failures', failures)
+    ])
+
+def compare(results, baseline, tolerance):
+    """
+    Lists the measurements that got worse than in a previous run.
+
+    Fetch times are left out since they mostly reflect the injected latency.
+
+    Args:
+        results (OrderedDict): The endpoint results of the current run.
+        baseline (dict): The endpoint results of the reference run.
+        tolerance (float): The relative slowdown allowed before a measurement counts as a regression.
+
+    Returns:
+        list: One `(endpoint, metric, baseline, current)` tuple per regression.
+    """
+    regressions = []
+    for endpoint, result in results.items():
+        reference = baseline.get(endpoint)
+        if reference is None:
+            continue
+        measurements = [(f'{stage}_ms', reference['median_ms'][stage], result['median_ms'][stage]) for stage in COMPARED_STAGES]
+        measurements.append(('peak_kib', reference['peak_kib'], result['peak_kib']))
+        for metric, before, after in measurements:
+            if before is not None and after is not None and after > before * (1 + tolerance):
+                regressions.append((endpoint, metric, before, after))
+    return regressions
+
+def main(argv=None):
+    """
+    Runs the benchmark suite from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: The exit status, 1 if a regression against the baseline was found.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the scrapers offline against recorded HLTV pages.'
+    )
+    parser.add_argument('endpoints', nargs='*', metavar='endpoint',
+                        help=f"The endpoints to benchmark among {', '.join(ENDPOINTS)}. Defaults to all of them.")
+    parser.add_argument('-n', '--iterations', type=int, default=20, help='Timed requests per endpoint.')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every upstream response.')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of upstream requests answered with 503.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the error injection.')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, help='The HTML parser backend. Defaults to HLTV_PARSER.')
+    parser.add_argument('--output', help='Writes the results to this JSON file.')
+    parser.add_argument('--baseline', help='Compares the results with those of a previous --output file.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Relative slowdown tolerated against the baseline.')
+    args = parser.parse_args(argv)
+    unknown = [endpoint for endpoint in args.endpoints if endpoint not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    if args.parser:
+        os.environ['HLTV_PARSER'] = args.parser
+
+    results = OrderedDict()
+    with StandInUpstream(latency=args.latency, error_rate=args.error_rate, seed=args.seed) as upstream:
+        pool = StandInSessionPool(upstream.url)
+        for endpoint in args.endpoints or list(ENDPOINTS):
+            results[endpoint] = benchmark(endpoint, pool, args.iterations)
+        upstream_stats = upstream.stats()
+
+    _print_report(results)
+    print(f"upstream: {dict(upstream_stats)}")
+
+    if args.output:
+        report = OrderedDict([
+            ('settings', OrderedDict([
+                ('iterations', args.iterations),
+                ('latency', args.latency),
+                ('error_rate', args.error_rate),
+                ('parser', os.environ.get('HLTV_PARSER', 'html.parser'))
+            ])),
+            ('endpoints', results)
+        ])
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['endpoints']
+        regressions = compare(results, baseline, args.tolerance)
+        for endpoint, metric, before, after in regressions:
+            print(f"[ERRO] Regressão em {endpoint} {metric}: {before} -> {after}")
+        if regressions:
+            return 1
+    return 0
+
+def _attempt(endpoint, pool):
+    try:
+        return run_once(endpoint, pool)
+    except ScraperError as error:
+        print(f"[ERRO] {endpoint}: {error}")
+        return None
+
+def _milliseconds(runs, stage, quantile):
+    if not runs:
+        return None
+    values = sorted(run[stage] for run in runs)
+    if quantile == 0.5:
+        return round(statistics.median(values) * 1000, 2)
+    return round(values[min(len(values) - 1, int(quantile * len(values)))] * 1000, 2)
+
+def _print_report(results):
+    header = f"{'endpoint':<10}" + ''.join(f"{stage:>20}" for stage in STAGES) + f"{'peak KiB':>12}{'failures':>10}"
+    print(header)
+    print('-' * len(header))
+    for endpoint, result in results.items():
+        cells = []
+        for stage in STAGES:
+            median, p95 = result['median_ms'][stage], result['p95_ms'][stage]
+            cells.append(f"{'-' if median is None else f'{median:.2f} / {p95:.2f}':>20}")
+        print(f"{endpoint:<10}" + ''.join(cells) + f"{result['peak_kib']:>12}{result['failures']:>10}")
+    print('(median / p95 milliseconds per stage)')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import OrderedDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = OrderedDict([
+    ('app', 'from app import create_app; create_app(warm=False)'),
+    ('scraping_stack', 'import scraper.async_scraper, scraper.live_poller'),
+    ('eager', 'from app import create_app; create_app(warm=False); import scraper.async_scraper, scraper.live_poller')
+])
+
+def measure(statement):
+    """
+    Times a statement in a fresh interpreter.
+
+    Args:
+        statement (str): The Python statement to run, usually imports.
+
+    Returns:
+        float: The seconds the statement took, excluding the interpreter startup.
+    """
+    code = f"import time; start = time.perf_counter(); {statement}; print(time.perf_counter() - start)"
+    environment = dict(os.environ, HLTV_WARM_UP='0', PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=environment, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+def heaviest_imports(module, top):
+    """
+    Lists the modules taking the longest to import among those a module imports directly.
+
+    Args:
+        module (str): The module to import.
+        top (int): The number of modules to list.
+
+    Returns:
+        list: `(module, milliseconds)` tuples, slowest first, counting the modules they import in turn.
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, env=dict(os.environ, HLTV_WARM_UP='0'), capture_output=True, text=True, check=True
+    )
+    children = []
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+        elif depth == 0:
+            if name.strip() == module:
+                return sorted(children, key=lambda child: child[1], reverse=True)[:top]
+            children = []
+    return []
+
+def main(argv=None):
+    """
+    Runs the startup benchmark from the command line.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        int: The exit status.
+    """
+    parser = argparse.ArgumentParser(
+        description='Measures how long a fresh process takes to create the app, with and without the scraping stack.'
+    )
+    parser.add_argument('-n', '--iterations', type=int, default=10, help='Fresh interpreters per mode.')
+    parser.add_argument('--top', type=int, default=10, help='Number of the heaviest imports of app listed.')
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<16}{'median ms':>12}{'p95 ms':>12}")
+    print('-' * 40)
+    for mode, statement in MODES.items():
+        values = sorted(measure(statement) for _ in range(args.iterations))
+        p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+        print(f"{mode:<16}{statistics.median(values) * 1000:>12.1f}{p95 * 1000:>12.1f}")
+
+    print("\nheaviest imports of app:")
+    for module, milliseconds in heaviest_imports('app', args.top):
+        print(f"  {module:<40}{milliseconds:>8.1f} ms")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
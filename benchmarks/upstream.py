@@ -0,0 +1,187 @@
+import gzip
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from scraper.rate_limiter import route_of
+from scraper.session_pool import SessionPool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FIXTURE_PAGES = OrderedDict([
+    ('team', ('team.html', 'https://www.hltv.org/team/5995/g2')),
+    ('matches', ('match.html', 'https://www.hltv.org/matches/2377734/g2-vs-faze-perfect-world-shanghai-major-2024')),
+    ('events', ('event.html', 'https://www.hltv.org/events/7524/perfect-world-shanghai-major-2024'))
+])
+
+class StandInUpstream:
+    """
+    A local HTTP server answering in place of HLTV with the recorded fixture pages.
+
+    Every page of a route gets the same fixture, e.g. any `/matches/...` URL gets the recorded
+    match page. Latency and failures can be injected to exercise the timeout and retry paths.
+    Like HLTV, pages carry an `ETag`, a matching `If-None-Match` is answered with `304 Not
+    Modified`, and bodies are gzipped for clients accepting it.
+
+    Attributes:
+        latency (float): The number of seconds every response is delayed by.
+        error_rate (float): The fraction of requests answered with `503 Service Unavailable`.
+        url (str): The base URL of the server, set once it is started.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, seed=0):
+        """
+        Initializes the server and loads the fixtures; call `start` to serve them.
+
+        Args:
+            latency (float): The number of seconds every response is delayed by.
+            error_rate (float): The fraction of requests answered with `503 Service Unavailable`.
+            seed (int): The seed of the failure injection, so runs are reproducible.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.url = None
+        self._random = random.Random(seed)
+        self._pages = {}
+        for route, (file_name, _) in FIXTURE_PAGES.items():
+            with open(os.path.join(FIXTURES_DIR, file_name), 'rb') as f:
+                self._pages[route] = f.read()
+        self._server = None
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('requests', 0),
+            ('injected_errors', 0),
+            ('not_found', 0),
+            ('not_modified', 0)
+        ])
+
+    def start(self):
+        """
+        Starts serving on a free local port in a background thread.
+
+        Returns:
+            StandInUpstream: The started server.
+        """
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, name='hltv-stand-in', daemon=True).start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server.
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def stats(self):
+        """
+        Returns a snapshot of the server counters.
+
+        Returns:
+            OrderedDict: The number of requests served, of injected errors, of unknown pages and
+                         of pages revalidated with a `304`.
+        """
+        with self._lock:
+            return OrderedDict(self._counters)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _answer(self, path, etag):
+        with self._lock:
+            self._counters['requests'] += 1
+            body = self._pages.get(route_of(f"https://www.hltv.org{path}"))
+            if body is None:
+                self._counters['not_found'] += 1
+                return 404, b'Not Found', None
+            if self._random.random() < self.error_rate:
+                self._counters['injected_errors'] += 1
+                return 503, b'Service Unavailable', None
+            current = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+            if etag == current:
+                self._counters['not_modified'] += 1
+                return 304, b'', current
+        return 200, body, current
+
+    def _handler(self):
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if upstream.latency:
+                    time.sleep(upstream.latency)
+                status, body, etag = upstream._answer(urlsplit(self.path).path, self.headers.get('If-None-Match'))
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                if body and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body, compresslevel=5)
+                    self.send_header('Content-Encoding', 'gzip')
+                if status != 304:
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+class StandInAdapter(HTTPAdapter):
+    """
+    A transport adapter sending the requests meant for HLTV to the stand-in server instead.
+    """
+
+    def __init__(self, base_url):
+        """
+        Initializes the adapter.
+
+        Args:
+            base_url (str): The base URL of the stand-in server.
+        """
+        super().__init__()
+        self.base_url = base_url
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f"{self.base_url}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+        return super().send(request, **kwargs)
+
+class StandInSessionPool(SessionPool):
+    """
+    A session pool whose CloudScraper sessions talk to the stand-in server instead of HLTV.
+
+    Attributes:
+        base_url (str): The base URL of the stand-in server.
+    """
+
+    def __init__(self, base_url, **kwargs):
+        """
+        Initializes an empty pool.
+
+        Args:
+            base_url (str): The base URL of the stand-in server.
+            **kwargs: The `SessionPool` settings.
+        """
+        super().__init__(**kwargs)
+        self.base_url = base_url
+
+    def _new_entry(self):
+        entry = super()._new_entry()
+        entry['session'].mount('https://www.hltv.org/', StandInAdapter(self.base_url))
+        return entry
@@ -0,0 +1,327 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urldefrag
+from scraper.batch import iter_batch, run_batch
+from scraper.document import DocumentContext
+from scraper.event_match_scraper import EventMatchScraper
+from scraper.event_scraper import EventScraper
+from scraper.match_scraper import MatchScraper
+from scraper.result_scraper import ResultScraper
+from scraper.scraper import Scraper
+from scraper.team_scraper import TeamScraper
+from utils.match_utils import MATCH_PAGE_REGIONS
+
+class AsyncScraper:
+    """
+    An asyncio front-end for `Scraper`.
+
+    CloudScraper only offers a blocking client, so the upstream request and the parse are
+    offloaded to a shared thread pool while the event loop keeps serving other coroutines.
+    Pages still go through the session pool, the page cache and fetch coalescing of `Scraper`.
+
+    Attributes:
+        scraper_instance (Scraper): The scraper doing the blocking fetch and parse.
+        executor (ThreadPoolExecutor): The thread pool the blocking work runs on.
+    """
+
+    def __init__(self, scraper_instance=None, executor=None):
+        """
+        Initializes the AsyncScraper instance.
+
+        Args:
+            scraper_instance (Scraper, optional): The scraper to wrap. Defaults to a new Scraper.
+            executor (ThreadPoolExecutor, optional): The thread pool to use. Defaults to the shared one.
+        """
+        self.scraper_instance = scraper_instance or Scraper()
+        self.executor = executor or get_executor()
+
+    async def html_parser(self, url, regions=None):
+        """
+        Fetches and parses a page without blocking the event loop.
+
+        The page is fetched in a copy of the current context, so the stale pages it serves are
+        reported to the request, see `watch_stale_pages`.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+            regions (tuple, optional): The regions of the page to materialize, see `parse_html`.
+
+        Returns:
+            BeautifulSoup: The parsed page, or None if the request failed.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, contextvars.copy_context().run, self.scraper_instance.html_parser, url, regions
+        )
+
+class AsyncDocumentContext(DocumentContext):
+    """
+    A DocumentContext whose pages can be fetched asynchronously ahead of extraction.
+
+    Once a page has been fetched with `fetch`, the synchronous extractors find it in the
+    context and never block on the network.
+    """
+
+    def __init__(self, scraper_instance):
+        """
+        Initializes an empty context.
+
+        Args:
+            scraper_instance (Scraper): The scraper used to fetch pages missing from the context.
+        """
+        super().__init__(scraper_instance)
+        self.async_scraper = AsyncScraper(scraper_instance)
+
+    async def fetch(self, url, regions=None):
+        """
+        Fetches a page into the context, if it is not there yet.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+            regions (tuple, optional): The regions of the page to materialize, see `parse_html`.
+
+        Returns:
+            BeautifulSoup: The parsed page, or None if it could not be fetched.
+        """
+        url = urldefrag(url).url
+        if url not in self._documents:
+            self._documents[url] = await self.async_scraper.html_parser(url, regions)
+        return self._documents[url]
+
+class AsyncTeamScraper(TeamScraper):
+    """
+    Asynchronous variant of TeamScraper.
+    """
+
+    def __init__(self, team_id, team_name):
+        super().__init__(team_id, team_name)
+        self.document = AsyncDocumentContext(self.scraper_instance)
+
+    async def get_team_info(self, fields=None):
+        """
+        Scrapes and returns the team's information from the HLTV website.
+
+        Args:
+            fields (tuple, optional): The response fields to return, among `FIELDS`. Defaults to all of them.
+
+        Returns:
+            Team: The team's name, logo, players, rankings, coach, and trophies, or an
+                  OrderedDict of the requested fields when `fields` is given.
+        """
+        await self.document.fetch(self.url, self.SCHEMA.select(fields, self.FIELDS).regions)
+        return super().get_team_info(fields)
+
+class AsyncMatchScraper(MatchScraper):
+    """
+    Asynchronous variant of MatchScraper.
+    """
+
+    def __init__(self, team_id, team_name):
+        super().__init__(team_id, team_name)
+        self.document = AsyncDocumentContext(self.scraper_instance)
+
+    async def get_upcoming_matches(self, limit=None):
+        """
+        Fetches the upcoming matches for the team, fetching the match pages concurrently.
+
+        Args:
+            limit (int, optional): The maximum number of matches to return. Defaults to all of them.
+
+        Returns:
+            list: A list of Match objects with the URL and details of each match.
+        """
+        return list(await asyncio.gather(*await self._fetch_matches(limit)))
+
+    async def iter_upcoming_matches(self, limit=None):
+        """
+        Same as `get_upcoming_matches`, but yields each match as soon as its details are ready.
+
+        Args:
+            limit (int, optional): The maximum number of matches to return. Defaults to all of them.
+
+        Yields:
+            Match: The URL and details of a match, in completion order.
+        """
+        for match in asyncio.as_completed(await self._fetch_matches(limit)):
+            yield await match
+
+    async def _fetch_matches(self, limit):
+        """
+        Lists the upcoming matches and prepares the coroutines fetching their details.
+
+        As in `get_upcoming_matches`, the match pages share a single deadline, `timeout` seconds
+        after they are listed.
+
+        Args:
+            limit (int, optional): The maximum number of matches.
+
+        Returns:
+            list: One coroutine per match, returning the match entry of the response.
+        """
+        soup = await self.document.fetch(self.url, self.REGIONS)
+        match_urls = self._get_match_urls(soup, limit)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+
+        async def fetch_page(match):
+            async with semaphore:
+                if loop.time() >= deadline:
+                    raise TimeoutError()
+                await self.document.fetch(match['match_url'], MATCH_PAGE_REGIONS)
+
+        async def fetch_match(match):
+            # The fetch keeps its slot until the blocking request is over, even past the deadline,
+            # so no more than `concurrency` match pages are ever fetched at the same time.
+            fetch = asyncio.ensure_future(fetch_page(match))
+            try:
+                done, _ = await asyncio.wait({fetch}, timeout=max(deadline - loop.time(), 0))
+                if fetch not in done:
+                    fetch.add_done_callback(_discard_result)
+                    raise TimeoutError()
+                fetch.result()
+                details = self.get_details(match['match_url'], match['team1_url'], match['team2_url'])
+            except Exception as error:
+                print(f"[ERRO] {type(error).__name__} ao buscar {match['match_url']}")
+                details = None
+            return self._build_match(match, details)
+
+        return [fetch_match(match) for match in match_urls]
+
+class AsyncEventScraper(EventScraper):
+    """
+    Asynchronous variant of EventScraper.
+    """
+
+    def __init__(self, event_id, event_name):
+        super().__init__(event_id, event_name)
+        self.document = AsyncDocumentContext(self.scraper_instance)
+
+    async def get_event_details(self, fields=None):
+        """
+        Retrieves event details such as title, date, prize pool, teams, location, and prize distribution.
+
+        Args:
+            fields (tuple, optional): The response fields to return, among `FIELDS`. Defaults to all of them.
+
+        Returns:
+            Event: The event details, or an OrderedDict of the requested fields when `fields` is given.
+        """
+        await self.document.fetch(self.url, self.SCHEMA.select(fields, self.FIELDS).regions)
+        return super().get_event_details(fields)
+
+class AsyncEventMatchScraper(EventMatchScraper):
+    """
+    Asynchronous variant of EventMatchScraper.
+    """
+
+    def __init__(self, event_id, event_name):
+        super().__init__(event_id, event_name)
+        self.document = AsyncDocumentContext(self.scraper_instance)
+
+    async def get_event_matches(self):
+        """
+        Scrapes the result of every finished match of the event, scraping the matches concurrently.
+
+        Returns:
+            list: One OrderedDict per match, in listing order, holding its `id`, `name` and
+                  either the `data` of its Result or an `error`.
+        """
+        items, load = await self._list_matches()
+        return await run_batch(
+            AsyncResultScraper, 'get_results', items, 'Match not found', self.concurrency, 'result', load
+        )
+
+    async def iter_event_matches(self):
+        """
+        Same as `get_event_matches`, but yields the result of each match as soon as it is ready.
+
+        Yields:
+            OrderedDict: The result of a match, in completion order.
+        """
+        items, load = await self._list_matches()
+        async for result in iter_batch(
+            AsyncResultScraper, 'get_results', items, 'Match not found', self.concurrency, 'result', load
+        ):
+            yield result
+
+    async def _list_matches(self):
+        """
+        Lists the finished matches of the event without blocking the event loop.
+
+        Returns:
+            tuple: The `(id, name)` pairs of the matches, and the function reading the stored
+                   result of a match from its ID.
+        """
+        loop = asyncio.get_running_loop()
+        matches = await loop.run_in_executor(
+            self.document.async_scraper.executor, contextvars.copy_context().run, self._get_matches
+        )
+        by_id = {match['id']: match for match in matches}
+        return [(match['id'], match['name']) for match in matches], lambda match_id: self._load_result(by_id[match_id])
+
+class AsyncResultScraper(ResultScraper):
+    """
+    Asynchronous variant of ResultScraper.
+    """
+
+    def __init__(self, match_id, match_name):
+        super().__init__(match_id, match_name)
+        self.document = AsyncDocumentContext(self.scraper_instance)
+
+    async def get_results(self, fields=None):
+        """
+        Retrieves the details and map scores of a match.
+
+        Args:
+            fields (tuple, optional): The response fields to return, among `FIELDS`. Defaults to all of them.
+
+        Returns:
+            Result: The match details and the maps played, or an OrderedDict of the requested
+                    fields when `fields` is given.
+        """
+        await self.document.fetch(self.url, self.SCHEMA.select(fields, self.FIELDS).regions)
+        return super().get_results(fields)
+
+    async def iter_results(self):
+        """
+        Same as `get_results`, but yields the match details and then each map separately.
+
+        Yields:
+            object: A `{'details': ...}` item followed by one MapResult per map.
+        """
+        results = await self.get_results()
+        yield {'details': results.details}
+        for map_result in results.maps:
+            yield map_result
+
+def _discard_result(task):
+    # Retrieves the outcome of a fetch given up on, so asyncio does not log it as unhandled.
+    if not task.cancelled():
+        task.exception()
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """
+    Returns the thread pool shared by all async scrapers, creating it on first use.
+
+    Its size is configured through the `HLTV_ASYNC_WORKERS` environment variable. Upstream
+    concurrency is still bounded by the session pool size.
+
+    Returns:
+        ThreadPoolExecutor: The shared thread pool.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(os.environ.get('HLTV_ASYNC_WORKERS', 32)),
+                    thread_name_prefix='hltv-fetch'
+                )
+    return _executor
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from scraper.entity_store import get_entity_store
+from scraper.page_cache import watch_stale_pages
+
+MAX_BATCH_SIZE = 100
+# The names are put in HLTV URLs, so they must be a single path segment with nothing to escape.
+NAME = re.compile(r'[\w.-]+')
+
+def parse_batch_items(payload):
+    """
+    Validates the body of a batch request.
+
+    Args:
+        payload (list): A list of `[id, name]` pairs or `{"id": ..., "name": ...}` objects.
+
+    Returns:
+        list: A list of `(id, name)` tuples, or None if the payload is invalid, e.g. when an ID is
+              negative or a name is not a slug of letters, digits, `-`, `_` and `.`.
+    """
+    if not isinstance(payload, list) or not 0 < len(payload) <= MAX_BATCH_SIZE:
+        return None
+
+    items = []
+    for item in payload:
+        if isinstance(item, dict):
+            item = (item.get('id'), item.get('name'))
+        if not isinstance(item, (list, tuple)) or len(item) != 2:
+            return None
+        item_id, item_name = item
+        if isinstance(item_id, bool) or not isinstance(item_id, int) or item_id < 0:
+            return None
+        if not isinstance(item_name, str) or not NAME.fullmatch(item_name):
+            return None
+        items.append((item_id, item_name))
+    return items
+
+async def run_batch(scraper_class, method_name, items, not_found, concurrency=None, kind=None, load=None):
+    """
+    Runs an async scraper over several `(id, name)` pairs concurrently.
+
+    At most `concurrency` items are scraped at the same time. A failing item does not fail
+    the batch; its error is reported in its own result.
+
+    Args:
+        scraper_class (type): The async scraper class, e.g. AsyncTeamScraper.
+        method_name (str): The coroutine method returning the scraped data.
+        items (list): The `(id, name)` tuples to scrape.
+        not_found (str): The error reported when the scraper returns no data.
+        concurrency (int, optional): The maximum number of items scraped at the same time.
+                                     Defaults to the `HLTV_BATCH_CONCURRENCY` environment variable.
+        kind (str, optional): The kind of the items in the entity store. Fresh stored items are
+                              not scraped again and scraped items are stored, unless they were
+                              scraped from expired pages.
+        load (callable, optional): Reads a stored item from its ID instead of the entity store's
+                                   freshness rule for `kind`, returning None when it must be scraped.
+
+    Returns:
+        list: One OrderedDict per item, in request order, holding either `data` or `error`.
+    """
+    return await asyncio.gather(*_scrape_items(scraper_class, method_name, items, not_found, concurrency, kind, load))
+
+async def iter_batch(scraper_class, method_name, items, not_found, concurrency=None, kind=None, load=None):
+    """
+    Same as `run_batch`, but yields each result as soon as it is ready.
+
+    Args:
+        scraper_class (type): The async scraper class, e.g. AsyncTeamScraper.
+        method_name (str): The coroutine method returning the scraped data.
+        items (list): The `(id, name)` tuples to scrape.
+        not_found (str): The error reported when the scraper returns no data.
+        concurrency (int, optional): The maximum number of items scraped at the same time.
+        kind (str, optional): The kind of the items in the entity store.
+        load (callable, optional): Reads a stored item from its ID, see `run_batch`.
+
+    Yields:
+        OrderedDict: The result of an item, in completion order.
+    """
+    scrapes = _scrape_items(scraper_class, method_name, items, not_found, concurrency, kind, load)
+    for result in asyncio.as_completed(scrapes):
+        yield await result
+
+def _scrape_items(scraper_class, method_name, items, not_found, concurrency, kind=None, load=None):
+    concurrency = concurrency or int(os.environ.get('HLTV_BATCH_CONCURRENCY', 8))
+    semaphore = asyncio.Semaphore(concurrency)
+    store = get_entity_store()
+
+    async def scrape(item_id, item_name):
+        result = OrderedDict([('id', item_id), ('name', item_name)])
+        if load is not None:
+            data = load(item_id)
+        else:
+            data = store.load(kind, item_id) if kind else None
+        if data is None:
+            # Each item is scraped in a task of its own, so its stale pages are told apart from
+            # those of the other items while still being reported to the request.
+            stale = watch_stale_pages(nested=True)
+            async with semaphore:
+                try:
+                    data = await getattr(scraper_class(item_id, item_name), method_name)()
+                except Exception as error:
+                    result['error'] = f"{type(error).__name__}: {error}"
+                    return result
+            if data and kind and not stale:
+                store.save(kind, item_id, item_name, data)
+        if data:
+            result['data'] = data
+        else:
+            result['error'] = not_found
+        return result
+
+    return [scrape(item_id, item_name) for item_id, item_name in items]
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class CircuitBreaker:
+    """
+    Stops sending requests to HLTV while it keeps failing.
+
+    After `threshold` consecutive failures the circuit opens and requests fail fast for
+    `cooldown` seconds. Then a single trial request is let through: a success closes the
+    circuit, a failure opens it again, and a trial that gave up before reaching HLTV is
+    released with `release_trial` so the next request can try instead.
+
+    Attributes:
+        threshold (int): The number of consecutive failures that opens the circuit.
+        cooldown (float): The number of seconds the circuit stays open.
+    """
+
+    def __init__(self, threshold=5, cooldown=30):
+        """
+        Initializes a closed circuit.
+
+        Args:
+            threshold (int): The number of consecutive failures that opens the circuit.
+            cooldown (float): The number of seconds the circuit stays open.
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._trial_thread = None
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('opened', 0),
+            ('rejected', 0)
+        ])
+
+    def allow(self):
+        """
+        Tells whether a request may be sent now.
+
+        Returns:
+            bool: False while the circuit is open.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.cooldown and not self._trial_running:
+                self._trial_running = True
+                self._trial_thread = threading.get_ident()
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def record_success(self):
+        """
+        Records a request that reached a healthy HLTV, closing the circuit.
+        """
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def release_trial(self):
+        """
+        Gives up the trial request let through by `allow` on this thread, counting neither a
+        success nor a failure, e.g. when it timed out before being sent to HLTV.
+        """
+        with self._lock:
+            if self._trial_running and self._trial_thread == threading.get_ident():
+                self._trial_running = False
+
+    def record_failure(self):
+        """
+        Records a failed request, opening the circuit once the threshold is reached.
+        """
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or (self._opened_at is None and self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self._counters['opened'] += 1
+            self._trial_running = False
+
+    def state(self):
+        """
+        Returns the current state of the circuit.
+
+        Returns:
+            str: `closed`, `open` or `half-open`.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if self._trial_running or time.monotonic() - self._opened_at >= self.cooldown:
+                return 'half-open'
+            return 'open'
+
+    def stats(self):
+        """
+        Returns a snapshot of the circuit counters.
+
+        Returns:
+            OrderedDict: The state, the consecutive failures and how often the circuit opened.
+        """
+        stats = OrderedDict([('state', self.state())])
+        with self._lock:
+            stats['consecutive_failures'] = self._failures
+            stats.update(self._counters)
+        return stats
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+def get_circuit_breaker():
+    """
+    Returns the process-wide circuit breaker guarding HLTV, creating it on first use.
+
+    It is configured through the `HLTV_BREAKER_THRESHOLD` and `HLTV_BREAKER_COOLDOWN`
+    environment variables.
+
+    Returns:
+        CircuitBreaker: The shared circuit breaker.
+    """
+    global _breaker
+    if _breaker is None:
+        with _breaker_lock:
+            if _breaker is None:
+                _breaker = CircuitBreaker(
+                    threshold=int(os.environ.get('HLTV_BREAKER_THRESHOLD', 5)),
+                    cooldown=float(os.environ.get('HLTV_BREAKER_COOLDOWN', 30))
+                )
+    return _breaker
@@ -0,0 +1,43 @@
+from urllib.parse import urldefrag
+
+class DocumentContext:
+    """
+    Carries the pages fetched while answering a single request.
+
+    Every page is fetched and parsed at most once per context, so extractors spread over
+    several scrapers and helpers (e.g. `ResultScraper` and `get_match_details`) share the
+    same parsed document. It exposes the same `html_parser` method as `Scraper` and can be
+    passed wherever a scraper instance is expected.
+
+    Attributes:
+        scraper_instance (Scraper): The scraper used to fetch pages missing from the context.
+    """
+
+    def __init__(self, scraper_instance):
+        """
+        Initializes an empty context.
+
+        Args:
+            scraper_instance (Scraper): The scraper used to fetch pages missing from the context.
+        """
+        self.scraper_instance = scraper_instance
+        self._documents = {}
+
+    def html_parser(self, url, regions=None):
+        """
+        Returns the parsed page for a URL, fetching it on first access.
+
+        The regions requested by the first access are kept for the rest of the request, so
+        callers sharing a page declare the union of the regions they need.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+            regions (tuple, optional): The regions of the page to materialize, see `parse_html`.
+
+        Returns:
+            BeautifulSoup: The parsed page, or None if it could not be fetched.
+        """
+        url = urldefrag(url).url
+        if url not in self._documents:
+            self._documents[url] = self.scraper_instance.html_parser(url, regions)
+        return self._documents[url]
@@ -0,0 +1,558 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from scraper.models import (
+    Coach, Event, Location, MapResult, Match, MatchDetails, MatchTeam, Placement, Player, Ranking, Result, Team, Trophy
+)
+
+TABLES = """
+CREATE TABLE IF NOT EXISTS teams (
+    team_id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL,
+    name TEXT,
+    image TEXT,
+    valve_ranking TEXT,
+    hltv_ranking TEXT,
+    coach_nickname TEXT,
+    coach_flag TEXT,
+    scraped_at REAL,
+    schedule_scraped_at REAL
+);
+CREATE TABLE IF NOT EXISTS players (
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    nickname TEXT,
+    flag TEXT,
+    image TEXT,
+    title TEXT,
+    PRIMARY KEY (team_id, position)
+);
+CREATE TABLE IF NOT EXISTS trophies (
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    image TEXT,
+    url TEXT,
+    PRIMARY KEY (team_id, position)
+);
+CREATE TABLE IF NOT EXISTS schedules (
+    team_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    match_id INTEGER,
+    match_url TEXT,
+    PRIMARY KEY (team_id, position)
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL,
+    title TEXT,
+    date TEXT,
+    prize_pool TEXT,
+    teams TEXT,
+    location_flag TEXT,
+    location TEXT,
+    location_type TEXT,
+    scraped_at REAL
+);
+CREATE TABLE IF NOT EXISTS placements (
+    event_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    place TEXT,
+    team_name TEXT,
+    team_logo TEXT,
+    prizes TEXT,
+    PRIMARY KEY (event_id, position)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    slug TEXT NOT NULL,
+    date TEXT,
+    time TEXT,
+    team1_name TEXT,
+    team1_logo TEXT,
+    team2_name TEXT,
+    team2_logo TEXT,
+    match_format TEXT,
+    scraped_at REAL,
+    results_scraped_at REAL
+);
+CREATE TABLE IF NOT EXISTS map_results (
+    match_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    map TEXT,
+    team1_score TEXT,
+    team2_score TEXT,
+    PRIMARY KEY (match_id, position)
+);
+"""
+
+MATCH_URL = re.compile(r'/matches/(\d+)/([^/?#]+)')
+
+class EntityStore:
+    """
+    A local SQLite store of the scraped teams, players, events, matches and map results.
+
+    Entities are upserted under their HLTV IDs every time they are scraped. Rows of rosters,
+    trophies, placements, schedules and maps are keyed by their position and only rewritten when
+    they changed, and the rows past the end of a shorter list are removed. Reads rebuild the
+    models from the store and only return entities scraped less than `max_age` seconds ago,
+    so an endpoint can answer without scraping and a restart does not lose what was scraped.
+    The result of a match known to be over is final and can be read back whatever its age.
+
+    Connections to the database are pooled and borrowed by one thread at a time, so the short
+    lived threads serving async requests reuse them instead of opening their own. The database
+    runs in WAL mode so readers do not wait for writers. Storage errors are logged and never
+    fail a request.
+
+    Attributes:
+        path (str): The path of the SQLite database, None when the store is disabled.
+        max_age (float): The number of seconds a stored entity may be served for, 0 to only write.
+        max_idle (int): The number of idle connections kept open for the next reads and writes.
+    """
+
+    def __init__(self, path=None, max_age=0, max_idle=8):
+        """
+        Initializes the store; the database is created on first use.
+
+        Args:
+            path (str, optional): The path of the SQLite database. Defaults to a disabled store.
+            max_age (float): The number of seconds a stored entity may be served for, 0 to only write.
+            max_idle (int): The number of idle connections kept open for the next reads and writes.
+        """
+        self.path = path
+        self.max_age = max_age
+        self.max_idle = max_idle
+        self._idle = []
+        self._lock = threading.Lock()
+        self._created = False
+        self._counters = OrderedDict([
+            ('hits', 0),
+            ('misses', 0),
+            ('writes', 0),
+            ('rows_changed', 0),
+            ('errors', 0)
+        ])
+        self._loaders = {
+            'team': self.load_team,
+            'schedule': self.load_schedule,
+            'event': self.load_event,
+            'result': self.load_result
+        }
+        self._savers = {
+            'team': self.save_team,
+            'schedule': self.save_schedule,
+            'event': self.save_event,
+            'result': self.save_result
+        }
+
+    @property
+    def enabled(self):
+        """
+        Tells whether scraped entities are persisted.
+
+        Returns:
+            bool: True if the store has a database path.
+        """
+        return self.path is not None
+
+    def load(self, kind, entity_id):
+        """
+        Returns a fresh stored entity of any kind.
+
+        Args:
+            kind (str): The kind of entity, one of `team`, `schedule`, `event` or `result`.
+            entity_id (int): The HLTV ID of the entity.
+
+        Returns:
+            object: The entity's model, or None if it is missing, stale or reads are disabled.
+        """
+        return self._loaders[kind](entity_id)
+
+    def save(self, kind, entity_id, slug, data):
+        """
+        Upserts a scraped entity of any kind.
+
+        Args:
+            kind (str): The kind of entity, one of `team`, `schedule`, `event` or `result`.
+            entity_id (int): The HLTV ID of the entity.
+            slug (str): The name of the entity in its HLTV URL.
+            data (object): The scraped model.
+        """
+        self._savers[kind](entity_id, slug, data)
+
+    def load_team(self, team_id):
+        """
+        Returns a fresh stored team.
+
+        Args:
+            team_id (int): The HLTV ID of the team.
+
+        Returns:
+            Team: The team with its players and trophies, or None if it is missing or stale.
+        """
+        def read(connection):
+            row = self._fresh_row(connection, 'SELECT * FROM teams WHERE team_id = ?', team_id)
+            if row is None:
+                return None
+            return Team(
+                name=row['name'],
+                image=row['image'],
+                players=[Player(*player) for player in connection.execute(
+                    'SELECT nickname, flag, image, title FROM players WHERE team_id = ? ORDER BY position', (team_id,)
+                )],
+                ranking=Ranking(valve_ranking=row['valve_ranking'], hltv_ranking=row['hltv_ranking']),
+                coach=Coach(nickname=row['coach_nickname'], flag=row['coach_flag']),
+                trophies=[Trophy(*trophy) for trophy in connection.execute(
+                    'SELECT title, image, url FROM trophies WHERE team_id = ? ORDER BY position', (team_id,)
+                )]
+            )
+
+        return self._read(read)
+
+    def save_team(self, team_id, slug, team):
+        """
+        Upserts a scraped team with its players and trophies.
+
+        Args:
+            team_id (int): The HLTV ID of the team.
+            slug (str): The name of the team in its HLTV URL.
+            team (Team): The scraped team.
+        """
+        ranking = team.ranking or Ranking(None, None)
+        coach = team.coach or Coach(None, None)
+
+        def write(connection):
+            _upsert(connection, 'teams', ('team_id',), OrderedDict([
+                ('team_id', team_id),
+                ('slug', slug),
+                ('name', team.name),
+                ('image', team.image),
+                ('valve_ranking', ranking.valve_ranking),
+                ('hltv_ranking', ranking.hltv_ranking),
+                ('coach_nickname', coach.nickname),
+                ('coach_flag', coach.flag),
+                ('scraped_at', time.time())
+            ]))
+            _replace_list(connection, 'players', 'team_id', team_id, ('nickname', 'flag', 'image', 'title'), [
+                (player.nickname, player.flag, player.image, player.title) for player in team.players
+            ])
+            _replace_list(connection, 'trophies', 'team_id', team_id, ('title', 'image', 'url'), [
+                (trophy.title, trophy.image, trophy.url) for trophy in team.trophies
+            ])
+
+        self._write(write)
+
+    def load_schedule(self, team_id):
+        """
+        Returns the fresh stored upcoming matches of a team.
+
+        Args:
+            team_id (int): The HLTV ID of the team.
+
+        Returns:
+            list: The Match objects, or None if the schedule is missing or stale.
+        """
+        def read(connection):
+            row = self._fresh_row(
+                connection, 'SELECT schedule_scraped_at FROM teams WHERE team_id = ?', team_id, 'schedule_scraped_at'
+            )
+            if row is None:
+                return None
+            rows = connection.execute(
+                'SELECT s.match_url, m.* FROM schedules s LEFT JOIN matches m ON m.match_id = s.match_id '
+                'WHERE s.team_id = ? ORDER BY s.position', (team_id,)
+            )
+            return [
+                Match(match_url=row['match_url'], details=_match_details(row) if row['slug'] is not None else None)
+                for row in rows
+            ]
+
+        return self._read(read)
+
+    def save_schedule(self, team_id, slug, matches):
+        """
+        Upserts the upcoming matches of a team and the details of each match.
+
+        Args:
+            team_id (int): The HLTV ID of the team.
+            slug (str): The name of the team in its HLTV URL.
+            matches (list): The scraped Match objects, in schedule order.
+        """
+        def write(connection):
+            _upsert(connection, 'teams', ('team_id',), OrderedDict([
+                ('team_id', team_id),
+                ('slug', slug),
+                ('schedule_scraped_at', time.time())
+            ]))
+            rows = []
+            for match in matches:
+                found = MATCH_URL.search(match.match_url)
+                match_id = int(found.group(1)) if found else None
+                if found and match.details is not None:
+                    _upsert_match(connection, match_id, found.group(2), match.details)
+                rows.append((match_id, match.match_url))
+            _replace_list(connection, 'schedules', 'team_id', team_id, ('match_id', 'match_url'), rows)
+
+        self._write(write)
+
+    def load_event(self, event_id):
+        """
+        Returns a fresh stored event.
+
+        Args:
+            event_id (int): The HLTV ID of the event.
+
+        Returns:
+            Event: The event with its prize distribution, or None if it is missing or stale.
+        """
+        def read(connection):
+            row = self._fresh_row(connection, 'SELECT * FROM events WHERE event_id = ?', event_id)
+            if row is None:
+                return None
+            prize_distribution = {}
+            for place, team_name, team_logo, prizes in connection.execute(
+                'SELECT place, team_name, team_logo, prizes FROM placements WHERE event_id = ? ORDER BY position',
+                (event_id,)
+            ):
+                prize_distribution.setdefault(place, []).append(Placement(
+                    team_name=team_name,
+                    team_logo=team_logo,
+                    prizes=json.loads(prizes)
+                ))
+            return Event(
+                title=row['title'],
+                date=row['date'],
+                prize_pool=row['prize_pool'],
+                teams=row['teams'],
+                location=Location(flag=row['location_flag'], location=row['location'], type=row['location_type']),
+                prize_distribution=prize_distribution
+            )
+
+        return self._read(read)
+
+    def save_event(self, event_id, slug, event):
+        """
+        Upserts a scraped event with its prize distribution.
+
+        Args:
+            event_id (int): The HLTV ID of the event.
+            slug (str): The name of the event in its HLTV URL.
+            event (Event): The scraped event.
+        """
+        def write(connection):
+            _upsert(connection, 'events', ('event_id',), OrderedDict([
+                ('event_id', event_id),
+                ('slug', slug),
+                ('title', event.title),
+                ('date', event.date),
+                ('prize_pool', event.prize_pool),
+                ('teams', event.teams),
+                ('location_flag', event.location.flag),
+                ('location', event.location.location),
+                ('location_type', event.location.type),
+                ('scraped_at', time.time())
+            ]))
+            _replace_list(connection, 'placements', 'event_id', event_id, ('place', 'team_name', 'team_logo', 'prizes'), [
+                (place, placement.team_name, placement.team_logo, json.dumps(placement.prizes, ensure_ascii=False))
+                for place, placements in event.prize_distribution.items()
+                for placement in placements
+            ])
+
+        self._write(write)
+
+    def load_result(self, match_id, final_after=None):
+        """
+        Returns the fresh stored result of a match.
+
+        Args:
+            match_id (int): The HLTV ID of the match.
+            final_after (float, optional): A time by which the match is known to be over. A result
+                                           stored after it is final and returned whatever its age,
+                                           even when `max_age` is 0.
+
+        Returns:
+            Result: The match details and map scores, or None if they are missing or stale.
+        """
+        def read(connection):
+            row = self._fresh_row(
+                connection, 'SELECT * FROM matches WHERE match_id = ?', match_id, 'results_scraped_at', final_after
+            )
+            if row is None:
+                return None
+            return Result(
+                details=_match_details(row),
+                maps=[MapResult(*map_result) for map_result in connection.execute(
+                    'SELECT map, team1_score, team2_score FROM map_results WHERE match_id = ? ORDER BY position',
+                    (match_id,)
+                )]
+            )
+
+        return self._read(read, final_after is not None)
+
+    def save_result(self, match_id, slug, result):
+        """
+        Upserts the details and map scores of a match.
+
+        Args:
+            match_id (int): The HLTV ID of the match.
+            slug (str): The name of the match in its HLTV URL.
+            result (Result): The scraped result.
+        """
+        def write(connection):
+            _upsert_match(connection, match_id, slug, result.details, results_scraped_at=time.time())
+            _replace_list(connection, 'map_results', 'match_id', match_id, ('map', 'team1_score', 'team2_score'), [
+                (map_result.map, map_result.team1_score, map_result.team2_score) for map_result in result.maps
+            ])
+
+        self._write(write)
+
+    def stats(self):
+        """
+        Returns a snapshot of the store counters.
+
+        Returns:
+            OrderedDict: Whether the store is enabled, fresh reads, misses, saved entities,
+                         rows actually inserted, updated or deleted, and storage errors.
+        """
+        with self._lock:
+            stats = OrderedDict([('enabled', self.enabled)])
+            stats.update(self._counters)
+        return stats
+
+    @contextmanager
+    def _connection(self):
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        if connection is None:
+            connection = self._connect()
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def _connect(self):
+        # Pooled connections move between threads, but only one of them uses a connection at a time.
+        connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        with self._lock:
+            if not self._created:
+                connection.executescript(TABLES)
+                self._created = True
+        return connection
+
+    def _fresh_row(self, connection, query, entity_id, column='scraped_at', final_after=None):
+        row = connection.execute(query, (entity_id,)).fetchone()
+        if row is None or row[column] is None:
+            return None
+        if time.time() - row[column] > self.max_age and (final_after is None or row[column] < final_after):
+            return None
+        return row
+
+    def _read(self, read, final=False):
+        if not self.enabled or self.max_age <= 0 and not final:
+            return None
+        try:
+            with self._connection() as connection:
+                data = read(connection)
+        except sqlite3.Error as error:
+            print(f"[ERRO] Falha ao ler o armazenamento: {error}")
+            self._count('errors')
+            return None
+        self._count('hits' if data is not None else 'misses')
+        return data
+
+    def _write(self, write):
+        if not self.enabled:
+            return
+        try:
+            with self._connection() as connection:
+                changes = connection.total_changes
+                with connection:
+                    write(connection)
+                self._count('writes')
+                self._count('rows_changed', connection.total_changes - changes)
+        except sqlite3.Error as error:
+            print(f"[ERRO] Falha ao gravar no armazenamento: {error}")
+            self._count('errors')
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+def _upsert(connection, table, keys, values):
+    columns = ', '.join(values)
+    placeholders = ', '.join('?' for _ in values)
+    updates = ', '.join(f'{column} = excluded.{column}' for column in values if column not in keys)
+    connection.execute(
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {updates}",
+        tuple(values.values())
+    )
+
+def _replace_list(connection, table, key, key_value, columns, rows):
+    current = ', '.join(columns)
+    new = ', '.join(f'excluded.{column}' for column in columns)
+    connection.executemany(
+        f"INSERT INTO {table} ({key}, position, {current}) VALUES ({', '.join('?' * (len(columns) + 2))}) "
+        f"ON CONFLICT ({key}, position) DO UPDATE SET ({current}) = ({new}) WHERE ({current}) IS NOT ({new})",
+        [(key_value, position) + tuple(row) for position, row in enumerate(rows)]
+    )
+    connection.execute(f"DELETE FROM {table} WHERE {key} = ? AND position >= ?", (key_value, len(rows)))
+
+def _upsert_match(connection, match_id, slug, details, **columns):
+    _upsert(connection, 'matches', ('match_id',), OrderedDict([
+        ('match_id', match_id),
+        ('slug', slug),
+        ('date', details.date),
+        ('time', details.time),
+        ('team1_name', details.team1.name),
+        ('team1_logo', details.team1.logo),
+        ('team2_name', details.team2.name),
+        ('team2_logo', details.team2.logo),
+        ('match_format', details.match_format),
+        ('scraped_at', time.time())
+    ] + list(columns.items())))
+
+def _match_details(row):
+    return MatchDetails(
+        date=row['date'],
+        time=row['time'],
+        team1=MatchTeam(name=row['team1_name'], logo=row['team1_logo']),
+        team2=MatchTeam(name=row['team2_name'], logo=row['team2_logo']),
+        match_format=row['match_format']
+    )
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_entity_store():
+    """
+    Returns the process-wide entity store, creating it on first use.
+
+    Entities are only persisted when the `HLTV_STORE_PATH` environment variable names the
+    SQLite database, and only served from it when `HLTV_STORE_MAX_AGE` is positive.
+
+    Returns:
+        EntityStore: The shared entity store.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = EntityStore(
+                    path=os.environ.get('HLTV_STORE_PATH') or None,
+                    max_age=float(os.environ.get('HLTV_STORE_MAX_AGE', 0))
+                )
+    return _store
@@ -0,0 +1,64 @@
+class ScraperError(Exception):
+    """
+    Base class of the errors raised while fetching a page from HLTV.
+
+    Attributes:
+        url (str): The URL being fetched.
+        status (int): The HTTP status the API answers with for this error.
+    """
+    status = 502
+
+    def __init__(self, url, message):
+        """
+        Initializes the error.
+
+        Args:
+            url (str): The URL being fetched.
+            message (str): A description of the failure.
+        """
+        super().__init__(message)
+        self.url = url
+
+class UpstreamError(ScraperError):
+    """
+    HLTV answered with an unexpected status or the connection failed.
+
+    Attributes:
+        upstream_status (int): The status returned by HLTV, or None if no response was received.
+    """
+
+    def __init__(self, url, upstream_status=None, message=None):
+        """
+        Initializes the error.
+
+        Args:
+            url (str): The URL being fetched.
+            upstream_status (int, optional): The status returned by HLTV.
+            message (str, optional): A description of the failure.
+        """
+        super().__init__(url, message or f"Status {upstream_status} ao acessar {url}")
+        self.upstream_status = upstream_status
+
+class PageNotFound(UpstreamError):
+    """
+    HLTV has no page at the requested URL.
+    """
+    status = 404
+
+class UpstreamTimeout(ScraperError):
+    """
+    The deadline of the request expired before HLTV answered.
+    """
+    status = 504
+
+    def __init__(self, url):
+        super().__init__(url, f"Tempo esgotado ao acessar {url}")
+
+class CircuitOpenError(ScraperError):
+    """
+    HLTV is considered degraded and requests fail fast without being sent.
+    """
+    status = 503
+
+    def __init__(self, url):
+        super().__init__(url, f"HLTV indisponível, requisição para {url} não enviada")
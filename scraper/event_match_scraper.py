@@ -0,0 +1,161 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from scraper.document import DocumentContext
+from scraper.entity_store import MATCH_URL, get_entity_store
+from scraper.extraction import Schema, attr, every, first, own
+from scraper.result_scraper import ResultScraper
+from scraper.scraper import Scraper
+
+def _next_page(tag):
+    """
+    Reads the link to the next page of a paginated listing.
+
+    Args:
+        tag (Tag): The `pagination-next` element.
+
+    Returns:
+        str: The path of the next page, or None on the last page.
+    """
+    if 'inactive' in tag.get('class', ()):
+        return None
+    return tag.get('href')
+
+class EventMatchScraper:
+    """
+    Crawls every finished match of an event and scrapes its result.
+
+    The matches are discovered on the event's pages of the HLTV results listing, then each
+    match page goes through the `ResultScraper` extraction, at most `concurrency` at a time.
+    A match listed there is over, so once its result has been stored after it ended it is
+    read back from the entity store instead of being scraped again.
+
+    Attributes:
+        event_id (int): The unique ID of the event.
+        url (str): The URL of the first page of the event's results.
+        scraper_instance (Scraper): An instance of the Scraper class to fetch and parse the HTML.
+        document (DocumentContext): The pages fetched for the current request, each parsed once.
+        concurrency (int): The maximum number of match pages scraped at the same time.
+    """
+    SCHEMA = Schema({
+        'results': every(('div', 'class', 'result-con'), fields={
+            'match_url': first(('a', 'class', 'a-reset'), get=attr('href')),
+            'start': own(attr('data-zonedgrouping-entry-unix'))
+        }),
+        'next_page': first(('a', 'class', 'pagination-next'), get=_next_page)
+    }, name='event_matches')
+    REGIONS = SCHEMA.regions
+    MAX_PAGES = 20
+    # Matches are listed by their start time; no match lasts longer than this.
+    FINAL_AFTER = 12 * 3600
+
+    def __init__(self, event_id, event_name):
+        """
+        Initializes the EventMatchScraper with the event ID and name.
+
+        The number of match pages scraped at the same time is read from the
+        `HLTV_MATCH_CONCURRENCY` environment variable.
+
+        Args:
+            event_id (int): The unique identifier of the event.
+            event_name (str): The name of the event, as in the route; the results listing is
+                              addressed by the ID alone.
+        """
+        self.event_id = event_id
+        self.url = f"https://www.hltv.org/results?event={event_id}"
+        self.scraper_instance = Scraper()
+        self.document = DocumentContext(self.scraper_instance)
+        self.concurrency = int(os.environ.get('HLTV_MATCH_CONCURRENCY', 4))
+
+    def get_event_matches(self):
+        """
+        Scrapes the result of every finished match of the event.
+
+        Returns:
+            list: One OrderedDict per match, in listing order, holding its `id`, `name` and
+                  either the `data` of its Result or an `error`.
+        """
+        matches = self._get_matches()
+        if not matches:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(matches))) as executor:
+            return list(executor.map(self._get_match_result, matches))
+
+    def _get_matches(self):
+        """
+        Lists the finished matches of the event, following the pages of the results listing.
+
+        Returns:
+            list: One dictionary per match with its `id`, `name` and `final_after`, the time
+                  after which a stored result of the match is final, or None if unknown.
+        """
+        matches = OrderedDict()
+        url = self.url
+        for _ in range(self.MAX_PAGES):
+            page = self.SCHEMA.extract(self.document.html_parser(url, self.REGIONS))
+            for result in page['results']:
+                found = MATCH_URL.search(result['match_url'] or '')
+                if found is None:
+                    continue
+                match_id = int(found.group(1))
+                matches.setdefault(match_id, {
+                    'id': match_id,
+                    'name': found.group(2),
+                    'final_after': self._final_after(result['start'])
+                })
+            if page['next_page'] is None:
+                break
+            url = f"https://www.hltv.org{page['next_page']}"
+
+        return list(matches.values())
+
+    def _final_after(self, start):
+        """
+        Computes the time after which the result of a match is final.
+
+        Args:
+            start (str): The start of the match in milliseconds since the epoch, as listed.
+
+        Returns:
+            float: The Unix time after which a stored result is final, or None if the start is
+                   missing or not a number.
+        """
+        try:
+            return int(start) / 1000 + self.FINAL_AFTER
+        except (TypeError, ValueError):
+            return None
+
+    def _load_result(self, match):
+        """
+        Reads the stored result of a match, if it can be served instead of scraping the match.
+
+        Args:
+            match (dict): The match, as listed by `_get_matches`.
+
+        Returns:
+            Result: The stored result, or None if the match must be scraped.
+        """
+        return get_entity_store().load_result(match['id'], final_after=match['final_after'])
+
+    def _get_match_result(self, match):
+        """
+        Scrapes the result of a single match, unless it is already stored.
+
+        Args:
+            match (dict): The match, as listed by `_get_matches`.
+
+        Returns:
+            OrderedDict: The `id` and `name` of the match and either its `data` or an `error`.
+        """
+        result = OrderedDict([('id', match['id']), ('name', match['name'])])
+        data = self._load_result(match)
+        if data is None:
+            try:
+                data = ResultScraper(match['id'], match['name']).get_results()
+            except Exception as error:
+                result['error'] = f"{type(error).__name__}: {error}"
+                return result
+            get_entity_store().save_result(match['id'], match['name'], data)
+        result['data'] = data
+        return result
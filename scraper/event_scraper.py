@@ -1,5 +1,8 @@
 import re
 from collections import OrderedDict
+from scraper.document import DocumentContext
+from scraper.extraction import Schema, attr, every, first
+from scraper.models import Event, Location, Placement
 from scraper.scraper import Scraper
 
 class EventScraper:
@@ -11,7 +14,33 @@ class EventScraper:
         event_name (str): The name of the event.
         url (str): The URL to the event.
         scraper_instance (Scraper): An instance of the Scraper class to fetch and parse the HTML.
+        document (DocumentContext): The pages fetched for the current request, each parsed once.
     """
+    SCHEMA = Schema({
+        'title': first(('h1', 'class', 'event-hub-title'), default='Unknown'),
+        'date': first(('td', 'class', 'eventdate'), then=every(('span', None, None)), default=[]),
+        'prize_pool': first(('td', 'class', 'prizepool text-ellipsis'), default='Unknown'),
+        'teams': first(('td', 'class', 'teamsNumber'), default='Unknown'),
+        'location': first(('div', 'class', 'flag-align'), fields={
+            'flag': first(('img', 'class', 'flag'), get=attr('src')),
+            'text': first(('span', 'class', 'text-ellipsis'), default='')
+        }),
+        'placements': first(('div', 'class', 'placements-holder'), then=every(('div', 'class', 'placement'), fields={
+            'position': first(('div', None, None), nth=1, default='Unknown'),
+            'team_name': first(('div', 'class', 'team'), then=first(('a', None, None))),
+            'team_logo': first(('div', 'class', 'team-logo'), then=first(('img', None, None), get=attr('src')), default='Unknown'),
+            'prizes': every(('div', 'class', 'prize'))
+        }), default=[])
+    }, name='event')
+    REGIONS = SCHEMA.regions
+    FIELDS = OrderedDict([
+        ('title', ('title',)),
+        ('date', ('date',)),
+        ('prize_pool', ('prize_pool',)),
+        ('teams', ('teams',)),
+        ('location', ('location',)),
+        ('prize_distribution', ('placements',))
+    ])
 
     def __init__(self, event_id, event_name):
         """
@@ -25,97 +54,65 @@ class EventScraper:
         self.event_name = event_name
         self.url = f"https://www.hltv.org/events/{event_id}/{event_name}"
         self.scraper_instance = Scraper()
+        self.document = DocumentContext(self.scraper_instance)
 
-    def get_event_details(self):
+    def get_event_details(self, fields=None):
         """
         Retrieves event details such as title, date, prize pool, teams, location, and prize distribution.
 
-        Returns:
-            OrderedDict: A dictionary containing the event details.
-        """
-        soup = self.scraper_instance.html_parser(self.url)
-        event_details = OrderedDict([
-            ('title', self._get_title(soup)),
-            ('date', self._get_date(soup)),
-            ('prize_pool', self._get_prize_pool(soup)),
-            ('teams', self._get_teams(soup)),
-            ('location', self._get_location(soup)),
-            ('prize_distribution', self._get_prize_distribution(soup))
-        ])
-        return event_details
-
-    def _get_title(self, soup):
-        """
-        Extracts the title of the event.
-
         Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
+            fields (tuple, optional): The response fields to return, among `FIELDS`. Only the
+                                      regions of the page they come from are parsed and only
+                                      their extractors run. Defaults to all of them.
 
         Returns:
-            str: The event title, or 'Unknown' if not found.
-        """
-        title = soup.find('h1', class_='event-hub-title')
-        return title.text.strip() if title else 'Unknown'
+            Event: The event details, or an OrderedDict of the requested fields when `fields` is given.
+        """
+        schema = self.SCHEMA.select(fields, self.FIELDS)
+        soup = self.document.html_parser(self.url, schema.regions)
+        page = schema.extract(soup)
+        builders = OrderedDict([
+            ('title', lambda: page['title']),
+            ('date', lambda: self._get_date(page)),
+            ('prize_pool', lambda: page['prize_pool']),
+            ('teams', lambda: page['teams']),
+            ('location', lambda: self._get_location(page)),
+            ('prize_distribution', lambda: self._get_prize_distribution(page))
+        ])
+        if fields is not None:
+            return OrderedDict((field, build()) for field, build in builders.items() if field in fields)
+
+        event_details = Event(**{field: build() for field, build in builders.items()})
+        return event_details
 
-    def _get_date(self, soup):
+    def _get_date(self, page):
         """
-        Extracts the start and end dates of the event.
+        Builds the start and end dates of the event.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
+            page (dict): The fields extracted from the event page.
 
         Returns:
             str: The event dates, or 'Unknown' if not found.
         """
-        date_element = soup.find('td', class_='eventdate')
-        if date_element:
-            spans = date_element.find_all('span')
-            if len(spans) >= 2:
-                start_date = spans[0].text.strip()
-                end_date = spans[1].text.strip()
-                return f"{start_date} {end_date}"
+        spans = page['date']
+        if len(spans) >= 2:
+            return f"{spans[0]} {spans[1]}"
         return 'Unknown'
 
-    def _get_prize_pool(self, soup):
+    def _get_location(self, page):
         """
-        Extracts the prize pool for the event.
+        Builds the location and type (LAN or Online) of the event.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
+            page (dict): The fields extracted from the event page.
 
         Returns:
-            str: The prize pool, or 'Unknown' if not found.
+            Location: The flag URL, location, and event type.
         """
-        prize_pool = soup.find('td', class_='prizepool text-ellipsis')
-        return prize_pool.text.strip() if prize_pool else 'Unknown'
-
-    def _get_teams(self, soup):
-        """
-        Extracts the number of teams participating in the event.
-
-        Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
-
-        Returns:
-            str: The number of teams, or 'Unknown' if not found.
-        """
-        teams = soup.find_all('td', class_='teamsNumber')
-        return teams[0].text.strip() if teams else 'Unknown'
-
-    def _get_location(self, soup):
-        """
-        Extracts the location and type (LAN or Online) of the event.
-
-        Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
-
-        Returns:
-            dict: A dictionary containing the flag URL, location, and event type.
-        """
-        location_element = soup.find('div', class_='flag-align')
+        location_element = page['location']
         if location_element:
-            flag_img = location_element.find('img', class_='flag')
-            location_text = location_element.find('span', class_='text-ellipsis').text.strip()
+            location_text = location_element['text']
             location_match = re.search(r'^(.*) \((LAN|Online)\)$', location_text)
             if location_match:
                 location = location_match.group(1)
@@ -123,50 +120,39 @@ class EventScraper:
             else:
                 location = location_text
                 event_type = 'Unknown'
-            return {
-                'flag': f"https://www.hltv.org{flag_img['src']}" if flag_img else 'Unknown',
-                'location': location,
-                'type': event_type
-            }
-        return {
-            'flag': 'Unknown',
-            'location': 'Unknown',
-            'type': 'Unknown'
-        }
-
-    def _get_prize_distribution(self, soup):
+            return Location(
+                flag=f"https://www.hltv.org{location_element['flag']}" if location_element['flag'] else 'Unknown',
+                location=location,
+                type=event_type
+            )
+        return Location(
+            flag='Unknown',
+            location='Unknown',
+            type='Unknown'
+        )
+
+    def _get_prize_distribution(self, page):
         """
-        Extracts the prize distribution for the event.
+        Builds the prize distribution for the event.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the event page.
+            page (dict): The fields extracted from the event page.
 
         Returns:
-            dict: A dictionary containing prize distribution details by placement.
+            dict: The Placement objects of each position.
         """
         prize_distribution = {}
-        placements_holder = soup.find('div', class_='placements-holder')
-        if placements_holder:
-            placements = placements_holder.find_all('div', class_='placement')
-            for placement in placements:
-                position = placement.find_all('div')[1].text.strip() if len(placement.find_all('div')) > 1 else 'Unknown'
-                team_element = placement.find('div', class_='team')
-                if team_element and team_element.find('a'):
-                    team_name = team_element.find('a').text.strip()
-                    team_logo = placement.find('div', class_='team-logo').find('img')['src'] if placement.find('div', class_='team-logo') else 'Unknown'
-                    prizes = [prize.text.strip() for prize in placement.find_all('div', class_='prize') if prize.text.strip()]
-                    if position not in prize_distribution:
-                        prize_distribution[position] = []
-                    prize_distribution[position].append({
-                        'team_name': team_name,
-                        'team_logo': team_logo,
-                        'prizes': prizes
-                    })
-                else:
-                    prizes = [prize.text.strip() for prize in placement.find_all('div', class_='prize') if prize.text.strip()]
-                    if position not in prize_distribution:
-                        prize_distribution[position] = []
-                    prize_distribution[position].append({
-                        'prizes': prizes
-                    })
+        for placement in page['placements']:
+            prizes = [prize for prize in placement['prizes'] if prize]
+            if placement['team_name'] is not None:
+                team_name = placement['team_name']
+                team_logo = placement['team_logo']
+            else:
+                team_name = None
+                team_logo = None
+            prize_distribution.setdefault(placement['position'], []).append(Placement(
+                team_name=team_name,
+                team_logo=team_logo,
+                prizes=prizes
+            ))
         return prize_distribution
@@ -0,0 +1,287 @@
+import time
+from bs4 import Tag
+from scraper.metrics import get_metrics
+from scraper.parsers import compile_selector
+
+def text(tag):
+    """
+    Reads the stripped text of an element.
+
+    Args:
+        tag (Tag): The element.
+
+    Returns:
+        str: The text of the element and its descendants, stripped.
+    """
+    return tag.get_text().strip()
+
+def attr(name):
+    """
+    Builds a getter reading an attribute of an element.
+
+    Args:
+        name (str): The attribute name.
+
+    Returns:
+        callable: Takes an element and returns the attribute, or None if it is missing.
+    """
+    def get(tag):
+        return tag.get(name)
+
+    return get
+
+class Rule:
+    """
+    A field of a schema: which element holds it and how its value is read.
+
+    Attributes:
+        selector (tuple): The `(tag, attribute, value)` selector of the element, see `compile_selector`.
+                          None for a rule reading the element its record was opened on.
+        many (bool): Whether every matching element is collected instead of the first one.
+        nth (int): The number of matching elements to skip before the one read.
+        get (callable): Reads the value from the element.
+        fields (Schema): The schema of the record built from the descendants of the element.
+        then (Rule): The rule reading the field from the descendants of the element instead.
+        default (object): The value of the field when no element matches.
+        region (tuple): The region of the page parsed for the rule, see `parse_html`.
+    """
+    __slots__ = ('selector', 'many', 'nth', 'get', 'fields', 'then', 'default', 'region', 'matches')
+
+    def __init__(self, selector, many=False, nth=0, get=text, fields=None, then=None, default=None, region=None):
+        """
+        Initializes the rule; use `first`, `every` and `own` rather than calling it directly.
+
+        Args:
+            selector (tuple): The `(tag, attribute, value)` selector of the element.
+            many (bool): Whether every matching element is collected.
+            nth (int): The number of matching elements to skip.
+            get (callable): Reads the value from the element.
+            fields (dict, optional): The rules of the record built from the element's descendants.
+            then (Rule, optional): The rule reading the field from the element's descendants.
+            default (object): The value of the field when no element matches.
+            region (tuple, optional): The region of the page parsed for the rule, when narrower
+                                      than its selector. Defaults to the selector.
+        """
+        self.selector = selector
+        self.many = many
+        self.nth = nth
+        self.get = get
+        self.fields = Schema(fields) if fields is not None else None
+        self.then = then
+        self.default = default
+        self.region = region if region is not None else selector
+        self.matches = compile_selector(selector) if selector is not None else None
+
+def first(selector, get=text, fields=None, then=None, nth=0, default=None):
+    """
+    Declares a field read from the first element matching a selector, like `find`.
+
+    Args:
+        selector (tuple): The `(tag, attribute, value)` selector of the element.
+        get (callable): Reads the value from the element. Defaults to its stripped text.
+        fields (dict, optional): Builds a record from the element's descendants instead.
+        then (Rule, optional): Reads the field from the element's descendants instead.
+        nth (int): Reads the nth matching element instead of the first one.
+        default (object): The value of the field when no element matches.
+
+    Returns:
+        Rule: The rule of the field.
+    """
+    return Rule(selector, nth=nth, get=get, fields=fields, then=then, default=default)
+
+def every(selector, get=text, fields=None, region=None):
+    """
+    Declares a list field collected from every element matching a selector, like `find_all`.
+
+    Args:
+        selector (tuple): The `(tag, attribute, value)` selector of the elements.
+        get (callable): Reads the value of each element. Defaults to its stripped text.
+        fields (dict, optional): Builds a record from the descendants of each element instead.
+        region (tuple, optional): Parses only the elements matching this narrower selector;
+                                  elements of the other regions still match `selector`.
+
+    Returns:
+        Rule: The rule of the field.
+    """
+    return Rule(selector, many=True, get=get, fields=fields, default=[], region=region)
+
+def own(get=text):
+    """
+    Declares a field of a record read from the element the record is built from.
+
+    Args:
+        get (callable): Reads the value from the element. Defaults to its stripped text.
+
+    Returns:
+        Rule: The rule of the field.
+    """
+    return Rule(None, get=get)
+
+class Schema:
+    """
+    The fields of a page, compiled into an engine filling all of them in one walk of the document.
+
+    Every field is a rule: its value comes from the first or every element matching a selector,
+    optionally narrowed down by a rule applied to that element's descendants (`then`) or turned
+    into a nested record of its own (`fields`). Missing elements leave the rule's default in place.
+
+    The document is walked once, depth first, and each element is only tested against the
+    rules indexed under its tag name. Nested rules are only tested inside the element that
+    opened them, and a subtree is skipped once every rule that could still match has been filled.
+
+    A named schema times the whole extraction under its name, and each top-level rule under
+    `<name>.<field>`: the time spent reading the elements it matched, their subtrees included.
+
+    Attributes:
+        fields (dict): The rules, keyed by field name.
+        name (str): The name the extraction is timed under in `hltv_extractor_duration_seconds`.
+        regions (tuple): The regions of the top-level rules, the regions of the page to parse.
+    """
+
+    def __init__(self, fields, name=None):
+        """
+        Compiles the rules of the schema.
+
+        Args:
+            fields (dict): The rules, keyed by field name.
+            name (str, optional): The name the extraction is timed under. Nested schemas are not timed.
+        """
+        self.fields = fields
+        self.name = name
+        self.regions = tuple(dict.fromkeys(
+            rule.region for rule in fields.values() if rule.selector is not None
+        ))
+        self._own = [(key, rule) for key, rule in fields.items() if rule.selector is None]
+        self._timed = [key for key, rule in fields.items() if rule.selector is not None]
+        self._by_tag = {}
+        for key, rule in fields.items():
+            if rule.selector is None:
+                continue
+            inner = rule.fields
+            if rule.then is not None:
+                inner = Schema({key: rule.then})
+            self._by_tag.setdefault(rule.selector[0], []).append((key, rule, inner))
+        self._collects = any(rule.many for rule in fields.values())
+        self._singles = sum(1 for rule in fields.values() if not rule.many and rule.selector is not None)
+        self._selections = {}
+
+    def select(self, fields, groups):
+        """
+        Returns the schema restricted to the rules behind some response fields.
+
+        Its regions only cover those rules, so the page is parsed no further than they need.
+        Restricted schemas are compiled once per set of rules.
+
+        Args:
+            fields (iterable): The response fields to extract, or None for all of them.
+            groups (dict): The rules each response field is built from, keyed by response field.
+
+        Returns:
+            Schema: The restricted schema, timed under the same name.
+        """
+        if fields is None:
+            return self
+        keys = frozenset(key for field in fields for key in groups[field])
+        selected = self._selections.get(keys)
+        if selected is None:
+            selected = self._selections[keys] = Schema(
+                {key: rule for key, rule in self.fields.items() if key in keys}, name=self.name
+            )
+        return selected
+
+    def extract(self, root):
+        """
+        Fills every field of the schema from a parsed page.
+
+        Args:
+            root (Tag): The parsed page, or the element to extract from.
+
+        Returns:
+            dict: The value of each field, nested records being dicts too.
+        """
+        metrics = get_metrics()
+        timed = self.name is not None and metrics.enabled
+        start = time.perf_counter()
+        record = {}
+        scope = _Scope(self, record, root)
+        if timed:
+            scope.timings = dict.fromkeys(self._timed, 0.0)
+        _walk(root, [scope])
+        if timed:
+            metrics.observe_extraction(self.name, time.perf_counter() - start)
+            for key, seconds in scope.timings.items():
+                metrics.observe_extraction(f"{self.name}.{key}", seconds)
+        return record
+
+class _Scope:
+    __slots__ = ('schema', 'record', 'seen', 'pending', 'timings')
+
+    def __init__(self, schema, record, element):
+        self.schema = schema
+        self.record = record
+        self.seen = {}
+        self.pending = schema._singles
+        self.timings = None
+        for key, rule in schema.fields.items():
+            record[key] = list(rule.default) if rule.many else rule.default
+        for key, rule in schema._own:
+            record[key] = rule.get(element)
+
+    def open(self, key, rule, inner, element):
+        if rule.many:
+            if inner is None:
+                self.record[key].append(rule.get(element))
+                return None
+            record = {}
+            self.record[key].append(record)
+            return _Scope(inner, record, element)
+
+        count = self.seen.get(key, 0)
+        self.seen[key] = count + 1
+        if count < rule.nth:
+            return None
+        self.pending -= 1
+        if inner is None:
+            self.record[key] = rule.get(element)
+            return None
+        if rule.then is not None:
+            return _Scope(inner, self.record, element)
+        record = self.record[key] = {}
+        return _Scope(inner, record, element)
+
+    def filled(self, key, rule):
+        return not rule.many and self.seen.get(key, 0) > rule.nth
+
+    def active(self):
+        return self.pending > 0 or self.schema._collects
+
+def _walk(node, scopes):
+    scopes = [scope for scope in scopes if scope.active()]
+    if not scopes:
+        return
+    for child in node.contents:
+        if not isinstance(child, Tag):
+            continue
+        opened = None
+        timed = None
+        for scope in scopes:
+            candidates = scope.schema._by_tag.get(child.name)
+            if candidates is None:
+                continue
+            for key, rule, inner in candidates:
+                if scope.filled(key, rule) or not rule.matches(child.attrs):
+                    continue
+                if scope.timings is not None:
+                    if timed is None:
+                        timed = (scope.timings, [], time.perf_counter())
+                    timed[1].append(key)
+                inner_scope = scope.open(key, rule, inner, child)
+                if inner_scope is not None:
+                    opened = [inner_scope] if opened is None else opened + [inner_scope]
+        if child.contents:
+            _walk(child, scopes + opened if opened else scopes)
+        if timed is not None:
+            timings, keys, start = timed
+            elapsed = time.perf_counter() - start
+            for key in keys:
+                timings[key] += elapsed
@@ -0,0 +1,182 @@
+import os
+import queue
+import threading
+from collections import OrderedDict
+from scraper.models import json_default
+from scraper.result_scraper import ResultScraper
+
+class LivePoller:
+    """
+    Polls the page of a live match and pushes map score changes to its subscribers.
+
+    A single poller runs per match no matter how many clients follow it. Each poll refetches
+    the match page once, runs `ResultScraper.get_maps` and only publishes the maps whose
+    score changed since the previous poll. The poller stops once its last subscriber leaves.
+
+    Attributes:
+        scraper (ResultScraper): The scraper of the followed match.
+        interval (float): The number of seconds between two polls.
+    """
+
+    def __init__(self, match_id, match_name, interval=5):
+        """
+        Initializes the poller; polling starts with the first subscriber.
+
+        Args:
+            match_id (int): The unique ID of the match.
+            match_name (str): The name of the match.
+            interval (float): The number of seconds between two polls.
+        """
+        self.scraper = ResultScraper(match_id, match_name)
+        self.interval = interval
+        self._maps = None
+        self._subscribers = []
+        self._stopped = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """
+        Registers a new subscriber.
+
+        Returns:
+            Queue: The queue receiving `(event, data)` tuples, starting with a `snapshot` of the
+                   current maps once they are known.
+        """
+        subscriber = queue.Queue()
+        with self._lock:
+            self._subscribers.append(subscriber)
+            if self._maps is not None:
+                subscriber.put(('snapshot', self._maps))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='hltv-live-poller', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """
+        Removes a subscriber, stopping the poller if it was the last one.
+
+        Args:
+            subscriber (Queue): The queue returned by `subscribe`.
+        """
+        with self._lock:
+            self._subscribers.remove(subscriber)
+            if not self._subscribers:
+                self._stopped.set()
+
+    def subscriber_count(self):
+        """
+        Returns the number of subscribers of the poller.
+
+        Returns:
+            int: The number of subscribers.
+        """
+        with self._lock:
+            return len(self._subscribers)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._poll()
+            self._stopped.wait(self.interval)
+
+    def _poll(self):
+        try:
+            soup = self.scraper.scraper_instance.refresh(self.scraper.url, self.scraper.REGIONS)
+            maps = self.scraper.get_maps(soup)
+        except Exception as error:
+            self._publish('error', {'error': str(error)})
+            return
+
+        if self._maps is None:
+            self._maps = maps
+            self._publish('snapshot', maps)
+            return
+
+        changes = [
+            OrderedDict([('index', index)] + list(json_default(map_result).items()))
+            for index, map_result in enumerate(maps)
+            if index >= len(self._maps) or self._maps[index] != map_result
+        ]
+        self._maps = maps
+        if changes:
+            self._publish('update', changes)
+
+    def _publish(self, event, data):
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put((event, data))
+
+class LivePollerRegistry:
+    """
+    Hands out the shared poller of each followed match.
+    """
+
+    def __init__(self, interval=5):
+        """
+        Initializes an empty registry.
+
+        Args:
+            interval (float): The number of seconds between two polls of a match.
+        """
+        self.interval = interval
+        self._pollers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, match_id, match_name):
+        """
+        Subscribes to a match, starting its poller if nobody follows it yet.
+
+        Args:
+            match_id (int): The unique ID of the match.
+            match_name (str): The name of the match.
+
+        Returns:
+            tuple: The poller and the subscriber queue.
+        """
+        with self._lock:
+            poller = self._pollers.get((match_id, match_name))
+            if poller is None:
+                poller = LivePoller(match_id, match_name, self.interval)
+                self._pollers[(match_id, match_name)] = poller
+            return poller, poller.subscribe()
+
+    def unsubscribe(self, poller, subscriber):
+        """
+        Unsubscribes from a match, dropping its poller once nobody follows it anymore.
+
+        Args:
+            poller (LivePoller): The poller returned by `subscribe`.
+            subscriber (Queue): The queue returned by `subscribe`.
+        """
+        with self._lock:
+            poller.unsubscribe(subscriber)
+            if not poller.subscriber_count():
+                del self._pollers[(poller.scraper.match_id, poller.scraper.match_name)]
+
+    def stats(self):
+        """
+        Returns the number of followed matches and subscribers.
+
+        Returns:
+            OrderedDict: The number of active pollers and of subscribers over all of them.
+        """
+        with self._lock:
+            pollers = list(self._pollers.values())
+        return OrderedDict([
+            ('pollers', len(pollers)),
+            ('subscribers', sum(poller.subscriber_count() for poller in pollers))
+        ])
+
+_registry = LivePollerRegistry(interval=float(os.environ.get('HLTV_LIVE_INTERVAL', 5)))
+
+def get_live_pollers():
+    """
+    Returns the process-wide registry of live match pollers.
+
+    The polling interval is configured through the `HLTV_LIVE_INTERVAL` environment variable.
+
+    Returns:
+        LivePollerRegistry: The shared registry.
+    """
+    return _registry
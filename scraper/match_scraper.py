@@ -1,22 +1,40 @@
-from collections import OrderedDict
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from scraper.document import DocumentContext
+from scraper.extraction import Schema, attr, every, first
+from scraper.models import Match
 from scraper.scraper import Scraper
 from utils.match_utils import get_match_details
 
 class MatchScraper:
     """
     Scraper class to fetch and parse match details for a specific team from HLTV.
-    
+
     Attributes:
         team_id (int): The ID of the team.
         team_name (str): The name of the team.
         url (str): The base URL for the team's matches page on HLTV.
         scraper_instance (Scraper): Instance of the scraper utility.
+        document (DocumentContext): The pages fetched for the current request, each parsed once.
+        concurrency (int): The maximum number of match pages fetched at the same time.
+        timeout (float): The number of seconds to wait for the details of all the matches.
     """
+    SCHEMA = Schema({
+        'matches': first(('div', 'id', 'matchesBox'), then=every(('tr', 'class', 'team-row'), fields={
+            'match_url': first(('a', 'class', 'matchpage-button'), get=attr('href')),
+            'team1_url': first(('a', 'class', 'team-name team-1'), get=attr('href')),
+            'team2_url': first(('a', 'class', 'team-name team-2'), get=attr('href'))
+        }), default=[])
+    }, name='matches')
+    REGIONS = SCHEMA.regions
 
     def __init__(self, team_id, team_name):
         """
         Initializes the MatchScraper with team ID and name.
 
+        The detail fetching limits are read from the `HLTV_MATCH_CONCURRENCY` and
+        `HLTV_MATCH_TIMEOUT` environment variables.
+
         Args:
             team_id (int): The ID of the team.
             team_name (str): The name of the team.
@@ -25,68 +43,91 @@ class MatchScraper:
         self.team_name = team_name
         self.url = f"https://www.hltv.org/team/{team_id}/{team_name}"
         self.scraper_instance = Scraper()
+        self.document = DocumentContext(self.scraper_instance)
+        self.concurrency = int(os.environ.get('HLTV_MATCH_CONCURRENCY', 4))
+        self.timeout = float(os.environ.get('HLTV_MATCH_TIMEOUT', 10))
 
-    def get_upcoming_matches(self):
+    def get_upcoming_matches(self, limit=None):
         """
         Fetches the upcoming matches for the team.
 
         Makes a request to the team's upcoming matches page and collects details
         about the matches listed, including URLs and information about participating teams.
+        The match pages are fetched in parallel under a single deadline; a match whose details
+        are not available within `timeout` seconds of the first request is returned with `None`
+        details.
+
+        Args:
+            limit (int, optional): The maximum number of matches to return. Defaults to all of them.
 
         Returns:
-            list: A list of dictionaries, where each dictionary contains the details of a match.
+            list: A list of Match objects with the URL and details of each match.
         """
         match_url = f"{self.url}#tab-matchesBox"
-        soup = self.scraper_instance.html_parser(match_url)
-
-        team_url = self._get_match_url(soup)
-        
-        if team_url['match_url'] == 'Unknown':
+        soup = self.document.html_parser(match_url, self.REGIONS)
+        match_urls = self._get_match_urls(soup, limit)
+        if not match_urls:
             return []
 
-        matches = OrderedDict([
-            ('match_url', f"https://www.hltv.org{team_url['match_url']}"),
-            ('details', self.get_details(
-                f"https://www.hltv.org{team_url['match_url']}", f"{team_url['team1_url']}", f"{team_url['team2_url']}",
-            ))
-        ])
+        executor = ThreadPoolExecutor(max_workers=min(self.concurrency, len(match_urls)))
+        futures = [
+            executor.submit(self.get_details, match['match_url'], match['team1_url'], match['team2_url'])
+            for match in match_urls
+        ]
+        done, _ = wait(futures, timeout=self.timeout)
+        matches = []
+        for match, future in zip(match_urls, futures):
+            try:
+                if future not in done:
+                    raise TimeoutError()
+                details = future.result()
+            except Exception as error:
+                print(f"[ERRO] {type(error).__name__} ao buscar {match['match_url']}")
+                details = None
+            matches.append(self._build_match(match, details))
+        executor.shutdown(wait=False, cancel_futures=True)
 
         return matches
 
-
-    def _get_match_url(self, soup):
+    def _get_match_urls(self, soup, limit=None):
         """
-        Extracts the URLs of the participating teams from the match container.
+        Extracts the match and team URLs of every upcoming match from the match container.
 
         Args:
             soup (BeautifulSoup): Parsed HTML of the team's matches page.
+            limit (int, optional): The maximum number of matches to extract.
 
         Returns:
-            dict: A dictionary containing the match URL and team URLs.
+            list: A list of dictionaries containing the absolute match URL and the team URLs.
+        """
+        match_urls = []
+        for match in self.SCHEMA.extract(soup)['matches']:
+            if limit is not None and len(match_urls) >= limit:
+                break
+            if match['match_url'] is not None and match['team1_url'] is not None and match['team2_url'] is not None:
+                match_urls.append({
+                    "match_url": f"https://www.hltv.org{match['match_url']}",
+                    "team1_url": f"{match['team1_url']}",
+                    "team2_url": f"{match['team2_url']}"
+                })
+
+        return match_urls
+
+    def _build_match(self, match, details):
         """
-        matches_container = soup.find('div', id='matchesBox')
-        if matches_container:
-            match_elements = matches_container.find_all('tr', class_='team-row')
-
-            for match in match_elements:
-                match_button = match.find('a', class_='matchpage-button')
-                if match_button:
-                    match_url = match_button['href']
-                    team1 = match.find('a', class_='team-name team-1')
-                    team2 = match.find('a', class_='team-name team-2')
-
-                    if team1 and team2:
-                        return {
-                            "match_url": f"{match_url}",
-                            "team1_url": f"{team1['href']}",
-                            "team2_url": f"{team2['href']}"
-                        }               
-
-        return {
-            'match_url': 'Unknown',
-            'team1_url': 'Unknown',
-            'team2_url': 'Unknown'
-        }
-        
+        Builds the entry of a single match in the response.
+
+        Args:
+            match (dict): The URLs of the match, as returned by `_get_match_urls`.
+            details (MatchDetails): The match details, or None if they could not be fetched.
+
+        Returns:
+            Match: The match URL and its details.
+        """
+        return Match(
+            match_url=match['match_url'],
+            details=details
+        )
+
     def get_details(self, match_url, team1, team2):
-        return get_match_details(self.scraper_instance, match_url, team1, team2)
\ No newline at end of file
+        return get_match_details(self.document, match_url, team1, team2)
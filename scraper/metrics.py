@@ -0,0 +1,291 @@
+import bisect
+import os
+import threading
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+class Histogram:
+    """
+    A Prometheus histogram with one series per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The description of the metric.
+        labels (tuple): The label names.
+        buckets (tuple): The upper bounds of the buckets, in seconds.
+    """
+
+    def __init__(self, name, help, labels, buckets=DEFAULT_BUCKETS):
+        """
+        Initializes an empty histogram.
+
+        Args:
+            name (str): The metric name.
+            help (str): The description of the metric.
+            labels (tuple): The label names.
+            buckets (tuple): The upper bounds of the buckets, in seconds.
+        """
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, values, amount):
+        """
+        Records an observation.
+
+        Args:
+            values (tuple): The label values, in the order of `labels`.
+            amount (float): The observed value.
+        """
+        index = bisect.bisect_left(self.buckets, amount)
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._series[values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += amount
+
+    def render(self):
+        """
+        Renders the histogram in the Prometheus text format.
+
+        Returns:
+            list: The lines of the metric.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((values, list(counts), total) for values, (counts, total) in self._series.items())
+        for values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), values + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {cumulative}")
+        return lines
+
+class Counter:
+    """
+    A Prometheus counter with one series per combination of label values.
+
+    Attributes:
+        name (str): The metric name.
+        help (str): The description of the metric.
+        labels (tuple): The label names.
+    """
+
+    def __init__(self, name, help, labels):
+        """
+        Initializes a counter with no series.
+
+        Args:
+            name (str): The metric name.
+            help (str): The description of the metric.
+            labels (tuple): The label names.
+        """
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, values, amount=1):
+        """
+        Increments a series.
+
+        Args:
+            values (tuple): The label values, in the order of `labels`.
+            amount (float): The increment.
+        """
+        with self._lock:
+            self._series[values] = self._series.get(values, 0) + amount
+
+    def render(self):
+        """
+        Renders the counter in the Prometheus text format.
+
+        Returns:
+            list: The lines of the metric.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for values, total in series:
+            lines.append(f"{self.name}{_labels(self.labels, values)} {total}")
+        return lines
+
+class Metrics:
+    """
+    Collects the latency and traffic metrics of the scraping stack.
+
+    Timings are kept per stage of a request: the upstream `get` and the HTML parse per HLTV
+    route, the single-pass extraction of each page schema, and the JSON serialization and
+    whole request per API endpoint. When disabled, nothing is recorded.
+
+    Attributes:
+        enabled (bool): Whether metrics are recorded.
+        stages (Histogram): Fetch, parse and serialize durations per route.
+        extractors (Histogram): Schema extraction durations.
+        requests (Histogram): API request durations per endpoint.
+        responses (Counter): API responses per endpoint and status code.
+        upstream_responses (Counter): Upstream responses per route and status code.
+        upstream_bytes (Counter): Bytes received from HLTV per route.
+        upstream_bytes_saved (Counter): Bytes HLTV did not send thanks to compression and revalidation.
+    """
+
+    def __init__(self, enabled=True):
+        """
+        Initializes empty metrics.
+
+        Args:
+            enabled (bool): Whether metrics are recorded.
+        """
+        self.enabled = enabled
+        self.stages = Histogram(
+            'hltv_stage_duration_seconds',
+            'Time spent in each stage, by HLTV route (fetch, parse) or API endpoint (serialize).',
+            ('stage', 'route')
+        )
+        self.extractors = Histogram(
+            'hltv_extractor_duration_seconds', 'Time spent extracting the fields of each page schema.', ('extractor',)
+        )
+        self.requests = Histogram(
+            'hltv_request_duration_seconds', 'Time spent answering API requests.', ('endpoint',)
+        )
+        self.responses = Counter(
+            'hltv_responses_total', 'API responses by endpoint and status code.', ('endpoint', 'status')
+        )
+        self.upstream_responses = Counter(
+            'hltv_upstream_responses_total', 'HLTV responses by route and status code.', ('route', 'status')
+        )
+        self.upstream_bytes = Counter(
+            'hltv_upstream_bytes_total', 'Bytes received from HLTV by route, as sent on the wire.', ('route',)
+        )
+        self.upstream_bytes_saved = Counter(
+            'hltv_upstream_bytes_saved_total',
+            'Bytes HLTV did not have to send, by route and reason (compression, not_modified).',
+            ('route', 'reason')
+        )
+
+    def observe_stage(self, stage, route, seconds):
+        """
+        Records the duration of a stage.
+
+        Args:
+            stage (str): The stage, e.g. `fetch`, `parse` or `serialize`.
+            route (str): The HLTV route or the API endpoint the stage worked for.
+            seconds (float): The duration of the stage.
+        """
+        if self.enabled:
+            self.stages.observe((stage, route), seconds)
+
+    def observe_extraction(self, schema, seconds):
+        """
+        Records the duration of a schema extraction.
+
+        Args:
+            schema (str): The name of the page schema.
+            seconds (float): The duration of the extraction.
+        """
+        if self.enabled:
+            self.extractors.observe((schema,), seconds)
+
+    def observe_request(self, endpoint, status, seconds):
+        """
+        Records an answered API request.
+
+        Args:
+            endpoint (str): The Flask endpoint that answered.
+            status (int): The status code of the response.
+            seconds (float): The time taken to build the response.
+        """
+        if self.enabled:
+            self.requests.observe((endpoint,), seconds)
+            self.responses.inc((endpoint, str(status)))
+
+    def count_upstream(self, route, status, size):
+        """
+        Records a response received from HLTV.
+
+        Args:
+            route (str): The HLTV route of the page.
+            status (str): The status code, or the kind of failure when no response came back.
+            size (int): The size of the response body on the wire.
+        """
+        if self.enabled:
+            self.upstream_responses.inc((route, str(status)))
+            if size:
+                self.upstream_bytes.inc((route,), size)
+
+    def count_saved(self, route, reason, size):
+        """
+        Records bytes HLTV did not have to send.
+
+        Args:
+            route (str): The HLTV route of the page.
+            reason (str): `compression` for a compressed body, `not_modified` for a page
+                          revalidated with a `304` instead of being sent again.
+            size (int): The number of bytes saved.
+        """
+        if self.enabled and size > 0:
+            self.upstream_bytes_saved.inc((route, reason), size)
+
+    def render(self, stats=None):
+        """
+        Renders every metric in the Prometheus text format.
+
+        Args:
+            stats (OrderedDict, optional): The `stats()` snapshots of the components, keyed by
+                                           component name, exported as gauges.
+
+        Returns:
+            str: The metrics page.
+        """
+        lines = []
+        for component, snapshot in (stats or {}).items():
+            lines.extend(_gauges(f"hltv_{component}", snapshot))
+        if self.enabled:
+            for metric in (self.stages, self.extractors, self.requests, self.responses,
+                           self.upstream_responses, self.upstream_bytes, self.upstream_bytes_saved):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+def _gauges(prefix, snapshot):
+    lines = []
+    for key, value in snapshot.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            label = key.partition('_by_')[2] or 'key'
+            lines.append(f"# TYPE {name} gauge")
+            for item, item_value in value.items():
+                lines.append(f"{name}{_labels((label,), (item,))} {item_value}")
+        elif isinstance(value, str):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{_labels(('value',), (value,))} 1")
+        elif value is not None:
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {int(value) if isinstance(value, bool) else value}")
+    return lines
+
+def _labels(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+_metrics = Metrics(enabled=os.environ.get('HLTV_METRICS', '1').lower() not in ('0', 'false', 'no'))
+
+def get_metrics():
+    """
+    Returns the process-wide metrics.
+
+    They are recorded unless the `HLTV_METRICS` environment variable is set to `0`.
+
+    Returns:
+        Metrics: The shared metrics.
+    """
+    return _metrics
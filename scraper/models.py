@@ -0,0 +1,188 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import ClassVar, Dict, List, Optional
+
+@dataclass(slots=True)
+class Player:
+    """
+    A player of a team roster.
+    """
+    nickname: str
+    flag: str
+    image: str
+    title: str
+
+@dataclass(slots=True)
+class Coach:
+    """
+    The coach of a team.
+    """
+    nickname: str
+    flag: str
+
+@dataclass(slots=True)
+class Ranking:
+    """
+    The Valve and HLTV rankings of a team.
+    """
+    valve_ranking: Optional[str]
+    hltv_ranking: Optional[str]
+
+@dataclass(slots=True)
+class Trophy:
+    """
+    A trophy won by a team.
+    """
+    title: str
+    image: str
+    url: str
+
+@dataclass(slots=True)
+class Team:
+    """
+    The profile of a team, as returned by `TeamScraper.get_team_info`.
+    """
+    name: str
+    image: str
+    players: List[Player] = field(default_factory=list)
+    ranking: Optional[Ranking] = None
+    coach: Optional[Coach] = None
+    trophies: List[Trophy] = field(default_factory=list)
+
+@dataclass(slots=True)
+class Location:
+    """
+    Where an event takes place and whether it is LAN or online.
+    """
+    flag: str
+    location: str
+    type: str
+
+@dataclass(slots=True)
+class Placement:
+    """
+    A placement of an event's prize distribution. Placements not yet attributed to a team
+    only carry their prizes.
+    """
+    OPTIONAL: ClassVar[tuple] = ('team_name', 'team_logo')
+    team_name: Optional[str]
+    team_logo: Optional[str]
+    prizes: List[str]
+
+@dataclass(slots=True)
+class Event:
+    """
+    The details of an event, as returned by `EventScraper.get_event_details`.
+    """
+    title: str
+    date: str
+    prize_pool: str
+    teams: str
+    location: Location
+    prize_distribution: Dict[str, List[Placement]] = field(default_factory=dict)
+
+@dataclass(slots=True)
+class MatchTeam:
+    """
+    A team taking part in a match.
+    """
+    name: str
+    logo: Optional[str]
+
+@dataclass(slots=True)
+class MatchDetails:
+    """
+    The details of a match, as returned by `get_match_details`.
+    """
+    date: str
+    time: str
+    team1: MatchTeam
+    team2: MatchTeam
+    match_format: Optional[str]
+
+@dataclass(slots=True)
+class Match:
+    """
+    An upcoming match of a team, as returned by `MatchScraper.get_upcoming_matches`.
+    """
+    match_url: str
+    details: Optional[MatchDetails]
+
+@dataclass(slots=True)
+class MapResult:
+    """
+    The score of a map of a match.
+    """
+    map: str
+    team1_score: str
+    team2_score: str
+
+@dataclass(slots=True)
+class Result:
+    """
+    The result of a match, as returned by `ResultScraper.get_results`.
+    """
+    details: MatchDetails
+    maps: List[MapResult] = field(default_factory=list)
+
+_FIELDS = {}
+
+def json_default(obj):
+    """
+    Converts a model to the dictionary the API has always responded with.
+
+    Meant to be passed as the `default` argument of `json.dumps`, which calls it for every
+    model it meets while encoding, so no intermediate copy of the whole tree is built.
+    Fields listed in a model's `OPTIONAL` are left out when they are None.
+
+    Args:
+        obj (object): The object `json.dumps` cannot encode by itself.
+
+    Returns:
+        dict: The fields of the model, in declaration order.
+
+    Raises:
+        TypeError: If the object is not a model.
+    """
+    cls = type(obj)
+    names = _FIELDS.get(cls)
+    if names is None:
+        if not hasattr(cls, '__dataclass_fields__'):
+            raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+        names = _FIELDS[cls] = tuple(model_field.name for model_field in fields(cls))
+    optional = getattr(cls, 'OPTIONAL', ())
+    return {
+        name: getattr(obj, name) for name in names
+        if name not in optional or getattr(obj, name) is not None
+    }
+
+def to_data(obj):
+    """
+    Recursively converts models to plain dictionaries and lists.
+
+    Args:
+        obj (object): A model, or a list or dictionary containing models.
+
+    Returns:
+        object: The same data made of dictionaries, lists and scalars only.
+    """
+    if isinstance(obj, list):
+        return [to_data(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: to_data(value) for key, value in obj.items()}
+    if hasattr(type(obj), '__dataclass_fields__'):
+        return {key: to_data(value) for key, value in json_default(obj).items()}
+    return obj
+
+def select_fields(obj, names):
+    """
+    Keeps only some fields of a model, as the scrapers do when asked for a subset of fields.
+
+    Args:
+        obj (object): A model.
+        names (tuple): The names of the fields to keep.
+
+    Returns:
+        OrderedDict: The kept fields, in the order of `names`.
+    """
+    return OrderedDict((name, getattr(obj, name)) for name in names)
@@ -0,0 +1,318 @@
+import gzip
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_FILE = 'index.jsonl'
+PAGES_DIR = 'pages'
+SUFFIXES = ('.html.zst', '.html.gz')
+
+class PageArchive:
+    """
+    An opt-in archive of the raw pages received from HLTV, to replay them for debugging and benchmarks.
+
+    Pages are content-addressed: every distinct body is compressed once, with zstd when the
+    `zstandard` package is installed and gzip otherwise, into a file named after its hash, so
+    a page fetched again unchanged takes no more space. An append-only index records from which
+    fetch on each URL had each body; fetching a page again unchanged adds nothing to it either.
+
+    Fetches never wait for the disk: pages are handed to a background writer through a bounded
+    queue, and pages arriving while the queue is full are dropped. Once the bodies take more than
+    `max_bytes`, the least recently written ones are evicted along with their index lines. Once
+    the index holds more than `max_index_lines` lines, it is compacted to half of them, keeping
+    the latest line of every URL and the most recent others.
+
+    Attributes:
+        directory (str): The directory of the archive, None when the archive is disabled.
+        max_bytes (int): The maximum total size of the compressed bodies.
+        max_index_lines (int): The maximum number of lines of the index.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024, queue_size=64, max_index_lines=100000):
+        """
+        Initializes the archive; the writer thread is started by the first archived page.
+
+        Args:
+            directory (str, optional): The directory of the archive. Defaults to a disabled archive.
+            max_bytes (int): The maximum total size of the compressed bodies.
+            queue_size (int): The number of pages that may wait for the writer.
+            max_index_lines (int): The maximum number of lines of the index.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_index_lines = max_index_lines
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._size = None
+        self._latest = None
+        self._lines = None
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('archived', 0),
+            ('deduplicated', 0),
+            ('dropped', 0),
+            ('evicted', 0),
+            ('compactions', 0),
+            ('errors', 0)
+        ])
+
+    @property
+    def enabled(self):
+        """
+        Tells whether received pages are archived.
+
+        Returns:
+            bool: True if the archive has a directory.
+        """
+        return self.directory is not None
+
+    def record(self, url, body):
+        """
+        Queues a received page for archiving, without waiting for it to be written.
+
+        Args:
+            url (str): The URL of the page.
+            body (bytes): The body of the page, as received.
+        """
+        if not self.enabled:
+            return
+        self._start()
+        try:
+            self._queue.put_nowait((url, body, time.time()))
+        except queue.Full:
+            self._count('dropped')
+
+    def flush(self):
+        """
+        Waits until every queued page has been written.
+        """
+        if self.enabled:
+            self._queue.join()
+
+    def read(self, url, at=None):
+        """
+        Returns an archived body of a URL.
+
+        Args:
+            url (str): The URL of the page.
+            at (float, optional): A Unix time; the last body fetched at or before it is returned.
+                                  Defaults to the last body fetched.
+
+        Returns:
+            bytes: The body of the page, or None if it is not archived.
+        """
+        for fetched_at, digest in reversed(self.history(url)):
+            if at is not None and fetched_at > at:
+                continue
+            body = self._read_blob(digest)
+            if body is not None:
+                return body
+        return None
+
+    def history(self, url):
+        """
+        Lists the fetches of a URL recorded in the index.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            list: `(fetched_at, digest)` tuples, oldest first, one per change of the body.
+                  Evicted bodies are not listed.
+        """
+        if not self.enabled:
+            return []
+        try:
+            entries = self._read_index()
+        except (OSError, ValueError) as error:
+            print(f"[ERRO] Falha ao ler o índice do arquivo de páginas: {error}")
+            self._count('errors')
+            return []
+        return [(entry['fetched_at'], entry['digest']) for entry in entries if entry['url'] == url]
+
+    def stats(self):
+        """
+        Returns a snapshot of the archive counters.
+
+        Returns:
+            OrderedDict: Whether the archive is enabled, the bodies written, the pages whose body
+                         was already archived, the pages dropped because the writer lagged behind,
+                         the evicted bodies, index compactions, errors, the pages waiting for the
+                         writer, the total size of the bodies and the lines of the index, the last
+                         two being None until the writer first ran.
+        """
+        with self._lock:
+            stats = OrderedDict([('enabled', self.enabled)])
+            stats.update(self._counters)
+            stats['queued'] = self._queue.qsize()
+            stats['bytes'] = self._size
+            stats['index_lines'] = self._lines
+        return stats
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='hltv-page-archive', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            url, body, fetched_at = self._queue.get()
+            try:
+                self._write(url, body, fetched_at)
+            except (OSError, ValueError) as error:
+                print(f"[ERRO] Falha ao arquivar {url}: {error}")
+                self._count('errors')
+            finally:
+                self._queue.task_done()
+
+    def _write(self, url, body, fetched_at):
+        pages = os.path.join(self.directory, PAGES_DIR)
+        if self._size is None:
+            os.makedirs(pages, exist_ok=True)
+            entries = self._read_index()
+            self._latest = {entry['url']: entry['digest'] for entry in entries}
+            with self._lock:
+                self._lines = len(entries)
+                self._size = sum(entry.stat().st_size for entry in os.scandir(pages) if entry.name.endswith(SUFFIXES))
+
+        digest = hashlib.blake2b(body, digest_size=20).hexdigest()
+        existing = self._blob_path(digest)
+        if existing is not None:
+            os.utime(existing)
+            self._count('deduplicated')
+        else:
+            suffix, data = _compress(body)
+            fd, temporary = tempfile.mkstemp(dir=pages, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(temporary, os.path.join(pages, digest + suffix))
+            except BaseException:
+                os.unlink(temporary)
+                raise
+            with self._lock:
+                self._size += len(data)
+            self._count('archived')
+
+        if self._latest.get(url) != digest:
+            line = json.dumps({'url': url, 'digest': digest, 'fetched_at': fetched_at}, ensure_ascii=False)
+            with open(os.path.join(self.directory, INDEX_FILE), 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            self._latest[url] = digest
+            with self._lock:
+                self._lines += 1
+        if self._size > self.max_bytes:
+            self._evict()
+        if self._lines > self.max_index_lines:
+            self._compact()
+
+    def _evict(self):
+        pages = os.path.join(self.directory, PAGES_DIR)
+        blobs = sorted(
+            (entry for entry in os.scandir(pages) if entry.name.endswith(SUFFIXES)),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        evicted = set()
+        for entry in blobs:
+            if self._size <= self.max_bytes:
+                break
+            size = entry.stat().st_size
+            os.unlink(entry.path)
+            evicted.add(entry.name.split('.', 1)[0])
+            with self._lock:
+                self._size -= size
+            self._count('evicted')
+
+        self._rewrite_index([entry for entry in self._read_index() if entry['digest'] not in evicted])
+
+    def _compact(self):
+        entries = self._read_index()
+        latest = {entry['url']: position for position, entry in enumerate(entries)}
+        kept = set(latest.values())
+        for position in range(len(entries) - 1, -1, -1):
+            if len(kept) >= self.max_index_lines // 2:
+                break
+            kept.add(position)
+        self._rewrite_index([entry for position, entry in enumerate(entries) if position in kept])
+        self._count('compactions')
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _rewrite_index(self, entries):
+        fd, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(temporary, os.path.join(self.directory, INDEX_FILE))
+        self._latest = {entry['url']: entry['digest'] for entry in entries}
+        with self._lock:
+            self._lines = len(entries)
+
+    def _blob_path(self, digest):
+        for suffix in SUFFIXES:
+            path = os.path.join(self.directory, PAGES_DIR, digest + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _read_blob(self, digest):
+        path = self._blob_path(digest)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.gz'):
+            return gzip.decompress(data)
+        if zstandard is None:
+            print(f"[ERRO] O pacote zstandard é necessário para ler {path}")
+            return None
+        return zstandard.ZstdDecompressor().decompress(data)
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+def _compress(body):
+    if zstandard is not None:
+        return '.html.zst', zstandard.ZstdCompressor(level=10).compress(body)
+    return '.html.gz', gzip.compress(body, compresslevel=6)
+
+_archive = None
+_archive_lock = threading.Lock()
+
+def get_page_archive():
+    """
+    Returns the process-wide page archive, creating it on first use.
+
+    Pages are only archived when the `HLTV_ARCHIVE_DIR` environment variable names the directory
+    of the archive. `HLTV_ARCHIVE_MAX_BYTES` caps the total size of the compressed pages.
+
+    Returns:
+        PageArchive: The page archive.
+    """
+    global _archive
+    if _archive is None:
+        with _archive_lock:
+            if _archive is None:
+                _archive = PageArchive(
+                    directory=os.environ.get('HLTV_ARCHIVE_DIR') or None,
+                    max_bytes=int(os.environ.get('HLTV_ARCHIVE_MAX_BYTES', 256 * 1024 * 1024))
+                )
+    return _archive
@@ -0,0 +1,430 @@
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+DEFAULT_TTLS = OrderedDict([
+    ('/matches/', 15),
+    ('/team/', 3600),
+    ('/events/', 3600)
+])
+# How long after expiry a page may still be served while it is refreshed, in proportion to
+# how quickly it changes.
+DEFAULT_STALE_TTLS = OrderedDict([
+    ('/matches/', 15),
+    ('/team/', 600),
+    ('/events/', 600)
+])
+# The memory a parsed element or string takes, on average, measured on the benchmark fixtures
+# with every parser backend. A parse of a whole page takes about 16 times its HTML.
+PARSED_NODE_BYTES = 800
+
+_stale_pages = contextvars.ContextVar('stale_pages', default=())
+
+class Page:
+    """
+    A page fetched from HLTV, kept as received so that every parse of it shares one download.
+
+    Requests needing different regions of the same page are served from the same `Page`, each
+    parse being made once, by a single request at a time, and kept along with the page. A parse of the whole page, or of more
+    regions than asked for, stands in for a narrower one.
+
+    Attributes:
+        html (str): The HTML of the page.
+        size (int): The size of the page as received.
+        parsed_size (int): An estimate of the memory taken by the parses kept with the page.
+        validators (dict): What HLTV needs to tell whether the page changed since, or None.
+    """
+
+    def __init__(self, html, size, validators=None):
+        """
+        Initializes a page not parsed yet.
+
+        Args:
+            html (str): The HTML of the page.
+            size (int): The size of the page as received.
+            validators (dict, optional): The validators HLTV sent with the page.
+        """
+        self.html = html
+        self.size = size
+        self.parsed_size = 0
+        self.validators = validators
+        self._parses = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def parse(self, regions, parse):
+        """
+        Returns a parse of the page materializing at least the given regions.
+
+        A parse already kept with the page is returned as is. Otherwise the page is parsed with
+        `parse` and the parse kept; concurrent requests for the same regions wait for that parse
+        instead of making their own.
+
+        Args:
+            regions (tuple): The regions of the page to materialize, or None for the whole page.
+            parse (callable): Called with the HTML and the regions to parse the page.
+
+        Returns:
+            BeautifulSoup: The parse of the page.
+        """
+        while True:
+            with self._lock:
+                soup = self._kept(regions)
+                if soup is not None:
+                    return soup
+                pending = self._pending.get(regions)
+                leader = pending is None
+                if leader:
+                    pending = self._pending[regions] = threading.Event()
+            if not leader:
+                # Should the parse fail, the next waiter in line makes its own.
+                pending.wait()
+                continue
+            try:
+                soup = parse(self.html, regions)
+                parsed_size = _parsed_size(soup)
+                with self._lock:
+                    kept = self._parses.setdefault(regions, soup)
+                    if kept is soup:
+                        self.parsed_size += parsed_size
+                    return kept
+            finally:
+                with self._lock:
+                    del self._pending[regions]
+                pending.set()
+
+    def _kept(self, regions):
+        soup = self._parses.get(regions)
+        if soup is not None or regions is None:
+            return soup
+        wanted = set(regions)
+        for variant, soup in self._parses.items():
+            if variant is None or wanted.issubset(variant):
+                return soup
+        return None
+
+class PageCache:
+    """
+    A bounded in-memory cache of fetched pages keyed by URL.
+
+    Entries expire after a time-to-live chosen by the URL path, and the least recently used
+    entries are evicted once the total size of the cached pages, along with the parses kept
+    with them, exceeds `max_bytes`. Expired
+    entries are still served for a stale window, also chosen by the URL path and capped by
+    `max_stale_ttl`, while a background thread refreshes them.
+    Pages keep the validators HLTV sent with them, so an expired page can be revalidated with a
+    conditional request and kept as is when it did not change.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the cached pages and their parses.
+        ttls (OrderedDict): Path prefixes mapped to their time-to-live in seconds.
+        default_ttl (float): The time-to-live of pages matching no prefix.
+        stale_ttls (OrderedDict): Path prefixes mapped to how long after expiry a page may still be served.
+        default_stale_ttl (float): The stale window of pages matching no prefix.
+        max_stale_ttl (float): The longest stale window, or None for no cap.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttls=None, default_ttl=300, stale_ttls=None,
+                 default_stale_ttl=60, max_stale_ttl=None):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_bytes (int): The maximum total size of the cached pages and their parses.
+            ttls (OrderedDict, optional): Path prefixes mapped to their time-to-live in seconds.
+            default_ttl (float): The time-to-live of pages matching no prefix.
+            stale_ttls (OrderedDict, optional): Path prefixes mapped to their stale window in seconds.
+            default_stale_ttl (float): The stale window of pages matching no prefix.
+            max_stale_ttl (float, optional): The longest stale window; 0 never serves expired pages.
+        """
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.default_ttl = default_ttl
+        self.stale_ttls = stale_ttls if stale_ttls is not None else DEFAULT_STALE_TTLS
+        self.default_stale_ttl = default_stale_ttl
+        self.max_stale_ttl = max_stale_ttl
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('hits', 0),
+            ('stale_hits', 0),
+            ('misses', 0),
+            ('evictions', 0),
+            ('refreshes', 0),
+            ('revalidated', 0)
+        ])
+
+    def ttl_for(self, url):
+        """
+        Returns the time-to-live that applies to a URL.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            float: The time-to-live in seconds.
+        """
+        return _for_path(url, self.ttls, self.default_ttl)
+
+    def stale_ttl_for(self, url):
+        """
+        Returns how long after expiry a page may still be served while it is refreshed.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            float: The stale window in seconds.
+        """
+        stale_ttl = _for_path(url, self.stale_ttls, self.default_stale_ttl)
+        return stale_ttl if self.max_stale_ttl is None else min(stale_ttl, self.max_stale_ttl)
+
+    def get(self, url, loader):
+        """
+        Returns the cached page of a URL, loading it on a miss.
+
+        An expired page served while it is refreshed is reported to `watch_stale_pages`.
+
+        Args:
+            url (str): The URL of the page.
+            loader (callable): Called with the URL on a miss; returns a `Page`, or None when the
+                               page could not be loaded.
+
+        Returns:
+            Page: The cached or freshly loaded page, or None if loading failed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                age = now - entry['stored']
+                if age < entry['ttl']:
+                    self._entries.move_to_end(url)
+                    self._counters['hits'] += 1
+                    return entry['page']
+                if age < entry['ttl'] + entry['stale_ttl']:
+                    self._entries.move_to_end(url)
+                    self._counters['stale_hits'] += 1
+                    self._refresh_in_background(url, loader)
+                    _note_stale(url)
+                    return entry['page']
+            self._counters['misses'] += 1
+
+        return self._load(url, loader)
+
+    def put(self, url, page):
+        """
+        Stores a freshly loaded page, replacing any cached one.
+
+        Args:
+            url (str): The URL of the page.
+            page (Page): The page to cache.
+        """
+        self._store(url, page)
+
+    def charge(self, url, page):
+        """
+        Counts the parses kept since a page was stored against `max_bytes`, evicting the least
+        recently used pages if needed.
+
+        Args:
+            url (str): The URL of the page.
+            page (Page): The page that was parsed; nothing is counted unless it is the cached one.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry['page'] is not page:
+                return
+            charged = _charge(page)
+            self._size += charged - entry['charged']
+            entry['charged'] = charged
+            self._evict()
+
+    def age(self, url):
+        """
+        Returns how long ago a URL was stored.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            float: The age in seconds, or None if the URL is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            return time.monotonic() - entry['stored'] if entry is not None else None
+
+    def peek(self, url):
+        """
+        Returns the cached page of a URL however old it is, without loading it.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Page: The cached page, or None if the URL is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            return entry['page'] if entry is not None else None
+
+    def fallback(self, url):
+        """
+        Returns the cached page of a URL however old it is, to serve when it cannot be fetched.
+
+        The page is reported to `watch_stale_pages`.
+
+        Args:
+            url (str): The URL of the page.
+
+        Returns:
+            Page: The cached page, or None if the URL is not cached.
+        """
+        page = self.peek(url)
+        if page is not None:
+            _note_stale(url)
+        return page
+
+    def invalidate(self, url):
+        """
+        Drops the cached page of a URL.
+
+        Args:
+            url (str): The URL of the page.
+        """
+        with self._lock:
+            entry = self._entries.pop(url, None)
+            if entry is not None:
+                self._size -= entry['charged']
+
+    def stats(self):
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            OrderedDict: Hit/miss/eviction counts, the expired pages HLTV confirmed unchanged and
+                         the current cache occupancy.
+        """
+        with self._lock:
+            stats = OrderedDict(self._counters)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._size
+            stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def _load(self, url, loader):
+        started = time.monotonic()
+        page = loader(url)
+        if page is None:
+            return None
+        self._store(url, page, started)
+        return page
+
+    def _store(self, url, page, started=None):
+        if _charge(page) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.get(url)
+            if previous is not None and previous['page'] is page:
+                # Concurrent misses share one fetch; only the first of them stores the page.
+                if started is not None and previous['stored'] >= started:
+                    return
+                self._counters['revalidated'] += 1
+            if previous is not None:
+                del self._entries[url]
+                self._size -= previous['charged']
+            self._entries[url] = {
+                'page': page,
+                'ttl': self.ttl_for(url),
+                'stale_ttl': self.stale_ttl_for(url),
+                'stored': time.monotonic(),
+                'charged': _charge(page)
+            }
+            self._size += _charge(page)
+            self._evict()
+
+    def _evict(self):
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= evicted['charged']
+            self._counters['evictions'] += 1
+
+    def _refresh_in_background(self, url, loader):
+        if url in self._refreshing:
+            return
+        self._refreshing.add(url)
+        self._counters['refreshes'] += 1
+
+        def refresh():
+            try:
+                self._load(url, loader)
+            except Exception as error:
+                print(f"[ERRO] Falha ao atualizar {url}: {error}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+def watch_stale_pages(nested=False):
+    """
+    Starts collecting the URLs of the expired pages served in the current context.
+
+    The context is copied to the tasks and executor jobs scraping a request, which share the
+    returned set, so the request can tell whether its data may be out of date.
+
+    Args:
+        nested (bool): Whether the sets of the enclosing contexts, e.g. the one of the request
+                       scraping a batch of items, are still filled in as well.
+
+    Returns:
+        set: The URLs of the expired pages served, filled in as they are served.
+    """
+    watched = set()
+    _stale_pages.set((_stale_pages.get() if nested else ()) + (watched,))
+    return watched
+
+def _parsed_size(soup):
+    return PARSED_NODE_BYTES * sum(1 for _ in soup.descendants)
+
+def _charge(page):
+    return page.size + page.parsed_size
+
+def _note_stale(url):
+    for watched in _stale_pages.get():
+        watched.add(url)
+
+def _for_path(url, prefixes, default):
+    path = urlsplit(url).path
+    for prefix, value in prefixes.items():
+        if path.startswith(prefix):
+            return value
+    return default
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_page_cache():
+    """
+    Returns the process-wide page cache, creating it on first use.
+
+    The cache is configured through the `HLTV_CACHE_MAX_BYTES` and `HLTV_CACHE_STALE_TTL`
+    environment variables, the latter capping the stale window of every page.
+
+    Returns:
+        PageCache: The shared page cache.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PageCache(
+                    max_bytes=int(os.environ.get('HLTV_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+                    max_stale_ttl=float(os.environ.get('HLTV_CACHE_STALE_TTL', 600))
+                )
+    return _cache
@@ -0,0 +1,128 @@
+import os
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+def parse_html(html, regions=None, backend=None):
+    """
+    Parses an HTML page into a BeautifulSoup tree, optionally keeping only some regions of it.
+
+    Regions are `(tag, attribute, value)` tuples naming the elements the extractors search for,
+    e.g. `('div', 'id', 'matchesBox')`. Only matching elements and their descendants are
+    materialized, in document order. The `class` attribute follows BeautifulSoup's `class_`
+    semantics and an attribute suffixed with `^` matches by prefix, e.g. `('a', 'href^', '/team/')`.
+    As long as every element an extractor looks up from the root of the page is declared,
+    extraction gives the same output as on the full tree.
+
+    Backends:
+        html.parser: Python's built-in parser, the reference output.
+        lxml: BeautifulSoup on top of lxml, much faster on large pages.
+        selectolax: Cuts the regions out of the page with the lexbor engine and only hands
+                    those fragments to BeautifulSoup. Without regions it behaves like lxml.
+
+    Backends whose library is not installed fall back to `html.parser`.
+
+    Args:
+        html (str): The HTML of the page.
+        regions (tuple, optional): The regions to keep. Defaults to the whole page.
+        backend (str, optional): The parser backend. Defaults to the `HLTV_PARSER` environment variable.
+
+    Returns:
+        BeautifulSoup: The parsed page.
+    """
+    backend = backend or os.environ.get('HLTV_PARSER', 'html.parser')
+    if backend == 'selectolax':
+        if regions and LexborHTMLParser is not None:
+            return BeautifulSoup(_cut_regions(html, regions), 'html.parser')
+        backend = 'lxml'
+    if backend == 'lxml' and lxml is None:
+        backend = 'html.parser'
+    if backend not in PARSER_BACKENDS:
+        print(f"[ERRO] Parser desconhecido {backend}, usando html.parser")
+        backend = 'html.parser'
+
+    parse_only = SoupStrainer(_region_matcher(regions)) if regions else None
+    return BeautifulSoup(html, backend, parse_only=parse_only)
+
+def compile_selector(selector):
+    """
+    Compiles a `(tag, attribute, value)` selector into a predicate over the attributes of an element.
+
+    The tag name is not checked by the predicate, callers index their selectors by tag. The
+    `class` attribute follows BeautifulSoup's `class_` semantics and an attribute suffixed with
+    `^` matches by prefix. An attribute of None matches every element of the tag and a value of
+    True every element carrying the attribute.
+
+    Args:
+        selector (tuple): The `(tag, attribute, value)` selector.
+
+    Returns:
+        callable: Takes the attributes of an element and tells whether it matches.
+    """
+    _, attribute, value = selector
+    if attribute is None:
+        return lambda attrs: True
+    prefix = attribute.endswith('^')
+    name = attribute[:-1] if prefix else attribute
+
+    def matches(attrs):
+        found = attrs.get(name)
+        if found is None:
+            return False
+        if value is True:
+            return True
+        if not isinstance(found, str):
+            found = ' '.join(found)
+        if prefix:
+            return found.startswith(value)
+        return found == value or (name == 'class' and value in found.split())
+
+    return matches
+
+def _region_matcher(regions):
+    by_tag = {}
+    for region in regions:
+        by_tag.setdefault(region[0], []).append(compile_selector(region))
+
+    def matches(name, attrs):
+        return any(predicate(attrs) for predicate in by_tag.get(name, ()))
+
+    return matches
+
+def _region_selector(regions):
+    selectors = []
+    for tag, attribute, value in regions:
+        if attribute is None:
+            selectors.append(tag)
+        elif value is True:
+            selectors.append(f'{tag}[{attribute}]')
+        elif attribute.endswith('^'):
+            selectors.append(f'{tag}[{attribute[:-1]}^="{value}"]')
+        elif attribute == 'class' and ' ' not in value:
+            selectors.append(f'{tag}.{value}')
+        else:
+            selectors.append(f'{tag}[{attribute}="{value}"]')
+    return ', '.join(selectors)
+
+def _cut_regions(html, regions):
+    tree = LexborHTMLParser(html)
+    nodes = tree.css(_region_selector(regions))
+    kept = set(node.mem_id for node in nodes)
+    fragments = []
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in kept:
+            parent = parent.parent
+        if parent is None:
+            fragments.append(node.html)
+    return ''.join(fragments)
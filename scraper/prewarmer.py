@@ -0,0 +1,157 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from scraper.rate_limiter import route_of
+
+PREWARMED_ROUTES = ('team', 'events', 'matches')
+REFRESH_AT = 0.8
+HALF_LIFE = 600
+
+class Prewarmer:
+    """
+    Keeps the most requested pages warm in the page cache.
+
+    Every page request is counted per URL, and a background thread periodically refreshes the
+    `top_n` most requested pages shortly before they expire. The refresh schedule therefore
+    follows the page cache TTLs: seconds for live match pages, an hour for team and event pages.
+    Counts halve every ten minutes so pages that stop being requested drop out.
+
+    A page is only refreshed while it is requested often enough for the refresh to pay off: at
+    least `min_hits` times recently, and on average at least once per TTL, so that each refresh
+    is expected to spare a request a fetch. A page requested once is never refreshed.
+
+    Attributes:
+        scraper_instance (Scraper): The scraper used to refresh pages.
+        top_n (int): The number of pages kept warm; 0 disables prewarming.
+        interval (float): The number of seconds between two refresh cycles.
+        min_hits (float): The decayed request count below which a page is not refreshed.
+    """
+
+    def __init__(self, scraper_instance, top_n=0, interval=5, min_hits=3):
+        """
+        Initializes the prewarmer; its thread starts with the first recorded request.
+
+        Args:
+            scraper_instance (Scraper): The scraper used to refresh pages.
+            top_n (int): The number of pages kept warm; 0 disables prewarming.
+            interval (float): The number of seconds between two refresh cycles.
+            min_hits (float): The decayed request count below which a page is not refreshed.
+        """
+        self.scraper_instance = scraper_instance
+        self.top_n = top_n
+        self.interval = interval
+        self.min_hits = min_hits
+        self._counts = {}
+        self._regions = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('cycles', 0),
+            ('refreshed', 0),
+            ('failed', 0)
+        ])
+
+    def record(self, url, regions=None):
+        """
+        Counts a request for a page.
+
+        Args:
+            url (str): The URL of the page.
+            regions (tuple, optional): The regions the page is parsed with; a refreshed page is
+                                       parsed with the last ones requested.
+        """
+        if not self.top_n or route_of(url) not in PREWARMED_ROUTES:
+            return
+        with self._lock:
+            self._counts[url] = self._counts.get(url, 0) + 1
+            self._regions[url] = regions
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='hltv-prewarmer', daemon=True)
+                self._thread.start()
+
+    def hot_pages(self):
+        """
+        Returns the pages currently kept warm, most requested first.
+
+        Returns:
+            list: The `(url, regions)` of the top pages requested often enough to be refreshed.
+        """
+        cache = self.scraper_instance.cache
+        with self._lock:
+            ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+            # A count decaying with HALF_LIFE settles at rate * HALF_LIFE / ln 2 requests.
+            hot = [
+                (url, self._regions[url]) for url, count in ranked
+                if count >= self.min_hits and count * math.log(2) / HALF_LIFE * cache.ttl_for(url) >= 1
+            ]
+        return hot[:self.top_n]
+
+    def stats(self):
+        """
+        Returns a snapshot of the prewarmer counters.
+
+        Returns:
+            OrderedDict: Refresh cycles, refreshed and failed pages and the number of tracked pages.
+        """
+        with self._lock:
+            stats = OrderedDict(self._counters)
+            stats['tracked'] = len(self._counts)
+            stats['top_n'] = self.top_n
+        return stats
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self._cycle()
+
+    def _cycle(self):
+        cache = self.scraper_instance.cache
+        for url, regions in self.hot_pages():
+            age = cache.age(url)
+            if age is not None and age < cache.ttl_for(url) * REFRESH_AT:
+                continue
+            try:
+                self.scraper_instance.refresh(url, regions)
+                outcome = 'refreshed'
+            except Exception as error:
+                print(f"[ERRO] Falha ao preaquecer {url}: {error}")
+                outcome = 'failed'
+            with self._lock:
+                self._counters[outcome] += 1
+
+        with self._lock:
+            self._counters['cycles'] += 1
+            decay = 0.5 ** (self.interval / HALF_LIFE)
+            for url in list(self._counts):
+                self._counts[url] *= decay
+                if self._counts[url] < 0.1:
+                    del self._counts[url]
+                    del self._regions[url]
+
+_prewarmer = None
+_prewarmer_lock = threading.Lock()
+
+def get_prewarmer():
+    """
+    Returns the process-wide prewarmer, creating it on first use.
+
+    It is configured through the `HLTV_PREWARM_TOP` (0, the default, disables it),
+    `HLTV_PREWARM_INTERVAL` and `HLTV_PREWARM_MIN_HITS` environment variables.
+
+    Returns:
+        Prewarmer: The shared prewarmer.
+    """
+    global _prewarmer
+    if _prewarmer is None:
+        with _prewarmer_lock:
+            if _prewarmer is None:
+                from scraper.scraper import Scraper
+                _prewarmer = Prewarmer(
+                    Scraper(),
+                    top_n=int(os.environ.get('HLTV_PREWARM_TOP', 0)),
+                    interval=float(os.environ.get('HLTV_PREWARM_INTERVAL', 5)),
+                    min_hits=float(os.environ.get('HLTV_PREWARM_MIN_HITS', 3))
+                )
+    return _prewarmer
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlsplit
+
+PRIORITIES = OrderedDict([
+    ('matches', 0),
+    ('team', 1),
+    ('events', 1)
+])
+DEFAULT_PRIORITY = 2
+
+class OutboundScheduler:
+    """
+    Paces the requests sent to HLTV with a token bucket and decides who goes first.
+
+    Requests wait in a priority queue: match pages (live results) are sent before team and
+    event pages. Within a priority, routes are served round-robin so a burst on one route
+    cannot starve the others. A request whose deadline passes while it waits leaves the queue
+    without taking a token.
+
+    Attributes:
+        rate (float): The number of requests allowed per second; 0 disables pacing.
+        burst (int): The number of requests that may be sent back to back.
+    """
+
+    def __init__(self, rate=2, burst=5):
+        """
+        Initializes the scheduler with a full bucket.
+
+        Args:
+            rate (float): The number of requests allowed per second; 0 disables pacing.
+            burst (int): The number of requests that may be sent back to back.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queues = {}
+        self._queued = 0
+        self._timer = None
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('granted', 0),
+            ('delayed', 0),
+            ('expired', 0),
+            ('max_queued', 0),
+            ('total_wait_ms', 0.0),
+            ('max_wait_ms', 0.0)
+        ])
+
+    def acquire(self, url, deadline=None):
+        """
+        Blocks until a request to the URL may be sent, or until its deadline passes.
+
+        Args:
+            url (str): The URL about to be requested.
+            deadline (float, optional): The `time.monotonic()` value after which the request is
+                                        given up. Defaults to waiting as long as needed.
+
+        Returns:
+            bool: True if the request may be sent, False if the deadline passed first.
+        """
+        if not self.rate:
+            return True
+
+        route = route_of(url)
+        waiter = threading.Event()
+        started = time.monotonic()
+        with self._lock:
+            routes = self._queues.setdefault(PRIORITIES.get(route, DEFAULT_PRIORITY), OrderedDict())
+            routes.setdefault(route, deque()).append(waiter)
+            self._queued += 1
+            self._counters['max_queued'] = max(self._counters['max_queued'], self._queued)
+            self._dispatch()
+
+        waiter.wait(None if deadline is None else max(0, deadline - time.monotonic()))
+        waited = (time.monotonic() - started) * 1000
+        with self._lock:
+            if not waiter.is_set():
+                self._withdraw(route, waiter)
+                self._counters['expired'] += 1
+                return False
+            self._counters['granted'] += 1
+            if waited >= 1:
+                self._counters['delayed'] += 1
+            self._counters['total_wait_ms'] += waited
+            self._counters['max_wait_ms'] = max(self._counters['max_wait_ms'], waited)
+        return True
+
+    def stats(self):
+        """
+        Returns a snapshot of the scheduler counters.
+
+        Returns:
+            OrderedDict: Granted and delayed requests, requests whose deadline passed in the queue,
+                         queue depth and wait times.
+        """
+        with self._lock:
+            stats = OrderedDict(self._counters)
+            stats['queued'] = self._queued
+            stats['queued_by_route'] = OrderedDict(
+                (route, len(waiters))
+                for priority in sorted(self._queues)
+                for route, waiters in self._queues[priority].items()
+            )
+            stats['avg_wait_ms'] = round(stats['total_wait_ms'] / stats['granted'], 2) if stats['granted'] else 0
+            stats['total_wait_ms'] = round(stats['total_wait_ms'], 2)
+            stats['max_wait_ms'] = round(stats['max_wait_ms'], 2)
+            stats['rate'] = self.rate
+            stats['burst'] = self.burst
+        return stats
+
+    def _dispatch(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        while self._queued and self._tokens >= 1:
+            self._next_waiter().set()
+            self._queued -= 1
+            self._tokens -= 1
+
+        if self._queued and self._timer is None:
+            self._timer = threading.Timer((1 - self._tokens) / self.rate, self._on_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _next_waiter(self):
+        routes = self._queues[min(priority for priority, routes in self._queues.items() if routes)]
+        route, waiters = next(iter(routes.items()))
+        waiter = waiters.popleft()
+        del routes[route]
+        if waiters:
+            routes[route] = waiters
+        return waiter
+
+    def _withdraw(self, route, waiter):
+        routes = self._queues[PRIORITIES.get(route, DEFAULT_PRIORITY)]
+        waiters = routes[route]
+        waiters.remove(waiter)
+        if not waiters:
+            del routes[route]
+        self._queued -= 1
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            self._dispatch()
+
+def route_of(url):
+    """
+    Returns the route a URL belongs to, i.e. the first segment of its path.
+
+    Args:
+        url (str): The URL of the page.
+
+    Returns:
+        str: The route, e.g. `team` for `https://www.hltv.org/team/5995/g2`.
+    """
+    return urlsplit(url).path.strip('/').split('/')[0]
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """
+    Returns the process-wide outbound scheduler, creating it on first use.
+
+    It is configured through the `HLTV_RATE_LIMIT` (requests per second, 0 to disable) and
+    `HLTV_RATE_BURST` environment variables.
+
+    Returns:
+        OutboundScheduler: The shared scheduler.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = OutboundScheduler(
+                    rate=float(os.environ.get('HLTV_RATE_LIMIT', 2)),
+                    burst=int(os.environ.get('HLTV_RATE_BURST', 5))
+                )
+    return _scheduler
@@ -1,67 +1,60 @@
 from collections import OrderedDict
+from scraper.document import DocumentContext
+from scraper.extraction import Schema, attr, every, first
+from scraper.models import MapResult, Result
 from scraper.scraper import Scraper
-from utils.match_utils import get_match_details
+from utils.match_utils import MATCH_PAGE_FIELDS, build_match_details, get_match_details
 
 class ResultScraper:
-    
+    SCHEMA = Schema(dict(MATCH_PAGE_FIELDS, **{
+        'team1': first(('a', 'class', 'team1'), get=attr('href')),
+        'team2': first(('a', 'class', 'team2'), get=attr('href')),
+        'maps': every(('div', 'class', 'mapholder'), fields={
+            'map': first(('div', 'class', 'mapname'), default="Unknown"),
+            'team1_score': first(('div', 'class', 'results-left'), then=first(('div', 'class', 'results-team-score'), default="-"), default="-"),
+            'team2_score': first(('span', 'class', 'results-right'), then=first(('div', 'class', 'results-team-score'), default="-"), default="-")
+        })
+    }), name='result')
+    REGIONS = SCHEMA.regions
+    FIELDS = OrderedDict([
+        ('details', tuple(MATCH_PAGE_FIELDS) + ('team1', 'team2')),
+        ('maps', ('maps',))
+    ])
+
     def __init__(self, match_id, match_name):
         self.match_id = match_id
         self.match_name = match_name
         self.url = f"https://www.hltv.org/matches/{match_id}/{match_name}"
         self.scraper_instance = Scraper()
+        self.document = DocumentContext(self.scraper_instance)
         
-    def get_results(self):
-        soup = self.scraper_instance.html_parser(self.url)
-        
-        teams_url = self._get_teams_url(soup)
-        maps = self._get_maps(soup)
-        
-        results = OrderedDict([
-            ('details', self.get_details(self.url, teams_url.get('team1'), teams_url.get('team2'))),
-            ('maps', maps)
+    def get_results(self, fields=None):
+        schema = self.SCHEMA.select(fields, self.FIELDS)
+        soup = self.document.html_parser(self.url, schema.regions)
+        page = schema.extract(soup)
+        builders = OrderedDict([
+            ('details', lambda: build_match_details(page, page['team1'], page['team2'])),
+            ('maps', lambda: self._get_maps(page))
         ])
+        if fields is not None:
+            return OrderedDict((field, build()) for field, build in builders.items() if field in fields)
+        
+        results = Result(**{field: build() for field, build in builders.items()})
         
         return results
-    
-    def _get_teams_url(self, soup):
-        def extract_url(team_class):
-            team = soup.find('a', class_=team_class)
-            return team['href'] if team and 'href' in team.attrs else None
-
-        return {
-            'team1': extract_url('team1'),
-            'team2': extract_url('team2')
-        }
-
-    def _get_maps(self, soup):
-        maps = []
 
+    def get_maps(self, soup):
+        return self._get_maps(self.SCHEMA.extract(soup))
 
-        map_containers = soup.find_all('div', class_='mapholder')
-
-        for container in map_containers:
-            map_name_div = container.find('div', class_='mapname')
-            map_name = map_name_div.text.strip() if map_name_div else "Unknown"
-
-            results_left = container.find('div', class_='results-left')
-            results_right = container.find('span', class_='results-right')
-            
-            team1_score = (
-                results_left.find('div', class_='results-team-score').text.strip()
-                if results_left and results_left.find('div', class_='results-team-score') else "-"
-            )
-            team2_score = (
-                results_right.find('div', class_='results-team-score').text.strip()
-                if results_right and results_right.find('div', class_='results-team-score') else "-"
+    def _get_maps(self, page):
+        return [
+            MapResult(
+                map=map_result['map'],
+                team1_score=map_result['team1_score'],
+                team2_score=map_result['team2_score']
             )
-
-            maps.append({
-                'map': map_name,
-                'team1_score': team1_score,
-                'team2_score': team2_score
-            })
-
-        return maps
+            for map_result in page['maps']
+        ]
 
     def get_details(self, match_url, team1, team2):
-        return get_match_details(self.scraper_instance, match_url, team1, team2)
\ No newline at end of file
+        return get_match_details(self.document, match_url, team1, team2)
\ No newline at end of file
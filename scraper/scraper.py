@@ -1,37 +1,296 @@
-import cloudscraper
-from bs4 import BeautifulSoup
+import os
+import random
+import time
+from collections import OrderedDict
+from urllib.parse import urldefrag
+import requests
+from cloudscraper.exceptions import CloudflareException
+from scraper.circuit_breaker import get_circuit_breaker
+from scraper.errors import CircuitOpenError, PageNotFound, ScraperError, UpstreamError, UpstreamTimeout
+from scraper.metrics import get_metrics
+from scraper.page_archive import get_page_archive
+from scraper.page_cache import Page, get_page_cache
+from scraper.parsers import parse_html
+from scraper.prewarmer import get_prewarmer
+from scraper.rate_limiter import get_scheduler, route_of
+from scraper.session_pool import get_session_pool
+from scraper.single_flight import get_single_flight
+
+DEADLINES = OrderedDict([
+    ('matches', 8),
+    ('team', 15),
+    ('events', 15)
+])
+DEFAULT_DEADLINE = 15
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 class Scraper:
     """
     A class to facilitate web scraping by using CloudScraper to bypass anti-bot mechanisms and BeautifulSoup for HTML parsing.
 
     Attributes:
-        scraper (CloudScraper): An instance of the CloudScraper library used to handle HTTP requests.
+        pool (SessionPool): The shared pool of CloudScraper sessions used to handle HTTP requests.
+        cache (PageCache): The shared cache of fetched pages.
+        flights (SingleFlight): Coalesces concurrent fetches of the same URL.
+        scheduler (OutboundScheduler): Paces and orders the requests sent to HLTV.
+        breaker (CircuitBreaker): Fails fast while HLTV is degraded.
+        retries (int): The number of times a failed request is retried.
+        metrics (Metrics): Records fetch and parse durations and upstream traffic.
+        archive (PageArchive): Keeps the raw pages received, when enabled.
     """
     
-    def __init__(self):
+    def __init__(self, pool=None, cache=None, flights=None, scheduler=None, breaker=None):
         """
-        Initializes the Scraper instance and creates a CloudScraper object for HTTP requests.
+        Initializes the Scraper instance with the process-wide session pool and page cache.
+
+        Args:
+            pool (SessionPool, optional): The session pool to draw from. Defaults to the shared pool.
+            cache (PageCache, optional): The page cache to read through. Defaults to the shared cache.
+            flights (SingleFlight, optional): The fetch deduplicator. Defaults to the shared one.
+            scheduler (OutboundScheduler, optional): The outbound scheduler. Defaults to the shared one.
+            breaker (CircuitBreaker, optional): The circuit breaker. Defaults to the shared one.
         """
-        self.scraper = cloudscraper.create_scraper()
+        self.pool = pool or get_session_pool()
+        self.cache = cache or get_page_cache()
+        self.flights = flights or get_single_flight()
+        self.scheduler = scheduler or get_scheduler()
+        self.breaker = breaker or get_circuit_breaker()
+        self.retries = int(os.environ.get('HLTV_FETCH_RETRIES', 2))
+        self.metrics = get_metrics()
+        self.archive = get_page_archive()
         
-    def html_parser(self, url):
+    def html_parser(self, url, regions=None):
         """
         Fetches the HTML content of a given URL and parses it using BeautifulSoup.
 
+        Pages are served from the page cache when a fresh enough copy is available. The cache
+        keeps each page as received, so requests needing different regions of it share a single
+        download, and each parse is kept with the page, so a page already parsed with the same or
+        more regions is not parsed again. An expired copy is revalidated with a conditional
+        request and reused without parsing again when HLTV answers `304 Not Modified`.
+        The URL fragment is ignored since it is never sent to the server. When HLTV cannot be
+        reached, an expired copy of the page is served if the cache still holds one.
+
         Args:
             url (str): The URL of the webpage to scrape.
+            regions (tuple, optional): The regions of the page to materialize, see `parse_html`.
+                                       Defaults to the whole page.
 
         Returns:
             BeautifulSoup: A BeautifulSoup object representing the parsed HTML content of the page.
+
+        Raises:
+            PageNotFound: If HLTV has no page at this URL.
+            ScraperError: If the page could not be fetched and no cached copy is available.
         """
-        response = self.scraper.get(url)
-        
-        if response.status_code != 200:
-            print(f"[ERRO] Status {response.status_code} ao acessar {url}")
-            return None
-
-        with open("/tmp/debug_page.html", "w", encoding="utf-8") as f:
-            f.write(response.text)
-            
-        return BeautifulSoup(response.text, 'html.parser')
\ No newline at end of file
+        url = urldefrag(url).url
+        get_prewarmer().record(url, regions)
+        try:
+            page = self.cache.get(url, self._load_page)
+        except PageNotFound:
+            raise
+        except ScraperError:
+            page = self.cache.fallback(url)
+            if page is None:
+                raise
+        return self._parse(url, page, regions)
+
+    def refresh(self, url, regions=None):
+        """
+        Fetches a page again and replaces its cached copy, whatever its age.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+            regions (tuple, optional): The regions of the page to materialize, see `parse_html`.
+
+        Returns:
+            BeautifulSoup: The freshly parsed page.
+        """
+        page = self._load_page(url)
+        self.cache.put(url, page)
+        return self._parse(url, page, regions)
+
+    def _load_page(self, url):
+        """
+        Fetches a page that is not in the cache.
+
+        Concurrent misses for the same URL share a single upstream fetch, whatever regions of
+        the page each of them needs.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+
+        Returns:
+            Page: The fetched page.
+        """
+        return self.flights.do(url, self._fetch_page, url)
+
+    def _fetch_page(self, url):
+        """
+        Fetches a page, retrying transient failures within the route's deadline.
+
+        Connection errors, timeouts, 429 and 5xx answers are retried with jittered exponential
+        backoff, and every failure is reported to the circuit breaker. When the page cache still
+        holds a copy of the page with validators, the request is conditional and a `304 Not
+        Modified` answer returns that copy, along with its parses, as is.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+
+        Returns:
+            Page: The fetched page.
+        """
+        route = route_of(url)
+        deadline = time.monotonic() + DEADLINES.get(route, DEFAULT_DEADLINE)
+        cached = self.cache.peek(url)
+        if cached is not None and not cached.validators:
+            cached = None
+        headers = _conditional_headers(cached.validators) if cached is not None else None
+        attempt = 0
+        while True:
+            response, error = self._request(url, deadline, headers)
+            if response is not None and response.status_code == 304 and cached is not None:
+                self.breaker.record_success()
+                transferred = cached.validators['transferred']
+                self.metrics.count_saved(route, 'not_modified', transferred)
+                cached.validators = _validators(response, transferred, cached.validators)
+                return cached
+            if response is not None and response.status_code == 200:
+                break
+            if response is not None and response.status_code == 404:
+                self.breaker.record_success()
+                raise PageNotFound(url, 404)
+
+            self.breaker.record_failure()
+            retryable = response is None or response.status_code in RETRY_STATUSES
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            if not retryable or attempt > self.retries or time.monotonic() + delay >= deadline:
+                raise error
+            print(f"[ERRO] {error}, nova tentativa em {delay:.1f}s")
+            time.sleep(delay)
+
+        self.breaker.record_success()
+        self.archive.record(url, response.content)
+        return Page(response.text, len(response.content), _validators(response, _transferred(response)))
+
+    def _parse(self, url, page, regions):
+        """
+        Parses the given regions of a page, unless a parse of them is already kept with it or
+        being made by a concurrent request.
+
+        Args:
+            url (str): The URL of the page.
+            page (Page): The page to parse.
+            regions (tuple): The regions of the page to materialize, or None for the whole page.
+
+        Returns:
+            BeautifulSoup: The parsed page.
+        """
+        def parse(html, regions):
+            start = time.perf_counter()
+            soup = parse_html(html, regions)
+            self.metrics.observe_stage('parse', route_of(url), time.perf_counter() - start)
+            return soup
+        soup = page.parse(regions, parse)
+        self.cache.charge(url, page)
+        return soup
+
+    def _request(self, url, deadline, headers=None):
+        """
+        Sends a single request, bounded by the remaining time before the deadline.
+
+        Args:
+            url (str): The URL of the webpage to scrape.
+            deadline (float): The `time.monotonic()` value by which the page must be fetched.
+            headers (dict, optional): Extra request headers, e.g. the conditional ones.
+
+        Returns:
+            tuple: The response (or None) and the error describing why it is not usable.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(url)
+        try:
+            return self._send(url, deadline, headers)
+        except BaseException:
+            # Nothing is known about HLTV, so the circuit breaker only frees the trial request
+            # it may have let through; the caller records every answer.
+            self.breaker.release_trial()
+            raise
+
+    def _send(self, url, deadline, headers):
+        # Running out of time in the local queue says nothing about HLTV, so the circuit
+        # breaker is left alone.
+        if not self.scheduler.acquire(url, deadline):
+            raise UpstreamTimeout(url)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise UpstreamTimeout(url)
+
+        route = route_of(url)
+        start = time.perf_counter()
+        try:
+            with self.pool.session(remaining) as session:
+                # Waiting for a free session uses up part of the time left.
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise UpstreamTimeout(url)
+                response = session.get(url, timeout=remaining, headers=headers)
+        except TimeoutError as error:
+            raise UpstreamTimeout(url) from error
+        except requests.Timeout:
+            self.metrics.count_upstream(route, 'timeout', 0)
+            return None, UpstreamTimeout(url)
+        except (requests.RequestException, CloudflareException) as error:
+            self.metrics.count_upstream(route, 'error', 0)
+            return None, UpstreamError(url, message=f"{type(error).__name__} ao acessar {url}")
+        finally:
+            self.metrics.observe_stage('fetch', route, time.perf_counter() - start)
+        transferred = _transferred(response)
+        self.metrics.count_upstream(route, response.status_code, transferred)
+        if transferred < len(response.content):
+            self.metrics.count_saved(route, 'compression', len(response.content) - transferred)
+        return response, UpstreamError(url, response.status_code)
+
+    def _backoff(self, attempt, response):
+        """
+        Returns how long to wait before retrying, honoring `Retry-After` when HLTV sends it.
+
+        Args:
+            attempt (int): The number of retries already made.
+            response (Response): The failed response, or None.
+
+        Returns:
+            float: The delay in seconds.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, 0.5 * 2 ** attempt)
+
+def _transferred(response):
+    # The size of the body on the wire, before it was decompressed.
+    if not response.headers.get('Content-Encoding'):
+        return len(response.content)
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        length = response.headers.get('Content-Length')
+        return int(length) if length and length.isdigit() else len(response.content)
+
+def _validators(response, transferred, previous=None):
+    # A `304` may omit the validators it confirms, they are then kept from the cached copy.
+    previous = previous or {}
+    etag = response.headers.get('ETag') or previous.get('etag')
+    last_modified = response.headers.get('Last-Modified') or previous.get('last_modified')
+    if etag is None and last_modified is None:
+        return None
+    return {'etag': etag, 'last_modified': last_modified, 'transferred': transferred}
+
+def _conditional_headers(validators):
+    headers = {}
+    if validators['etag'] is not None:
+        headers['If-None-Match'] = validators['etag']
+    if validators['last_modified'] is not None:
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
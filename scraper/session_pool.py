@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+CLEARANCE_COOKIE = 'cf_clearance'
+
+class SessionPool:
+    """
+    A thread-safe pool of CloudScraper sessions shared by every scraper in the process.
+
+    Sessions are kept alive between requests so TLS connections and Cloudflare clearance
+    cookies are reused. A session is recycled once it gets too old or has served too many
+    requests, and the replacement inherits the clearance cookies and headers of the
+    session it replaces so no new challenge has to be solved.
+
+    Attributes:
+        size (int): The maximum number of sessions alive at the same time.
+        max_age (float): The number of seconds after which a session is recycled.
+        max_uses (int): The number of requests after which a session is recycled.
+        timeout (float): The longest a borrower waits for a session by default, in seconds.
+    """
+
+    def __init__(self, size=4, max_age=1800, max_uses=500, timeout=30):
+        """
+        Initializes an empty pool; sessions are created lazily on demand.
+
+        Args:
+            size (int): The maximum number of sessions alive at the same time.
+            max_age (float): The number of seconds after which a session is recycled.
+            max_uses (int): The number of requests after which a session is recycled.
+            timeout (float): The longest a borrower waits for a session by default, in seconds.
+        """
+        self.size = size
+        self.max_age = max_age
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self._idle = []
+        self._created = 0
+        self._condition = threading.Condition()
+        self._counters = OrderedDict([
+            ('hits', 0),
+            ('misses', 0),
+            ('waits', 0),
+            ('timeouts', 0),
+            ('recycled', 0),
+            ('challenges_solved', 0),
+            ('requests', 0)
+        ])
+
+    @contextmanager
+    def session(self, timeout=None):
+        """
+        Borrows a session from the pool for the duration of a `with` block.
+
+        Args:
+            timeout (float, optional): The longest to wait for a session, in seconds.
+                                       Defaults to the `timeout` of the pool.
+
+        Yields:
+            CloudScraper: A session that is not used by any other thread until it is released.
+
+        Raises:
+            TimeoutError: No session was released in time.
+        """
+        entry = self._acquire(self.timeout if timeout is None else timeout)
+        clearance = entry['session'].cookies.get(CLEARANCE_COOKIE)
+        try:
+            yield entry['session']
+        finally:
+            entry['uses'] += 1
+            solved = entry['session'].cookies.get(CLEARANCE_COOKIE) not in (None, clearance)
+            self._release(entry, solved)
+
+    def prefill(self, count=None):
+        """
+        Creates idle sessions ahead of the first requests, so those do not pay for it.
+
+        Args:
+            count (int, optional): The number of sessions that should be alive. Defaults to `size`.
+
+        Returns:
+            int: The number of sessions created.
+        """
+        count = self.size if count is None else min(count, self.size)
+        created = 0
+        while True:
+            with self._condition:
+                if self._created >= count:
+                    return created
+                self._created += 1
+            try:
+                entry = self._new_entry()
+            except Exception:
+                with self._condition:
+                    self._created -= 1
+                    self._condition.notify()
+                raise
+            self._release(entry, False)
+            created += 1
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool counters.
+
+        Returns:
+            OrderedDict: Hit/miss counts, challenge solves and current pool occupancy.
+        """
+        with self._condition:
+            stats = OrderedDict(self._counters)
+            stats['size'] = self.size
+            stats['alive'] = self._created
+            stats['idle'] = len(self._idle)
+        return stats
+
+    def _acquire(self, timeout):
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._counters['hits'] += 1
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    self._counters['misses'] += 1
+                    entry = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters['timeouts'] += 1
+                    raise TimeoutError('Nenhuma sessão livre no pool')
+                self._counters['waits'] += 1
+                self._condition.wait(remaining)
+            self._counters['requests'] += 1
+
+        try:
+            if entry is None:
+                return self._new_entry()
+            if self._expired(entry):
+                return self._recycle(entry)
+            return entry
+        except Exception:
+            # The slot taken above is given back so the next borrower does not wait for it.
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, entry, solved):
+        with self._condition:
+            if solved:
+                self._counters['challenges_solved'] += 1
+            self._idle.append(entry)
+            self._condition.notify()
+
+    def _expired(self, entry):
+        return (entry['uses'] >= self.max_uses
+                or time.monotonic() - entry['created'] >= self.max_age)
+
+    def _recycle(self, entry):
+        old_session = entry['session']
+        try:
+            new_entry = self._new_entry()
+        finally:
+            old_session.close()
+        new_entry['session'].headers.update(old_session.headers)
+        new_entry['session'].cookies.update(old_session.cookies)
+        with self._condition:
+            self._counters['recycled'] += 1
+        return new_entry
+
+    def _new_entry(self):
+        import cloudscraper
+        from urllib3.util.request import ACCEPT_ENCODING
+        session = cloudscraper.create_scraper()
+        session.headers['Connection'] = 'keep-alive'
+        # Every encoding urllib3 can decode: gzip and deflate, plus br and zstd when the
+        # brotli and zstandard packages are installed.
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        return {
+            'session': session,
+            'created': time.monotonic(),
+            'uses': 0
+        }
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_session_pool():
+    """
+    Returns the process-wide session pool, creating it on first use.
+
+    The pool is configured through the `HLTV_POOL_SIZE`, `HLTV_POOL_MAX_AGE`,
+    `HLTV_POOL_MAX_USES` and `HLTV_POOL_TIMEOUT` environment variables.
+
+    Returns:
+        SessionPool: The shared session pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SessionPool(
+                    size=int(os.environ.get('HLTV_POOL_SIZE', 4)),
+                    max_age=float(os.environ.get('HLTV_POOL_MAX_AGE', 1800)),
+                    max_uses=int(os.environ.get('HLTV_POOL_MAX_USES', 500)),
+                    timeout=float(os.environ.get('HLTV_POOL_TIMEOUT', 30))
+                )
+    return _pool
@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls sharing the same key.
+
+    The first caller for a key runs the function; callers arriving while it is in flight
+    wait for it and receive the same result (or the same exception) instead of running it again.
+    """
+
+    def __init__(self):
+        """
+        Initializes the SingleFlight instance with no calls in flight.
+        """
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('calls', 0),
+            ('executed', 0),
+            ('coalesced', 0)
+        ])
+
+    def do(self, key, fn, *args):
+        """
+        Runs `fn(*args)` unless a call for the same key is already in flight.
+
+        Args:
+            key (hashable): The key identifying the call, usually a URL.
+            fn (callable): The function to run.
+            *args: The arguments passed to the function.
+
+        Returns:
+            object: The result of the call, shared by every concurrent caller.
+        """
+        with self._lock:
+            self._counters['calls'] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._counters['coalesced'] += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self._counters['executed'] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """
+        Returns a snapshot of the coalescing counters.
+
+        Returns:
+            OrderedDict: The number of calls, executed calls, coalesced calls and calls in flight.
+        """
+        with self._lock:
+            stats = OrderedDict(self._counters)
+            stats['in_flight'] = len(self._calls)
+        return stats
+
+_flights = SingleFlight()
+
+def get_single_flight():
+    """
+    Returns the process-wide SingleFlight used for upstream fetches.
+
+    Returns:
+        SingleFlight: The shared SingleFlight instance.
+    """
+    return _flights
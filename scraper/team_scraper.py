@@ -1,4 +1,7 @@
 from collections import OrderedDict
+from scraper.document import DocumentContext
+from scraper.extraction import Schema, attr, every, first, own, text
+from scraper.models import Coach, Player, Ranking, Team, Trophy
 from scraper.scraper import Scraper
 
 class TeamScraper:
@@ -10,16 +13,46 @@ class TeamScraper:
         team_name (str): The name of the team.
         url (str): The URL to the team page on HLTV.
         scraper_instance (Scraper): An instance of the Scraper class to fetch and parse the HTML.
+        document (DocumentContext): The pages fetched for the current request, each parsed once.
 
     Methods:
-        get_team_info(): Scrapes and returns the team information, including name, logo, players, rankings, coach, and trophies.
-        _get_team_name(soup): Extracts the team name from the parsed HTML.
-        _get_team_logo(soup): Extracts the team logo URL from the parsed HTML.
-        _get_players(soup): Extracts information about the players, including nickname, flag, image, and title.
-        _get_rankings(soup): Extracts the team Valve and HLTV rankings.
-        _get_coach(soup): Extracts the coach nickname and flag.
-        _get_trophies(soup): Extracts information about the team's trophies, including title, image, and URL.
+        get_team_info(fields): Scrapes and returns the team information, including name, logo, players, rankings, coach, and trophies.
+        _get_players(page): Builds the players, including nickname, flag, image, and title.
+        _get_rankings(page): Builds the team Valve and HLTV rankings.
+        _get_coach(page): Builds the coach nickname and flag.
+        _get_trophies(page): Builds the team's trophies, including title, image, and URL.
     """
+    SCHEMA = Schema({
+        'name': first(('h1', 'class', 'profile-team-name'), default='Unknown'),
+        'image': first(('img', 'class', 'teamlogo'), get=attr('src'), default='Unknown'),
+        'players': first(('div', 'class', 'bodyshot-team'), then=every(('a', 'class', 'col-custom'), fields={
+            'nickname': first(('div', 'class', 'playerFlagName'), then=first(('span', 'class', 'bold'))),
+            'flag': first(('img', 'class', 'flag'), get=attr('src')),
+            'image': first(('img', 'class', 'bodyshot-team-img'), get=attr('src')),
+            'title': first(('img', 'class', 'bodyshot-team-img'), get=attr('title'))
+        }), default=[]),
+        'valve_ranking': first(('div', 'class', 'profile-team-stat'), then=first(('a', 'href', True))),
+        'hltv_ranking': first(('div', 'class', 'profile-team-stat'), then=first(('a', 'href', True)), nth=1),
+        'coach': first(('div', 'class', 'profile-team-stats-container'), then=first(('a', 'class', 'a-reset'), fields={
+            'nickname': first(('span', 'class', 'bold a-default'), get=lambda tag: text(tag).strip("'")),
+            'flag': first(('img', 'class', 'flag'), get=attr('src'))
+        })),
+        'trophies': first(('div', 'class', 'trophyRow'), then=every(('a', 'class', 'trophy'), fields={
+            'url': own(attr('href')),
+            'title': first(('span', 'class', 'trophyDescription'), get=attr('title')),
+            'image': first(('img', 'class', 'trophyIcon'), get=attr('src'))
+        }), default=[])
+    }, name='team')
+    REGIONS = SCHEMA.regions
+    FIELDS = OrderedDict([
+        ('name', ('name',)),
+        ('image', ('image',)),
+        ('players', ('players',)),
+        ('ranking', ('valve_ranking', 'hltv_ranking')),
+        ('coach', ('coach',)),
+        ('trophies', ('trophies',))
+    ])
+
     def __init__(self, team_id, team_name):
         """
         Initializes the TeamScraper instance with a team ID and team name.
@@ -32,160 +65,129 @@ class TeamScraper:
         self.team_name = team_name
         self.url = f"https://www.hltv.org/team/{team_id}/{team_name}"
         self.scraper_instance = Scraper()
+        self.document = DocumentContext(self.scraper_instance)
 
-    def get_team_info(self):
+    def get_team_info(self, fields=None):
         """
         Scrapes and returns the team's information from the HLTV website.
 
-        Returns:
-            OrderedDict: A dictionary containing the team's name, logo, players, rankings, coach, and trophies.
-        """
-        soup = self.scraper_instance.html_parser(self.url)
-        team_info = OrderedDict([
-            ('name', self._get_team_name(soup)),
-            ('image', self._get_team_logo(soup)),
-            ('players', self._get_players(soup)),
-            ('ranking', self._get_rankings(soup)),
-            ('coach', self._get_coach(soup)),
-            ('trophies', self._get_trophies(soup))
-        ])
-
-        return team_info
-    
-    def _get_team_name(self, soup):
-        """
-        Extracts the team name from the parsed HTML.
-
         Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+            fields (tuple, optional): The response fields to return, among `FIELDS`. Only the
+                                      regions of the page they come from are parsed and only
+                                      their extractors run. Defaults to all of them.
 
         Returns:
-            str: The team name, or 'Unknown' if the name is not found.
-        """
-        team_name_element = soup.find('h1', class_='profile-team-name')
-        return team_name_element.text.strip() if team_name_element else 'Unknown'
-    
-    def _get_team_logo(self, soup):
-        """
-        Extracts the team logo URL from the parsed HTML.
+            Team: The team's name, logo, players, rankings, coach, and trophies, or an
+                  OrderedDict of the requested fields when `fields` is given.
+        """
+        schema = self.SCHEMA.select(fields, self.FIELDS)
+        soup = self.document.html_parser(self.url, schema.regions)
+        page = schema.extract(soup)
+        builders = OrderedDict([
+            ('name', lambda: page['name']),
+            ('image', lambda: page['image']),
+            ('players', lambda: self._get_players(page)),
+            ('ranking', lambda: self._get_rankings(page)),
+            ('coach', lambda: self._get_coach(page)),
+            ('trophies', lambda: self._get_trophies(page))
+        ])
+        if fields is not None:
+            return OrderedDict((field, build()) for field, build in builders.items() if field in fields)
 
-        Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+        team_info = Team(**{field: build() for field, build in builders.items()})
 
-        Returns:
-            str: The team logo URL, or 'Unknown' if the logo is not found.
-        """
-        team_logo_element = soup.find('img', class_='teamlogo')
-        return team_logo_element['src'] if team_logo_element else 'Unknown'
-    
-    def _get_players(self, soup):
+        return team_info
+
+    def _get_players(self, page):
         """
-        Extracts information about the players, including nickname, flag, image, and title.
+        Builds the players, including nickname, flag, image, and title.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+            page (dict): The fields extracted from the team's page.
 
         Returns:
-            list: A list of dictionaries containing player information (nickname, flag, image, title).
+            list: A list of Player objects (nickname, flag, image, title).
         """
         players = []
-        player_containers = soup.find_all('div', class_='bodyshot-team')[0].find_all('a', class_='col-custom')
-        for player_container in player_containers:
-            player_nick = player_container.find('div', class_='playerFlagName').find('span', class_='bold')
-            player_flag = player_container.find('img', class_='flag')
-            player_image = player_container.find('img', class_='bodyshot-team-img')
-            if player_nick and player_flag and player_image:
-                players.append({
-                    'nickname': player_nick.text.strip(),
-                    'flag': "https://www.hltv.org" + player_flag['src'],
-                    'image': player_image['src'],
-                    'title': player_image['title']
-                })
+        for player in page['players']:
+            if player['nickname'] is not None and player['flag'] is not None and player['image'] is not None:
+                players.append(Player(
+                    nickname=player['nickname'],
+                    flag="https://www.hltv.org" + player['flag'],
+                    image=player['image'],
+                    title=player['title']
+                ))
             else:
-                players.append({
-                    'nickname': 'Unknown',
-                    'flag': 'Unknown',
-                    'image': 'Unknown',
-                    'title': 'Unknown'
-                })
+                players.append(Player(
+                    nickname='Unknown',
+                    flag='Unknown',
+                    image='Unknown',
+                    title='Unknown'
+                ))
         
         return players
         
-    def _get_rankings(self, soup):
+    def _get_rankings(self, page):
         """
-        Extracts the team's Valve and HLTV rankings from the parsed HTML.
+        Builds the team's Valve and HLTV rankings.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+            page (dict): The fields extracted from the team's page.
 
         Returns:
-            dict: A dictionary containing the Valve and HLTV rankings.
+            Ranking: The Valve and HLTV rankings.
         """
-        valve_ranking_element = soup.find('div', class_='profile-team-stat').find('a', href=True)
-        hltv_ranking_element = soup.find_all('div', class_='profile-team-stat')[1].find('a', href=True)
-
-        valve_ranking = valve_ranking_element.text.strip() if valve_ranking_element else None
-        hltv_ranking = hltv_ranking_element.text.strip() if hltv_ranking_element else None
-        
-        return {
-            'valve_ranking': valve_ranking,
-            'hltv_ranking': hltv_ranking
-        }
+        return Ranking(
+            valve_ranking=page['valve_ranking'],
+            hltv_ranking=page['hltv_ranking']
+        )
         
-    def _get_coach(self, soup):
+    def _get_coach(self, page):
         """
-        Extracts the coach's nickname and flag from the parsed HTML.
+        Builds the coach's nickname and flag.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+            page (dict): The fields extracted from the team's page.
 
         Returns:
-            dict: A dictionary containing the coach's nickname and flag.
-        """
-        coach_element = soup.find('div', class_='profile-team-stats-container').find('a', class_='a-reset')
-        if coach_element:
-            coach_name = coach_element.find('span', class_='bold a-default')
-            coach_flag = coach_element.find('img', class_='flag')
-            if coach_name and coach_flag:
-                return {
-                    'nickname': coach_name.text.strip().strip("'"),
-                    'flag': "https://www.hltv.org" + coach_flag['src']
-                }
+            Coach: The coach's nickname and flag.
+        """
+        coach = page['coach']
+        if coach and coach['nickname'] is not None and coach['flag'] is not None:
+            return Coach(
+                nickname=coach['nickname'],
+                flag="https://www.hltv.org" + coach['flag']
+            )
                 
-        return {
-            'nickname': 'Unknown',
-            'flag': 'Unknown'
-        }
+        return Coach(
+            nickname='Unknown',
+            flag='Unknown'
+        )
         
-    def _get_trophies(self, soup):
+    def _get_trophies(self, page):
         """
-        Extracts information about the team's trophies, including title, image, and URL.
+        Builds the team's trophies, including title, image, and URL.
 
         Args:
-            soup (BeautifulSoup): The parsed HTML of the team's page.
+            page (dict): The fields extracted from the team's page.
 
         Returns:
-            list: A list of dictionaries containing trophy information (title, image, URL).
+            list: A list of Trophy objects (title, image, URL).
         """
-        trophy_containers = soup.find_all('div', class_='trophyRow')
         trophies = []
         
-        for trophy_container in trophy_containers[0].find_all('a', class_='trophy'):
-            trophy_url = trophy_container['href']
-            trophy_title = trophy_container.find('span', class_='trophyDescription')['title']
-            trophy_image = trophy_container.find('img', class_='trophyIcon')['src']
-                
-            if trophy_title and trophy_image:
-                trophies.append({
-                    'title': trophy_title,
-                    'image': trophy_image,
-                    'url': f"https://www.hltv.org{trophy_url}"
-                })
+        for trophy in page['trophies']:
+            if trophy['title'] and trophy['image']:
+                trophies.append(Trophy(
+                    title=trophy['title'],
+                    image=trophy['image'],
+                    url=f"https://www.hltv.org{trophy['url']}"
+                ))
             else:
-                trophies.append({
-                    'title': 'Unknown',
-                    'image': 'Unknown',
-                    'url': 'Unknown'
-                })
+                trophies.append(Trophy(
+                    title='Unknown',
+                    image='Unknown',
+                    url='Unknown'
+                ))
     
         return trophies
\ No newline at end of file
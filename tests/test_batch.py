@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+from unittest import mock
+from scraper.batch import parse_batch_items, run_batch
+from scraper.page_cache import Page, PageCache, watch_stale_pages
+
+URL = 'https://www.hltv.org/team/5995/g2'
+
+class MemoryStore:
+    """
+    Keeps the saved entities in a dict in place of SQLite.
+    """
+
+    def __init__(self):
+        self.saved = {}
+
+    def load(self, kind, item_id):
+        return None
+
+    def save(self, kind, item_id, name, data):
+        self.saved[item_id] = data
+
+class CachedScraper:
+    """
+    Scrapes items, the odd ones from an expired copy of a page.
+    """
+
+    expired = PageCache(max_stale_ttl=0)
+
+    def __init__(self, item_id, item_name):
+        self.item_id = item_id
+        self.item_name = item_name
+
+    async def get_team_info(self):
+        if self.item_id % 2:
+            self.expired.fallback(URL)
+        return {'name': self.item_name}
+
+class BatchStoreTest(unittest.TestCase):
+    """
+    Checks that only the items scraped from fresh pages are persisted.
+    """
+
+    def test_stale_items_are_not_saved(self):
+        CachedScraper.expired.put(URL, Page('<html></html>', 13))
+        store = MemoryStore()
+
+        async def scrape():
+            request_stale = watch_stale_pages()
+            results = await run_batch(CachedScraper, 'get_team_info', [(1, 'a'), (2, 'b')], 'Team not found', kind='team')
+            return results, request_stale
+
+        with mock.patch('scraper.batch.get_entity_store', return_value=store):
+            results, request_stale = asyncio.run(scrape())
+
+        self.assertEqual([result['data'] for result in results], [{'name': 'a'}, {'name': 'b'}])
+        self.assertEqual(list(store.saved), [2])
+        self.assertEqual(request_stale, {URL})
+
+class BatchItemsTest(unittest.TestCase):
+    """
+    Checks the validation of the body of a batch request.
+    """
+
+    def test_slugs_are_accepted(self):
+        self.assertEqual(
+            parse_batch_items([[5995, 'g2'], {'id': 7524, 'name': 'perfect-world-shanghai-major-2024'}]),
+            [(5995, 'g2'), (7524, 'perfect-world-shanghai-major-2024')]
+        )
+
+    def test_names_leaving_the_path_segment_are_rejected(self):
+        for name in ('g2/../../admin', 'g2?offset=100', 'g2#top', '', 'g 2', '%2F'):
+            with self.subTest(name=name):
+                self.assertIsNone(parse_batch_items([[5995, name]]))
+
+    def test_negative_ids_are_rejected(self):
+        self.assertIsNone(parse_batch_items([[-1, 'g2']]))
+
+if __name__ == '__main__':
+    unittest.main()
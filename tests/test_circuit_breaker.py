@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.errors import UpstreamTimeout
+from scraper.scraper import Scraper
+
+URL = 'https://www.hltv.org/team/5995/g2'
+
+class FullScheduler:
+    """
+    Never lets a request out of the local queue before its deadline.
+    """
+
+    def acquire(self, url, deadline):
+        return False
+
+class BrokenPool:
+    """
+    Fails before a session is handed out.
+    """
+
+    def session(self, deadline=None):
+        raise RuntimeError('no session')
+
+def _open_breaker():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.record_failure()
+    return breaker
+
+class CircuitBreakerTrialTest(unittest.TestCase):
+    """
+    Checks that a trial request ending without an answer from HLTV does not keep the
+    circuit half-open.
+    """
+
+    def test_trial_timed_out_in_queue_is_released(self):
+        breaker = _open_breaker()
+        scraper = Scraper(scheduler=FullScheduler(), breaker=breaker)
+
+        with self.assertRaises(UpstreamTimeout):
+            scraper._request(URL, time.monotonic() + 1)
+        self.assertEqual(breaker.state(), 'half-open')
+        self.assertTrue(breaker.allow())
+
+    def test_trial_failed_locally_is_released(self):
+        breaker = _open_breaker()
+        scraper = Scraper(pool=BrokenPool(), breaker=breaker)
+
+        with self.assertRaises(RuntimeError):
+            scraper._request(URL, time.monotonic() + 1)
+        self.assertTrue(breaker.allow())
+
+    def test_release_keeps_other_threads_trial(self):
+        breaker = _open_breaker()
+        self.assertTrue(breaker.allow())
+        thread = threading.Thread(target=breaker.release_trial)
+        thread.start()
+        thread.join()
+
+        self.assertFalse(breaker.allow())
+        breaker.release_trial()
+        self.assertTrue(breaker.allow())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import threading
+import unittest
+from scraper.entity_store import EntityStore
+from scraper.models import Event, Location
+
+EVENT = Event(
+    title='PGL Major Copenhagen 2024',
+    date='Mar 21st - Mar 31st 2024',
+    prize_pool='$1,250,000',
+    teams='24',
+    location=Location(flag='/img/static/flags/30x20/DK.gif', location='Copenhagen, Denmark', type='LAN')
+)
+
+class CountingStore(EntityStore):
+    """
+    Counts the connections opened to the database.
+    """
+
+    opened = 0
+
+    def _connect(self):
+        self.opened += 1
+        return super()._connect()
+
+class EntityStoreConnectionTest(unittest.TestCase):
+    """
+    Checks that the connections to the database are shared by the threads using the store.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = CountingStore(os.path.join(directory.name, 'hltv.db'), max_age=60)
+
+    def test_threads_reuse_connections(self):
+        self.store.save_event(7148, 'pgl-major-copenhagen-2024', EVENT)
+        loaded = []
+        for _ in range(20):
+            thread = threading.Thread(target=lambda: loaded.append(self.store.load_event(7148)))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(loaded, [EVENT] * 20)
+        self.assertEqual(self.store.opened, 1)
+        self.assertEqual(self.store.stats()['errors'], 0)
+
+    def test_idle_connections_are_capped(self):
+        self.store.max_idle = 1
+        self.store.save_event(7148, 'pgl-major-copenhagen-2024', EVENT)
+        barrier = threading.Barrier(4)
+        def read(connection):
+            barrier.wait()
+            return connection.execute('SELECT title FROM events').fetchone()['title']
+
+        threads = [threading.Thread(target=self.store._read, args=(read,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.store.opened, 4)
+        self.assertEqual(len(self.store._idle), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import os
+import unittest
+from scraper.document import DocumentContext
+from scraper.event_match_scraper import EventMatchScraper
+from scraper.parsers import PARSER_BACKENDS, parse_html
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+LISTING = 'https://www.hltv.org/results?event=7524'
+NEXT_PAGE = 'https://www.hltv.org/results?offset=3&event=7524'
+
+class ListingScraper:
+    """
+    Serves the recorded pages of an event's results listing in place of HLTV.
+    """
+
+    def __init__(self, backend, pages):
+        self.backend = backend
+        self.pages = pages
+        self.fetched = []
+
+    def html_parser(self, url, regions=None):
+        self.fetched.append(url)
+        with open(os.path.join(FIXTURES, self.pages[url]), encoding='utf-8') as f:
+            return parse_html(f.read(), regions, self.backend)
+
+def _scraper(backend, pages):
+    scraper = EventMatchScraper(7524, 'perfect-world-shanghai-major-2024')
+    scraper.document = DocumentContext(ListingScraper(backend, pages))
+    return scraper
+
+class EventMatchListingTest(unittest.TestCase):
+    """
+    Lists the matches of an event from the recorded pages of the results listing.
+    """
+
+    def test_follows_pagination(self):
+        pages = {LISTING: 'results.html', NEXT_PAGE: 'results_offset.html'}
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                scraper = _scraper(backend, pages)
+                matches = scraper._get_matches()
+
+                self.assertEqual(scraper.document.scraper_instance.fetched, [LISTING, NEXT_PAGE])
+                self.assertEqual([match['id'] for match in matches], [2377734, 2377733, 2377732, 2377731, 2377730])
+                self.assertEqual(matches[0]['name'], 'g2-vs-faze-perfect-world-shanghai-major-2024')
+                self.assertEqual(matches[0]['final_after'], 1734256800 + EventMatchScraper.FINAL_AFTER)
+
+    def test_unknown_start_is_not_final(self):
+        pages = {LISTING: 'results.html', NEXT_PAGE: 'results_offset.html'}
+        matches = _scraper('html.parser', pages)._get_matches()
+
+        self.assertIsNone(matches[-1]['final_after'])
+
+if __name__ == '__main__':
+    unittest.main()
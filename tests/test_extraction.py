@@ -0,0 +1,84 @@
+import json
+import os
+import unittest
+from benchmarks.run import ENDPOINTS
+from benchmarks.upstream import FIXTURE_PAGES, FIXTURES_DIR
+from scraper.document import DocumentContext
+from scraper.extraction import Schema, every, first
+from scraper.metrics import get_metrics
+from scraper.parsers import PARSER_BACKENDS, parse_html
+from scraper.rate_limiter import route_of
+from utils.response_cache import serialize
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'fixtures', 'extraction_baseline.json')
+
+class FixtureScraper:
+    """
+    Serves the benchmark fixtures in place of HLTV, parsed with a given backend.
+    """
+
+    def __init__(self, backend, pages=None):
+        self.backend = backend
+        self.pages = pages or {}
+
+    def html_parser(self, url, regions=None):
+        route = route_of(url)
+        html = self.pages.get(route)
+        if html is None:
+            html = _fixture(route)
+        return parse_html(html, regions, self.backend)
+
+def _fixture(route):
+    with open(os.path.join(FIXTURES_DIR, FIXTURE_PAGES[route][0]), encoding='utf-8') as f:
+        return f.read()
+
+def _scrape(endpoint, backend, pages=None):
+    scraper_class, args, method = ENDPOINTS[endpoint]
+    scraper = scraper_class(*args)
+    scraper.document = DocumentContext(FixtureScraper(backend, pages))
+    scraper.scraper_instance = scraper.document.scraper_instance
+    return json.loads(serialize(getattr(scraper, method)()))
+
+class ExtractionTest(unittest.TestCase):
+    """
+    Compares the schema extraction with the output of the `find` based extractors it replaced,
+    recorded on the benchmark fixtures in `fixtures/extraction_baseline.json`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(BASELINE, encoding='utf-8') as f:
+            cls.baseline = json.load(f)
+
+    def test_fixtures_match_baseline(self):
+        for backend in PARSER_BACKENDS:
+            for endpoint in ('team', 'matches', 'events', 'result'):
+                with self.subTest(backend=backend, endpoint=endpoint):
+                    self.assertEqual(_scrape(endpoint, backend), self.baseline[endpoint])
+
+    def test_team_found_by_exact_href(self):
+        # The team link of the lineup is absolute; the old `find('a', href=...)` found it anyway.
+        page = _fixture('matches').replace(
+            '<a href="/team/5995/g2" class="text-ellipsis team1">G2</a>',
+            '<a href="https://www.hltv.org/team/5995/g2" class="text-ellipsis team1"><div class="teamName">G2</div></a>'
+        )
+        for backend in PARSER_BACKENDS:
+            with self.subTest(backend=backend):
+                result = _scrape('result', backend, {'matches': page})
+                self.assertEqual(result, self.baseline['result_exact_href'])
+
+    @unittest.skipUnless(get_metrics().enabled, 'metrics are disabled by HLTV_METRICS')
+    def test_top_level_rules_are_timed(self):
+        schema = Schema({
+            'title': first(('h1', 'class', 'title')),
+            'links': every(('a', 'href', True), fields={'name': first(('span', None, None))})
+        }, name='test_schema')
+        soup = parse_html('<h1 class="title">T</h1><a href="/x"><span>X</span></a>', schema.regions)
+
+        self.assertEqual(schema.extract(soup), {'title': 'T', 'links': [{'name': 'X'}]})
+        rendered = '\n'.join(get_metrics().extractors.render())
+        for label in ('test_schema', 'test_schema.title', 'test_schema.links'):
+            self.assertIn(f'hltv_extractor_duration_seconds_count{{extractor="{label}"}}', rendered)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from scraper.page_cache import Page, PageCache
+from scraper.parsers import parse_html
+
+HTML = '<div class="a"><span>A</span></div><div class="b"><span>B</span></div>'
+REGIONS = (('div', 'class', 'a'),)
+
+class PageParseTest(unittest.TestCase):
+    """
+    Checks that each parse of a cached page is made once, however many requests need it.
+    """
+
+    def test_concurrent_parses_are_coalesced(self):
+        page = Page(HTML, len(HTML))
+        calls = []
+        def parse(html, regions):
+            calls.append(regions)
+            time.sleep(0.05)
+            return parse_html(html, regions)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(page.parse(REGIONS, parse)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(calls, [REGIONS])
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_wider_parse_stands_in(self):
+        page = Page(HTML, len(HTML))
+        whole = page.parse(None, parse_html)
+
+        self.assertIs(page.parse(REGIONS, lambda html, regions: self.fail('parsed again')), whole)
+
+    def test_failed_parse_is_retried(self):
+        page = Page(HTML, len(HTML))
+        def fail(html, regions):
+            raise ValueError('broken')
+
+        with self.assertRaises(ValueError):
+            page.parse(None, fail)
+        self.assertEqual(page.parse(None, parse_html).span.text, 'A')
+
+class PageCacheBudgetTest(unittest.TestCase):
+    """
+    Checks that the parses kept with the cached pages count against the cache's budget.
+    """
+
+    def test_kept_parses_are_charged(self):
+        cache = PageCache(max_bytes=10 ** 6)
+        page = Page(HTML, len(HTML))
+        cache.put('https://www.hltv.org/team/1/a', page)
+        page.parse(None, parse_html)
+        cache.charge('https://www.hltv.org/team/1/a', page)
+
+        self.assertGreater(page.parsed_size, 0)
+        self.assertEqual(cache.stats()['bytes'], len(HTML) + page.parsed_size)
+        cache.invalidate('https://www.hltv.org/team/1/a')
+        self.assertEqual(cache.stats()['bytes'], 0)
+
+    def test_parses_evict_older_pages(self):
+        probe = Page(HTML, len(HTML))
+        probe.parse(None, parse_html)
+        # Room for one parsed page, not for another page next to it.
+        cache = PageCache(max_bytes=len(HTML) + probe.parsed_size + len(HTML) // 2)
+        old, parsed = Page(HTML, len(HTML)), Page(HTML, len(HTML))
+        cache.put('https://www.hltv.org/team/1/a', old)
+        cache.put('https://www.hltv.org/team/2/b', parsed)
+        parsed.parse(None, parse_html)
+        cache.charge('https://www.hltv.org/team/2/b', parsed)
+
+        self.assertIsNone(cache.peek('https://www.hltv.org/team/1/a'))
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import time
+import unittest
+from scraper.circuit_breaker import CircuitBreaker
+from scraper.errors import UpstreamTimeout
+from scraper.scraper import Scraper
+from scraper.session_pool import SessionPool
+
+class FakeSession:
+    """
+    Stands in for a CloudScraper session.
+    """
+
+    def __init__(self):
+        self.headers = {}
+        self.cookies = {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+class FlakyPool(SessionPool):
+    """
+    Creates fake sessions, failing while `broken` is set.
+    """
+
+    broken = False
+
+    def _new_entry(self):
+        if self.broken:
+            raise RuntimeError('cloudscraper failed')
+        return {'session': FakeSession(), 'created': time.monotonic(), 'uses': 0}
+
+class OpenScheduler:
+    """
+    Lets every request out of the local queue at once.
+    """
+
+    def acquire(self, url, deadline):
+        return True
+
+class SessionPoolTest(unittest.TestCase):
+    """
+    Checks that a borrower never waits for a session slot lost to a failure.
+    """
+
+    def test_failed_recycle_frees_the_slot(self):
+        pool = FlakyPool(size=1, max_uses=1)
+        with pool.session() as first:
+            pass
+        pool.broken = True
+        with self.assertRaises(RuntimeError):
+            with pool.session():
+                pass
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['alive'], 0)
+
+        pool.broken = False
+        with pool.session(timeout=1) as session:
+            self.assertIsNot(session, first)
+
+    def test_wait_is_bounded(self):
+        pool = FlakyPool(size=1)
+        with pool.session():
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                with pool.session(timeout=0.05):
+                    pass
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_request_waits_until_its_deadline(self):
+        pool = FlakyPool(size=1)
+        scraper = Scraper(pool=pool, scheduler=OpenScheduler(), breaker=CircuitBreaker())
+        with pool.session():
+            start = time.monotonic()
+            with self.assertRaises(UpstreamTimeout):
+                scraper._request('https://www.hltv.org/team/5995/g2', start + 0.05)
+        self.assertLess(time.monotonic() - start, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import threading
+import time
+import unittest
+from scraper.async_scraper import AsyncMatchScraper
+
+FETCH_SECONDS = 0.15
+
+class SlowDocument:
+    """
+    Fetches every match page in a worker thread in `FETCH_SECONDS`, recording the peak concurrency.
+    """
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    async def fetch(self, url, regions=None):
+        if '/matches/' not in url:
+            return None
+        await asyncio.get_running_loop().run_in_executor(None, self._fetch)
+
+    def _fetch(self):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(FETCH_SECONDS)
+        with self.lock:
+            self.running -= 1
+
+class SlowMatchScraper(AsyncMatchScraper):
+    """
+    Lists four matches whose pages take `FETCH_SECONDS` each to fetch.
+    """
+
+    def _get_match_urls(self, soup, limit=None):
+        return [
+            {'match_url': f'https://www.hltv.org/matches/{match_id}/x', 'team1_url': '/team/1/a', 'team2_url': '/team/2/b'}
+            for match_id in range(4)
+        ]
+
+    def get_details(self, match_url, team1, team2):
+        return match_url
+
+class UpcomingMatchesDeadlineTest(unittest.TestCase):
+    """
+    Checks that the match pages fetched for the upcoming matches share a single deadline.
+    """
+
+    def test_matches_share_one_deadline(self):
+        scraper = SlowMatchScraper(5995, 'g2')
+        scraper.document = SlowDocument()
+        scraper.concurrency = 2
+        scraper.timeout = FETCH_SECONDS * 1.5
+
+        async def scrape():
+            start = time.monotonic()
+            matches = await scraper.get_upcoming_matches()
+            return matches, time.monotonic() - start
+
+        matches, elapsed = asyncio.run(scrape())
+
+        # Two pages fit before the deadline, the other two are given up on when it passes.
+        self.assertEqual([match.details is not None for match in matches], [True, True, False, False])
+        self.assertLess(elapsed, FETCH_SECONDS * 2)
+        self.assertEqual(scraper.document.peak, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,21 @@
 import re
-from collections import OrderedDict
+from scraper.extraction import Schema, attr, every, first, own
+from scraper.models import MatchDetails, MatchTeam
+
+MATCH_PAGE_FIELDS = {
+    'date': first(('div', 'class', 'date'), default='Unknown'),
+    'time': first(('div', 'class', 'time'), default='Unknown'),
+    # Teams are looked up by the exact href of their link, wherever it is. Only the links to
+    # team pages are parsed for it; other links are found when another region holds them.
+    'teams': every(('a', 'href', True), region=('a', 'href^', '/team/'), fields={
+        'url': own(attr('href')),
+        'name': first(('div', 'class', 'teamName'), default='Unknown'),
+        'logo': first(('img', 'class', 'logo'), get=attr('src'))
+    }),
+    'match_format': first(('div', 'class', 'padding preformatted-text'))
+}
+MATCH_PAGE_SCHEMA = Schema(MATCH_PAGE_FIELDS, name='match')
+MATCH_PAGE_REGIONS = MATCH_PAGE_SCHEMA.regions
 
 def get_match_details(scraper_instance, match_url, team1, team2):
     """
@@ -9,129 +25,81 @@ def get_match_details(scraper_instance, match_url, team1, team2):
     date, time, and details of the participating teams.
 
     Args:
+        scraper_instance (Scraper | DocumentContext): Source of the parsed pages. Passing the
+            request's DocumentContext reuses a match page that was already parsed.
         match_url (str): URL of the match.
         team1 (str): URL of the first participating team.
         team2 (str): URL of the second participating team.
 
     Returns:
-        dict: A dictionary containing the match details, including:
+        MatchDetails: The match details, including:
         - 'time': The match time.
         - 'date': The match date.
         - 'team1': Details of the first team (name and logo).
         - 'team2': Details of the second team (name and logo).
         - 'match_format': The match format (LAN or Online).
     """
-    soup = scraper_instance.html_parser(match_url)
-    match_details = OrderedDict()
-
-    match_details['date'] = _get_date(soup)
-    match_details['time'] = _get_time(soup)
-    match_details['team1'] = _get_team1_details(soup, team1)
-    match_details['team2'] = _get_team2_details(soup, team2)
-    match_details['match_format'] = _get_match_format(soup)
-
-    return match_details
-    
-def _get_date(soup):
-    """
-    Extracts the match date from the HTML.
-
-    Args:
-       soup (BeautifulSoup): Parsed HTML of the match details page.
+    soup = scraper_instance.html_parser(match_url, MATCH_PAGE_REGIONS)
+    return build_match_details(MATCH_PAGE_SCHEMA.extract(soup), team1, team2)
 
-    Returns:
-        str: The match date, or 'Unknown' if not found.
+def build_match_details(page, team1, team2):
     """
-    date = soup.find('div', class_='date')
-    return date.text.strip() if date else 'Unknown'
+    Builds the details of a match from the fields extracted from its page.
 
-def _get_time(soup):
-    """
-    Extracts the match time from the HTML.
+    Schemas extending `MATCH_PAGE_FIELDS` can pass their own extraction, so the match page is
+    walked only once.
 
     Args:
-        soup (BeautifulSoup): Parsed HTML of the match details page.
+        page (dict): The fields extracted from the match details page.
+        team1 (str): URL of the first participating team.
+        team2 (str): URL of the second participating team.
 
     Returns:
-        str: The match time, or 'Unknown' if not found.
+        MatchDetails: The match details.
     """
-    time = soup.find('div', class_='time')
-    return time.text.strip() if time else 'Unknown'
-
-def _get_team1_details(soup, team1):
+    return MatchDetails(
+        date=page['date'],
+        time=page['time'],
+        team1=_get_team_details(page, team1),
+        team2=_get_team_details(page, team2),
+        match_format=_get_match_format(page)
+    )
+
+def _get_team_details(page, team_url):
     """
-    Extracts the details of the first team from the match HTML.
+    Builds the details of a participating team from the links to team pages.
 
     Args:
-        soup (BeautifulSoup): Parsed HTML of the match details page.
-        team1 (str): URL of the first team.
+        page (dict): The fields extracted from the match details page.
+        team_url (str): URL of the team.
 
     Returns:
-        dict: A dictionary containing the team's name and logo URL.
+        MatchTeam: The team's name and logo URL.
     """
-    team1_element = soup.find('a', href=f'{team1}')
-    if team1_element:
-        team1_name = (
-            team1_element.find('div', class_='teamName').text.strip()
-            if team1_element.find('div', class_='teamName') else "Unknown"
-        )
-        team1_logo = (
-            team1_element.find('img', class_='logo')['src']
-                if team1_element.find('img', class_='logo') else None
+    for team in page['teams']:
+        if team['url'] == team_url:
+            return MatchTeam(
+                name=team['name'],
+                logo=team['logo']
             )
-        return {
-            'name': team1_name,
-            'logo': team1_logo,
-        } 
-    return {
-        'name': "Unknown", 
-        'logo': None
-    }
-
-def _get_team2_details(soup, team2):
+    return MatchTeam(
+        name="Unknown",
+        logo=None
+    )
+
+def _get_match_format(page):
     """
-    Extracts the details of the second team from the match HTML.
+    Builds the match format (LAN or Online) from the match notes.
 
     Args:
-        soup (BeautifulSoup): Parsed HTML of the match details page.
-        team2 (str): URL of the second team.
+        page (dict): The fields extracted from the match details page.
 
     Returns:
-        dict: A dictionary containing the team's name and logo URL.
+        str: The match format (e.g., "LAN" or "Online"), or None if not found.
     """
-    team2_element = soup.find('a', href=f'{team2}')
-    if team2_element:
-        team2_name = (
-            team2_element.find('div', class_='teamName').text.strip()
-            if team2_element.find('div', class_='teamName') else "Unknown"
-        )
-        team2_logo = (
-            team2_element.find('img', class_='logo')['src']
-            if team2_element.find('img', class_='logo') else None
-        )
-        return {
-            'name': team2_name,
-            'logo': team2_logo,
-        }
-    return {
-        'name': "Unknown", 
-        'logo': None
-    }
-
-def _get_match_format(soup):
-        """
-        Extracts the match format (LAN or Online) from the HTML.
-
-        Args:
-            soup (BeautifulSoup): Parsed HTML of the match details page.
-
-        Returns:
-            str: The match format (e.g., "LAN" or "Online"), or None if not found.
-        """
-        match_format_element = soup.find('div', class_='padding preformatted-text')
-        if match_format_element:
-            full_text = match_format_element.text.strip()
-            match_format = re.search(r'^.*?\((LAN|Online)\)', full_text)
-            return match_format.group(0) if match_format else full_text
-
-        return None
+    full_text = page['match_format']
+    if full_text is not None:
+        match_format = re.search(r'^.*?\((LAN|Online)\)', full_text)
+        return match_format.group(0) if match_format else full_text
+
+    return None
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from flask import Response
+from scraper.models import json_default
+
+class ResponseCache:
+    """
+    A bounded cache of serialized API responses.
+
+    Each entry keeps the scraped data together with its serialized JSON body and a
+    content-hash ETag, so a fresh entry is served without scraping or serializing again.
+
+    Attributes:
+        max_entries (int): The maximum number of cached responses; the least recently used are evicted.
+    """
+
+    def __init__(self, max_entries=1024):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of cached responses.
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('hits', 0),
+            ('misses', 0),
+            ('not_modified', 0)
+        ])
+
+    def get(self, key):
+        """
+        Returns the cached response for a key if it is still fresh.
+
+        Args:
+            key (str): The cache key, usually the request path and query string.
+
+        Returns:
+            dict: The cached entry, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires'] > time.time():
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry
+            self._counters['misses'] += 1
+        return None
+
+    def put(self, key, data, ttl, compact=False):
+        """
+        Serializes data and caches the resulting response.
+
+        A response with no time-to-live is built but not cached.
+
+        Args:
+            key (str): The cache key, usually the request path and query string.
+            data (object): The JSON-serializable data.
+            ttl (float): How long the response stays fresh, in seconds.
+            compact (bool): Whether to serialize without indentation.
+
+        Returns:
+            dict: The cached entry, holding `data`, `body`, `etag` and `expires`.
+        """
+        body = serialize(data, compact)
+        entry = {
+            'data': data,
+            'body': body,
+            'etag': hashlib.blake2b(body, digest_size=16).hexdigest(),
+            'expires': time.time() + ttl
+        }
+        if ttl <= 0:
+            return entry
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def count_not_modified(self):
+        """
+        Records a response answered with `304 Not Modified`.
+        """
+        with self._lock:
+            self._counters['not_modified'] += 1
+
+    def stats(self):
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            OrderedDict: Hit/miss counts, 304 responses and the number of cached responses.
+        """
+        with self._lock:
+            stats = OrderedDict(self._counters)
+            stats['entries'] = len(self._entries)
+        return stats
+
+def serialize(data, compact=False):
+    """
+    Serializes data the way the API responds.
+
+    Args:
+        data (object): The data, made of models, dictionaries, lists and scalars.
+        compact (bool): Whether to serialize without indentation and spaces.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON.
+    """
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=4, default=json_default).encode('utf-8')
+
+def conditional_response(entry, request, cache=None):
+    """
+    Builds the response for a cached entry, honoring `If-None-Match`.
+
+    Args:
+        entry (dict): The cached entry, as returned by `ResponseCache.put`.
+        request (Request): The current Flask request.
+        cache (ResponseCache, optional): The cache whose 304 counter is updated.
+
+    Returns:
+        Response: A `304 Not Modified` if the client already has this body, the full JSON body otherwise.
+    """
+    max_age = max(0, int(entry['expires'] - time.time()))
+    if request.if_none_match.contains(entry['etag']):
+        if cache is not None:
+            cache.count_not_modified()
+        response = Response(status=304)
+    else:
+        response = Response(entry['body'], mimetype='application/json')
+    response.set_etag(entry['etag'])
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+_cache = ResponseCache(max_entries=int(os.environ.get('HLTV_RESPONSE_CACHE_ENTRIES', 1024)))
+
+def get_response_cache():
+    """
+    Returns the process-wide response cache.
+
+    Its size is configured through the `HLTV_RESPONSE_CACHE_ENTRIES` environment variable.
+
+    Returns:
+        ResponseCache: The shared response cache.
+    """
+    return _cache
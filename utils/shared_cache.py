@@ -0,0 +1,253 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from scraper.models import json_default
+
+class SharedCache:
+    """
+    A cache of scraped results shared by every worker process of a host.
+
+    Each entry is a file of compact JSON in `directory`, ideally on a tmpfs such as `/dev/shm`
+    so it lives in shared memory. Entries are written to a temporary file and renamed into
+    place, so readers see either the previous or the new value, never a partial one. The
+    modification time of an entry holds its expiry.
+
+    Loading goes through a cross-process single-flight: the first worker missing a key takes
+    an exclusive `flock` on the key's lock file and scrapes, while the others wait for the
+    lock and then read the entry it wrote instead of scraping again.
+
+    Attributes:
+        directory (str): The directory of the entries, None when the cache is disabled.
+        wait_timeout (float): How long to wait for another worker before scraping anyway.
+    """
+
+    def __init__(self, directory=None, wait_timeout=15, prune_every=64):
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Args:
+            directory (str, optional): The directory of the entries. Defaults to a disabled cache.
+            wait_timeout (float): How long to wait for another worker before scraping anyway.
+            prune_every (int): The number of writes between two removals of expired entries.
+        """
+        self.directory = directory
+        self.wait_timeout = wait_timeout
+        self.prune_every = prune_every
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._counters = OrderedDict([
+            ('hits', 0),
+            ('misses', 0),
+            ('coalesced', 0),
+            ('loaded', 0),
+            ('wait_timeouts', 0),
+            ('errors', 0)
+        ])
+
+    @property
+    def enabled(self):
+        """
+        Tells whether results are shared between workers.
+
+        Returns:
+            bool: True if the cache has a directory.
+        """
+        return self.directory is not None
+
+    def get(self, key):
+        """
+        Returns the cached data for a key if it is still fresh.
+
+        Args:
+            key (str): The cache key, e.g. the request path.
+
+        Returns:
+            object: The cached data as plain dictionaries and lists, or None on a miss.
+        """
+        return self._read(key)[0]
+
+    def put(self, key, data, ttl):
+        """
+        Atomically replaces the cached data of a key.
+
+        Args:
+            key (str): The cache key, e.g. the request path.
+            data (object): The scraped data, made of models, dictionaries, lists and scalars.
+            ttl (float): How long the data stays fresh, in seconds.
+        """
+        if not self.enabled:
+            return
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=json_default).encode('utf-8')
+        try:
+            fd, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(body)
+                expires = time.time() + ttl
+                os.utime(temporary, (expires, expires))
+                os.replace(temporary, self._path(key))
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError as error:
+            print(f"[ERRO] Falha ao gravar no cache compartilhado: {error}")
+            self._count('errors')
+            return
+
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    async def load(self, key, ttl, produce):
+        """
+        Returns the cached data for a key, or produces it in a single worker of the host,
+        along with how long it stays fresh.
+
+        Args:
+            key (str): The cache key, e.g. the request path.
+            ttl (callable): Called once the data is produced; returns how long it stays fresh,
+                            in seconds, 0 to not cache it.
+            produce (callable): The coroutine function scraping the data, returning a falsy
+                                value when there is none.
+
+        Returns:
+            tuple: The cached data and the time left before it expires, or the data returned by
+                   `produce` and the time-to-live given by `ttl`, in seconds.
+        """
+        if not self.enabled:
+            return await self._produce(ttl, produce)
+        data, fresh_for = self._read(key)
+        if data is not None:
+            self._count('hits')
+            return data, fresh_for
+        self._count('misses')
+
+        try:
+            lock = open(self._path(key) + '.lock', 'wb')
+        except OSError as error:
+            print(f"[ERRO] Falha ao abrir o lock do cache compartilhado: {error}")
+            self._count('errors')
+            return await self._produce(ttl, produce)
+        try:
+            if not await self._acquire(lock):
+                self._count('wait_timeouts')
+                return await self._produce(ttl, produce)
+            data, fresh_for = self._read(key)
+            if data is not None:
+                self._count('coalesced')
+                return data, fresh_for
+            data, fresh_for = await self._produce(ttl, produce)
+            self._count('loaded')
+            if fresh_for > 0:
+                self.put(key, data, fresh_for)
+            return data, fresh_for
+        finally:
+            lock.close()
+
+    def prune(self):
+        """
+        Removes the expired entries, the temporary files left behind by crashed workers and
+        the lock files unused for an hour.
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                mtime = os.stat(path).st_mtime
+                if name.endswith('.json') and mtime < now or name.endswith(('.tmp', '.lock')) and mtime < now - 3600:
+                    os.unlink(path)
+            except OSError:
+                continue
+
+    def stats(self):
+        """
+        Returns a snapshot of the cache counters.
+
+        Returns:
+            OrderedDict: Whether the cache is enabled, fresh reads, misses, misses answered by
+                         another worker's load, loads, lock waits that timed out, errors and
+                         the number of entries.
+        """
+        with self._lock:
+            stats = OrderedDict([('enabled', self.enabled)])
+            stats.update(self._counters)
+        try:
+            stats['entries'] = sum(1 for name in os.listdir(self.directory) if name.endswith('.json')) if self.enabled else 0
+        except OSError:
+            stats['entries'] = None
+        return stats
+
+    def _read(self, key):
+        if not self.enabled:
+            return None, 0
+        try:
+            with open(self._path(key), 'rb') as f:
+                # The modification time of an entry is its expiry.
+                fresh_for = os.fstat(f.fileno()).st_mtime - time.time()
+                if fresh_for < 0:
+                    return None, 0
+                return json.loads(f.read()), fresh_for
+        except FileNotFoundError:
+            return None, 0
+        except (OSError, ValueError) as error:
+            print(f"[ERRO] Falha ao ler o cache compartilhado: {error}")
+            self._count('errors')
+            return None, 0
+
+    async def _produce(self, ttl, produce):
+        data = await produce()
+        return data, ttl() if data else 0
+
+    async def _acquire(self, lock):
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(0.02)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest() + '.json')
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_cache():
+    """
+    Returns the process-wide handle on the shared cache, creating it on first use.
+
+    Results are only shared when the `HLTV_SHARED_CACHE_DIR` environment variable names the
+    directory of the entries, e.g. `/dev/shm/hltv-api`. `HLTV_SHARED_CACHE_WAIT` bounds how
+    long a worker waits for another one's fetch.
+
+    Returns:
+        SharedCache: The shared cache.
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache(
+                    directory=os.environ.get('HLTV_SHARED_CACHE_DIR') or None,
+                    wait_timeout=float(os.environ.get('HLTV_SHARED_CACHE_WAIT', 15))
+                )
+    return _shared_cache
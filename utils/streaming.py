@@ -0,0 +1,75 @@
+import asyncio
+import json
+import threading
+from flask import Response
+from scraper.models import json_default
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+_DONE = object()
+
+def wants_ndjson(request):
+    """
+    Tells whether the client asked for a streamed NDJSON response.
+
+    Args:
+        request (Request): The current Flask request.
+
+    Returns:
+        bool: True if the `Accept` header prefers `application/x-ndjson`.
+    """
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def ndjson_response(make_items, buffered=16):
+    """
+    Streams the items of an async generator as newline-delimited JSON.
+
+    The generator runs on its own event loop in a background thread and every item is
+    written to the client as soon as it is produced, so the first bytes go out before the
+    slowest item is ready and the full response is never held in memory. At most `buffered`
+    lines wait for a slow client before the generator is paused, and the generator is
+    cancelled as soon as the client goes away.
+
+    Args:
+        make_items (callable): Returns the async generator producing JSON-serializable items.
+        buffered (int): The number of lines that may wait to be sent to the client.
+
+    Returns:
+        Response: A streamed `application/x-ndjson` response.
+    """
+    lines = asyncio.Queue(maxsize=buffered)
+
+    async def produce():
+        try:
+            async for item in make_items():
+                await lines.put(json.dumps(item, ensure_ascii=False, default=json_default) + '\n')
+        except Exception as error:
+            await lines.put(json.dumps({'error': f"{type(error).__name__}: {error}"}) + '\n')
+        await lines.put(_DONE)
+
+    def run(loop):
+        try:
+            loop.run_forever()
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def stop(loop, task):
+        task.cancel()
+        task.add_done_callback(lambda _: loop.stop())
+
+    def generate():
+        loop = asyncio.new_event_loop()
+        task = loop.create_task(produce())
+        threading.Thread(target=run, args=(loop,), daemon=True).start()
+        try:
+            while True:
+                line = asyncio.run_coroutine_threadsafe(lines.get(), loop).result()
+                if line is _DONE:
+                    return
+                yield line
+        finally:
+            # Also reached when the client went away and the response is closed early.
+            loop.call_soon_threadsafe(stop, loop, task)
+
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)